@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from ai.bfs_solver import BFSSolver
+from ai.two_phase import TwoPhaseSolver
+from ai.weighted_search import ERGONOMIC_COSTS, MoveCosts, find_weighted_cross_solutions
+from ai.xcross_solver import iter_xcross_depths
+from core.constants import FACE_B, FACE_D, FACE_F, FACE_L, FACE_R, FACE_U
+from core.cube_state import CubeState
+
+
+XCROSS = 'xcross'
+WEIGHTED = 'weighted'
+FULL = 'full'
+
+_ALL_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+DEFAULT_MAX_SECONDS = 30.0  # total run time of one search, including background time
+
+
+@dataclass(frozen=True)
+class AnytimeResult:
+    """Snapshot of an anytime search."""
+
+    moves: Optional[tuple[str, ...]]  # best solution so far; None before the first one
+    cost: Optional[float]  # move count, or total cost for weighted searches
+    proven_optimal: bool
+    lower_bound: Optional[float]  # best proven bound on the optimal cost, if any
+    finished: bool  # the search is no longer running
+    elapsed: float  # seconds since the search started
+    detail: Any = None  # search-specific extras, e.g. every tied x-cross
+    error: Optional[str] = None
+
+
+class AnytimeSearch:
+    """An improving search running in a daemon thread.
+
+    ``body(search)`` does the work: it publishes better solutions with
+    `report`, proven bounds with `raise_lower_bound`, and polls `should_stop`,
+    which turns true once the result is proven optimal, the search is
+    cancelled or ``max_seconds`` have passed. Callers take a snapshot with
+    `wait`, giving the time they can afford; the search itself keeps running
+    after that, so a later `wait` can return a better result.
+    """
+
+    def __init__(self, kind: str, body: Callable[['AnytimeSearch'], None], max_seconds: float = DEFAULT_MAX_SECONDS):
+        self.kind = kind
+        self._body = body
+        self.max_seconds = max_seconds
+        self._cond = threading.Condition()
+        self._started_at: Optional[float] = None
+        self._cancelled = False
+        self._finished = False
+        self._moves: Optional[tuple[str, ...]] = None
+        self._cost: Optional[float] = None
+        self._proven = False
+        self._lower_bound: Optional[float] = None
+        self._detail: Any = None
+        self._error: Optional[str] = None
+
+    def start(self) -> 'AnytimeSearch':
+        with self._cond:
+            if self._started_at is not None:
+                return self
+            self._started_at = time.monotonic()
+        threading.Thread(target=self._run, name=f'anytime-{self.kind}', daemon=True).start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self._body(self)
+        except Exception as e:  # surfaced through the result, the thread has no caller
+            with self._cond:
+                self._error = str(e)
+        finally:
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+
+    # -- called by the search body --------------------------------------
+
+    def report(self, moves: Sequence[str], cost: float, proven_optimal: bool = False, detail: Any = None) -> None:
+        """Publish a solution; ignored unless it is cheaper or newly proven optimal."""
+        with self._cond:
+            better = self._cost is None or cost < self._cost or (proven_optimal and cost <= self._cost)
+            if not better:
+                return
+            self._moves, self._cost, self._detail = tuple(moves), cost, detail
+            if proven_optimal:
+                self._proven = True
+                self._lower_bound = cost
+            self._cond.notify_all()
+
+    def raise_lower_bound(self, bound: float) -> None:
+        with self._cond:
+            if self._lower_bound is None or bound > self._lower_bound:
+                self._lower_bound = bound
+
+    def should_stop(self) -> bool:
+        if self._cancelled or self._proven:
+            return True
+        return self._started_at is not None and time.monotonic() - self._started_at > self.max_seconds
+
+    # -- called by consumers --------------------------------------------
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def snapshot(self) -> AnytimeResult:
+        with self._cond:
+            elapsed = 0.0 if self._started_at is None else time.monotonic() - self._started_at
+            return AnytimeResult(
+                self._moves, self._cost, self._proven, self._lower_bound, self._finished, elapsed, self._detail, self._error
+            )
+
+    def wait(self, budget: Optional[float] = None) -> AnytimeResult:
+        """Block until the search finishes, is proven optimal or ``budget`` seconds pass."""
+        deadline = None if budget is None else time.monotonic() + budget
+        with self._cond:
+            while not (self._finished or self._proven):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.snapshot()
+
+
+class SearchRegistry:
+    """Recently started searches by id, so a follow-up request can collect a better result.
+
+    The oldest search is cancelled when more than ``capacity`` are kept.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._searches: OrderedDict[str, AnytimeSearch] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, search: AnytimeSearch) -> str:
+        search_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._searches[search_id] = search
+            while len(self._searches) > self.capacity:
+                _, old = self._searches.popitem(last=False)
+                old.cancel()
+        return search_id
+
+    def get(self, search_id: str) -> Optional[AnytimeSearch]:
+        with self._lock:
+            return self._searches.get(search_id)
+
+
+def xcross_search(
+    cube: CubeState, faces: Iterable[int] = _ALL_FACES, max_seconds: float = DEFAULT_MAX_SECONDS
+) -> AnytimeSearch:
+    """Optimal x-cross over ``faces`` and their slots; each finished depth raises the lower bound.
+
+    ``detail`` is the list of every `XCrossSolution` tied at the optimum.
+    """
+    faces = tuple(faces)
+
+    def body(search: AnytimeSearch) -> None:
+        for depth, found in iter_xcross_depths(cube, faces, stop=search.should_stop):
+            search.raise_lower_bound(depth)
+            if found:
+                search.report(found[0].moves, depth, proven_optimal=True, detail=found)
+
+    return AnytimeSearch(XCROSS, body, max_seconds)
+
+
+def weighted_search(
+    cube: CubeState,
+    costs: MoveCosts = ERGONOMIC_COSTS,
+    faces: Iterable[int] = _ALL_FACES,
+    max_seconds: float = DEFAULT_MAX_SECONDS,
+) -> AnytimeSearch:
+    """Cheapest cross under ``costs``: the move-optimal crosses priced first, then A* face by face.
+
+    ``detail`` is the list of `WeightedCrossSolution` found so far, cheapest first.
+    """
+    faces = tuple(faces)
+
+    def body(search: AnytimeSearch) -> None:
+        for face in faces:
+            moves = BFSSolver(target_center_face=face).solve_cross(cube)
+            if moves is not None:
+                search.report(moves, costs.sequence_cost(moves))
+        solutions = []
+        for face in faces:
+            found = find_weighted_cross_solutions(cube, costs, [face], stop=search.should_stop)
+            if not found:
+                return  # stopped
+            solutions += found
+            solutions.sort(key=lambda r: (r.cost, r.move_count, r.face))
+            done = len(solutions) == len(faces)
+            search.report(solutions[0].moves, solutions[0].cost, proven_optimal=done, detail=list(solutions))
+
+    return AnytimeSearch(WEIGHTED, body, max_seconds)
+
+
+def full_solve_search(cube: CubeState, max_seconds: float = DEFAULT_MAX_SECONDS) -> AnytimeSearch:
+    """Two-phase full solve that keeps shortening its solution.
+
+    With no target length the two-phase search only ends once phase 1 has
+    been deepened to the length of the best solution, at which point that
+    solution is optimal; in practice this happens only for short scrambles.
+    """
+
+    def body(search: AnytimeSearch) -> None:
+        stopped = False
+
+        def stop() -> bool:
+            nonlocal stopped
+            stopped = search.should_stop()
+            return stopped
+
+        moves = TwoPhaseSolver(max_length=0, timeout=None).solve(
+            cube, on_improve=lambda m: search.report(m, len(m)), stop=stop
+        )
+        if moves is not None and not stopped:
+            search.report(moves, len(moves), proven_optimal=True)
+
+    return AnytimeSearch(FULL, body, max_seconds)
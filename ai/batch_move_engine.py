@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from conversion.cube_to_ai import cube_to_ai_arrays
+from core.constants import EDGE_LF, EDGE_RB, MOVE_TOKENS
+from core.cube_state import CubeState
+from core.cubie import CORNER_TWIST_SIGN
+from core.move_engine import CubeMoveEngine
+
+
+@dataclass(frozen=True)
+class _MoveTables:
+    corner_src: np.ndarray  # (n_moves, 8): new_cp[pos] = cp[corner_src[pos]]
+    corner_mult: np.ndarray  # (n_moves, 8): +1/-1 twist sign change between positions
+    corner_add: np.ndarray  # (n_moves, 8): twist added at the landing position
+    edge_src: np.ndarray  # (n_moves, 12): new_ep[pos] = ep[edge_src[pos]]
+    edge_flip: np.ndarray  # (n_moves, 12): orientation xor at the landing position
+
+
+_TABLES: _MoveTables | None = None
+
+# `cube_to_ai_arrays` takes the R/L sticker as the reference of the RB and LF edges (F/B
+# for the other two E-slice edges). Flipping those two gives the usual
+# F/B-axis edge orientation, which only F and B quarter turns change.
+FB_EO_RELABEL = np.zeros(12, dtype=np.int8)
+FB_EO_RELABEL[[EDGE_RB, EDGE_LF]] = 1
+
+
+# Face numbers below pair opposite faces as (0, 1), (2, 3), (4, 5), which holds
+# both for the FACE_* ids and for k // 3 of a `MOVE_TOKENS` index.
+NO_FACE = 6  # "no previous move"
+
+
+def may_follow(first: int, second: int) -> bool:
+    """Whether a turn of face ``second`` may directly follow one of ``first`` in a canonical sequence.
+
+    A face never follows itself, and opposite faces (which commute) only in
+    increasing order, which also rules out ``R L R``.
+    """
+    return first == NO_FACE or (second != first and not (second == first ^ 1 and second < first))
+
+
+def canonical_successors(allowed: Iterable[int]) -> list[tuple[int, ...]]:
+    """Moves of ``allowed`` (`MOVE_TOKENS` indices) that may follow each face; row `NO_FACE` is the first move."""
+    allowed = tuple(allowed)
+    return [tuple(k for k in allowed if may_follow(prev, k // 3)) for prev in range(NO_FACE + 1)]
+
+
+def fb_edge_orientation(edge_permutation: np.ndarray, edge_orientation: np.ndarray) -> np.ndarray:
+    """F/B-axis edge orientation per position from `cube_to_ai_arrays`-style arrays."""
+    ep = np.asarray(edge_permutation, dtype=np.intp)
+    return np.asarray(edge_orientation, dtype=np.int8) ^ FB_EO_RELABEL[ep] ^ FB_EO_RELABEL
+
+
+def additive_twist(corner_orientation: np.ndarray) -> np.ndarray:
+    """Corner twists per position that compose additively and sum to 0 mod 3."""
+    return (np.asarray(corner_orientation, dtype=np.int8) * CORNER_TWIST_SIGN) % 3
+
+
+def _build_tables() -> _MoveTables:
+    corner_src, corner_mult, corner_add, edge_src, edge_flip = [], [], [], [], []
+    for mv in MOVE_TOKENS:
+        cube = CubeState.solved()
+        CubeMoveEngine(cube).apply(mv)
+        # On a solved cube the permutations map position -> source position.
+        cp, co, ep, eo = cube_to_ai_arrays(cube)
+        corner_src.append(cp)
+        corner_mult.append(CORNER_TWIST_SIGN * CORNER_TWIST_SIGN[cp])
+        corner_add.append(co)
+        edge_src.append(ep)
+        edge_flip.append(eo)
+    return _MoveTables(
+        corner_src=np.array(corner_src, dtype=np.intp),
+        corner_mult=np.array(corner_mult, dtype=np.int8),
+        corner_add=np.array(corner_add, dtype=np.int8),
+        edge_src=np.array(edge_src, dtype=np.intp),
+        edge_flip=np.array(edge_flip, dtype=np.int8),
+    )
+
+
+def move_tables() -> _MoveTables:
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = _build_tables()
+    return _TABLES
+
+
+@dataclass
+class BatchMoveEngine:
+    """Apply face turns to many cubie states at once.
+
+    Arrays use the same conventions as `cube_to_ai_arrays` (one row per cube):
+    corner_permutation/orientation (N, 8) and edge_permutation/orientation
+    (N, 12). Moves are integer indices into `MOVE_TOKENS`.
+    """
+
+    corner_permutation: np.ndarray
+    corner_orientation: np.ndarray
+    edge_permutation: np.ndarray
+    edge_orientation: np.ndarray
+
+    @classmethod
+    def solved(cls, n: int) -> BatchMoveEngine:
+        return cls(
+            np.tile(np.arange(8, dtype=np.int8), (n, 1)),
+            np.zeros((n, 8), dtype=np.int8),
+            np.tile(np.arange(12, dtype=np.int8), (n, 1)),
+            np.zeros((n, 12), dtype=np.int8),
+        )
+
+    @classmethod
+    def from_cube_states(cls, cubes: list[CubeState]) -> BatchMoveEngine:
+        arrays = [cube_to_ai_arrays(c) for c in cubes]
+        return cls(*(np.stack(parts) for parts in zip(*arrays)))
+
+    def __len__(self) -> int:
+        return len(self.edge_permutation)
+
+    def apply(self, moves: np.ndarray | int) -> None:
+        """Apply one move per cube; ``moves`` is a scalar or an (N,) index array."""
+        t = move_tables()
+        k = np.broadcast_to(np.asarray(moves, dtype=np.intp), (len(self),))
+
+        src = t.corner_src[k]
+        co = np.take_along_axis(self.corner_orientation, src, axis=1)
+        self.corner_permutation = np.take_along_axis(self.corner_permutation, src, axis=1)
+        self.corner_orientation = ((t.corner_mult[k] * co + t.corner_add[k]) % 3).astype(np.int8)
+
+        src = t.edge_src[k]
+        self.edge_permutation = np.take_along_axis(self.edge_permutation, src, axis=1)
+        self.edge_orientation = np.take_along_axis(self.edge_orientation, src, axis=1) ^ t.edge_flip[k]
+
+    def apply_sequences(self, moves: np.ndarray) -> None:
+        """Apply an (N, L) move-index array column by column."""
+        moves = np.asarray(moves)
+        if moves.ndim != 2 or moves.shape[0] != len(self):
+            raise ValueError(f'expected moves of shape ({len(self)}, L), got {moves.shape}')
+        for col in range(moves.shape[1]):
+            self.apply(moves[:, col])
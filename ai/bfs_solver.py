@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pickle
+import threading
 from array import array
 from collections import deque
 from dataclasses import dataclass
@@ -8,10 +9,13 @@ from itertools import permutations
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
 from core.cube_state import CubeState
 from core.move_engine import CubeMoveEngine
 from core.constants import (
     MOVE_TOKENS,
+    FACE_NAMES,
     FACE_U,
     FACE_D,
     FACE_F,
@@ -32,6 +36,8 @@ from core.constants import (
     EDGE_LF,
 )
 from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, is_default_orientation, normalize_orientation, translate_moves
+from ai.table_manager import MOVE, TABLES
 
 
 @dataclass(frozen=True)
@@ -47,11 +53,15 @@ class _CrossState:
 
 
 _CROSS_EDGE_IDS_U = (EDGE_UF, EDGE_UR, EDGE_UB, EDGE_UL)
+_CROSS_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+_RANK_WEIGHTS = np.array([990, 90, 9, 1], dtype=np.int64)  # falling factorials of P(12, 4)
 _MOVE_EFFECTS: dict[str, _MoveEffect] | None = None
-_DIST_BY_FACE: dict[int, array] = {}
-_CACHE_LOADED = False
+_CROSS_MOVE_TABLE: np.ndarray | None = None
 _CACHE_VERSION = 1
 _CACHE_PATH = Path(__file__).resolve().with_name('_cross_dist_cache_v1.pkl')
+# Tables are built lazily and may be requested from several threads at once
+# (anytime searches run in the background); builders take this lock.
+_BUILD_LOCK = threading.RLock()
 
 _CROSS_EDGES_BY_FACE: dict[int, tuple[int, int, int, int]] = {
     FACE_U: (EDGE_UF, EDGE_UR, EDGE_UB, EDGE_UL),
@@ -69,39 +79,37 @@ _RANK_BY_POSITIONS: dict[tuple[int, int, int, int], int] = {}
 def _init_rank_tables() -> None:
     if _POSITIONS_BY_RANK:
         return
-    for rank, tup in enumerate(permutations(range(12), 4)):
-        t = tuple(int(x) for x in tup)
-        _RANK_BY_POSITIONS[t] = rank
-        _POSITIONS_BY_RANK.append(t)  # type: ignore[arg-type]
-
+    with _BUILD_LOCK:
+        if _POSITIONS_BY_RANK:
+            return
+        positions = [tuple(int(x) for x in tup) for tup in permutations(range(12), 4)]
+        _RANK_BY_POSITIONS.update((t, rank) for rank, t in enumerate(positions))
+        _POSITIONS_BY_RANK.extend(positions)  # type: ignore[arg-type]  # filled last: readers test this list
 
-def _try_load_cache() -> None:
-    global _CACHE_LOADED
-    if _CACHE_LOADED:
-        return
-    _CACHE_LOADED = True
 
+def _read_cache() -> dict[int, array]:
+    """Every face table in the pickle cache that matches the current encoding."""
     if not _CACHE_PATH.exists():
-        return
+        return {}
 
     try:
         data = pickle.loads(_CACHE_PATH.read_bytes())
     except Exception:
-        return
+        return {}
 
     if not isinstance(data, dict):
-        return
+        return {}
 
     _init_rank_tables()
     n_states = len(_POSITIONS_BY_RANK) * 16
     if not _cache_header_ok(data, n_states):
-        return
+        return {}
 
     faces_blob = data.get('faces')
     if not isinstance(faces_blob, dict):
-        return
+        return {}
 
-    _load_face_tables_from_cache(faces_blob, n_states)
+    return _load_face_tables_from_cache(faces_blob, n_states)
 
 
 def _cache_header_ok(data: dict, n_states: int) -> bool:
@@ -114,7 +122,8 @@ def _cache_header_ok(data: dict, n_states: int) -> bool:
     return True
 
 
-def _load_face_tables_from_cache(faces_blob: dict, n_states: int) -> None:
+def _load_face_tables_from_cache(faces_blob: dict, n_states: int) -> dict[int, array]:
+    tables: dict[int, array] = {}
     for face, blob in faces_blob.items():
         try:
             face_id = int(face)
@@ -129,17 +138,21 @@ def _load_face_tables_from_cache(faces_blob: dict, n_states: int) -> None:
             continue
         if len(arr) != n_states:
             continue
-        _DIST_BY_FACE[face_id] = arr
+        tables[face_id] = arr
+    return tables
 
 
-def _save_cache() -> None:
+def _save_cache(face: int, dist: array) -> None:
+    """Add or replace one face in the pickle cache, keeping the other faces."""
     _init_rank_tables()
     n_states = len(_POSITIONS_BY_RANK) * 16
+    tables = _read_cache()
+    tables[face] = dist
     payload = {
         'version': _CACHE_VERSION,
         'move_tokens': MOVE_TOKENS,
         'n_states': n_states,
-        'faces': {int(face): dist.tobytes() for face, dist in _DIST_BY_FACE.items()},
+        'faces': {int(f): d.tobytes() for f, d in tables.items()},
     }
     tmp = _CACHE_PATH.with_suffix(_CACHE_PATH.suffix + '.tmp')
     tmp.write_bytes(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
@@ -203,21 +216,40 @@ def _apply_move_to_cross_state(state: _CrossState, effect: _MoveEffect) -> _Cros
     return _CrossState(tuple(new_positions), tuple(new_orientations))
 
 
-def _ensure_cross_distance_table(face: int) -> tuple[dict[str, _MoveEffect], array]:
+def _move_effects() -> dict[str, _MoveEffect]:
     global _MOVE_EFFECTS
-
-    _init_rank_tables()
-    _try_load_cache()
     if _MOVE_EFFECTS is None:
-        _MOVE_EFFECTS = _build_move_effects()
+        with _BUILD_LOCK:
+            if _MOVE_EFFECTS is None:
+                _MOVE_EFFECTS = _build_move_effects()
+    return _MOVE_EFFECTS
 
-    cached = _DIST_BY_FACE.get(face)
-    if cached is not None:
-        return _MOVE_EFFECTS, cached
 
-    edges = _CROSS_EDGES_BY_FACE.get(face)
-    if edges is None:
+def _ensure_cross_distance_table(face: int) -> tuple[dict[str, _MoveEffect], array]:
+    """The face's distance table, held by `TABLES` like every other pruning table."""
+    if face not in _CROSS_EDGES_BY_FACE:
         raise ValueError(f'unknown face id: {face!r}')
+    dist = TABLES.get(f'cross_{FACE_NAMES[face]}', lambda: _load_or_build_cross_table(face))
+    return _move_effects(), dist
+
+
+def _load_or_build_cross_table(face: int) -> tuple[array, bool]:
+    cached = _read_cache().get(face)
+    if cached is not None:
+        return cached, False
+    with _BUILD_LOCK:
+        dist = _build_cross_distance_table(face)
+        try:
+            _save_cache(face, dist)
+        except Exception:
+            pass
+    return dist, True
+
+
+def _build_cross_distance_table(face: int) -> array:
+    _init_rank_tables()
+    move_effects = _move_effects()
+    edges = _CROSS_EDGES_BY_FACE[face]
 
     n_states = len(_POSITIONS_BY_RANK) * 16
     dist = array('h', [-1]) * n_states
@@ -233,19 +265,14 @@ def _ensure_cross_distance_table(face: int) -> tuple[dict[str, _MoveEffect], arr
         cur_state = _decode_cross_state(cur_idx)
 
         for mv in MOVE_TOKENS:
-            nxt_state = _apply_move_to_cross_state(cur_state, _MOVE_EFFECTS[mv])
+            nxt_state = _apply_move_to_cross_state(cur_state, move_effects[mv])
             nxt_idx = _encode_cross_state(nxt_state)
             if dist[nxt_idx] != -1:
                 continue
             dist[nxt_idx] = cur_d + 1
             q.append(nxt_idx)
 
-    _DIST_BY_FACE[face] = dist
-    try:
-        _save_cache()
-    except Exception:
-        pass
-    return _MOVE_EFFECTS, dist
+    return dist
 
 
 class BFSSolver:
@@ -258,11 +285,32 @@ class BFSSolver:
     def __init__(self, target_center_face: int = FACE_U):
         self.target_center_face = target_center_face
 
-    def solve_cross(self, start_cube: CubeState, max_depth: Optional[int] = None) -> Optional[list[str]]:
+    def solve_cross(
+        self,
+        start_cube: CubeState | CubeAIState,
+        max_depth: Optional[int] = None,
+    ) -> Optional[list[str]]:
+        """Shortest cross for the face whose default color is the target.
+
+        Sticker cubes whose centers were moved by rotations, slices or wide
+        moves are solved in the default-center frame and the solution is
+        written back in the cube's own frame.
+        """
+        if isinstance(start_cube, CubeAIState):
+            return self._solve_cross_ai(start_cube, max_depth)
+        if is_default_orientation(start_cube):
+            return self._solve_cross_ai(CubeAIState.from_cube_state(start_cube), max_depth)
+
+        normalized, _ = normalize_orientation(start_cube)
+        solution = self._solve_cross_ai(CubeAIState.from_cube_state(normalized), max_depth)
+        if solution is None:
+            return None
+        return translate_moves(solution, center_colors(start_cube))
+
+    def _solve_cross_ai(self, start_ai_state: CubeAIState, max_depth: Optional[int]) -> Optional[list[str]]:
         move_effects, dist = _ensure_cross_distance_table(self.target_center_face)
         edges = _CROSS_EDGES_BY_FACE[self.target_center_face]
 
-        start_ai_state = CubeAIState.from_cube_state(start_cube)
         if start_ai_state.is_cross_solved(self.target_center_face):
             return []
 
@@ -302,4 +350,117 @@ class BFSSolver:
             if not found:
                 return None
 
-        return solution
\ No newline at end of file
+        return solution
+
+
+def cross_edges(face: int) -> tuple[int, int, int, int]:
+    """The face's four cross edge ids, in the order the cross tables encode them."""
+    edges = _CROSS_EDGES_BY_FACE.get(face)
+    if edges is None:
+        raise ValueError(f'unknown face id: {face!r}')
+    return edges
+
+
+def cross_distance_table(face: int) -> np.ndarray:
+    """Return the face's cross distance table as a read-only int16 NumPy view."""
+    _, dist = _ensure_cross_distance_table(face)
+    view = np.frombuffer(dist, dtype=np.int16)
+    view.flags.writeable = False
+    return view
+
+
+def _rank_positions(positions: np.ndarray) -> np.ndarray:
+    """Lexicographic rank of ordered 4-tuples within permutations(range(12), 4)."""
+    smaller_before = np.zeros_like(positions)
+    for i in range(1, 4):
+        smaller_before[:, i] = (positions[:, :i] < positions[:, i:i + 1]).sum(axis=1)
+    return ((positions - smaller_before) * _RANK_WEIGHTS).sum(axis=1)
+
+
+def cross_move_table() -> np.ndarray:
+    """Cross-state transition table of shape (190080, len(MOVE_TOKENS)).
+
+    ``table[idx, k]`` is the cross index reached from ``idx`` by ``MOVE_TOKENS[k]``.
+    The encoding only tracks positions of four ordered edges, so the same table
+    serves every face. Built once per process with NumPy (well under a second)
+    and registered with `TABLES` as a pinned move table.
+    """
+    global _CROSS_MOVE_TABLE
+
+    if _CROSS_MOVE_TABLE is None:
+        _CROSS_MOVE_TABLE = TABLES.get('cross_moves', _build_cross_move_table, pinned=True, kind=MOVE)
+    return _CROSS_MOVE_TABLE
+
+
+def _build_cross_move_table() -> tuple[np.ndarray, bool]:
+    _init_rank_tables()
+    move_effects = _move_effects()
+
+    positions = np.asarray(_POSITIONS_BY_RANK, dtype=np.int64)
+    ori_bits = np.arange(16, dtype=np.int64)
+    table = np.empty((len(positions) * 16, len(MOVE_TOKENS)), dtype=np.int32)
+    for k, mv in enumerate(MOVE_TOKENS):
+        effect = move_effects[mv]
+        new_positions = np.asarray(effect.forward_pos, dtype=np.int64)[positions]
+        flips = np.asarray(effect.flip_by_new_pos, dtype=np.int64)[new_positions] & 1
+        flip_bits = (flips << np.arange(4)).sum(axis=1)
+        new_rank = _rank_positions(new_positions)
+        table[:, k] = ((new_rank * 16)[:, None] + (ori_bits[None, :] ^ flip_bits[:, None])).reshape(-1)
+
+    table.flags.writeable = False
+    return table, True
+
+
+def cross_goal_index(face: int) -> int:
+    """Cross-table index of the solved cross for ``face``."""
+    edges = _CROSS_EDGES_BY_FACE.get(face)
+    if edges is None:
+        raise ValueError(f'unknown face id: {face!r}')
+    return _encode_cross_state(_CrossState(positions=edges, orientations=(0, 0, 0, 0)))
+
+
+def cross_coordinates(edge_permutation: np.ndarray, edge_orientation: np.ndarray, face: int) -> np.ndarray:
+    """Vectorized `_encode_cross_state` for one face.
+
+    Accepts a single cubie edge state of shape (12,) or a batch of shape (N, 12)
+    and returns the matching cross-table indices (scalar array or shape (N,)).
+    """
+    edges = _CROSS_EDGES_BY_FACE.get(face)
+    if edges is None:
+        raise ValueError(f'unknown face id: {face!r}')
+
+    ep = np.asarray(edge_permutation)
+    eo = np.asarray(edge_orientation)
+    single = ep.ndim == 1
+    ep = np.atleast_2d(ep).astype(np.int64, copy=False)
+    eo = np.atleast_2d(eo).astype(np.int64, copy=False)
+
+    # ep maps position -> piece; invert it to find where each cross edge sits.
+    pos_of_piece = np.argsort(ep, axis=1)
+    positions = pos_of_piece[:, list(edges)]
+    orientations = np.take_along_axis(eo, positions, axis=1) & 1
+
+    ori_bits = (orientations << np.arange(4)).sum(axis=1)
+
+    idx = _rank_positions(positions) * 16 + ori_bits
+    return idx[0] if single else idx
+
+
+def cross_distances(cube: CubeState | CubeAIState) -> dict[int, int]:
+    """Optimal cross length for every face, straight from the distance tables.
+
+    Like `BFSSolver.solve_cross`, sticker cubes with moved centers are read in
+    the default-center frame, so face ids name default colors.
+    """
+    if isinstance(cube, CubeAIState):
+        ai_state = cube
+    elif is_default_orientation(cube):
+        ai_state = CubeAIState.from_cube_state(cube)
+    else:
+        ai_state = CubeAIState.from_cube_state(normalize_orientation(cube)[0])
+    out: dict[int, int] = {}
+    for face in _CROSS_FACES:
+        _, dist = _ensure_cross_distance_table(face)
+        idx = int(cross_coordinates(ai_state.edge_permutation, ai_state.edge_orientation, face))
+        out[face] = int(dist[idx])
+    return out
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from ai.bfs_solver import cross_coordinates, cross_distance_table, cross_move_table
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, normalize_orientation, translate_moves
+from core.constants import DEFAULT_FACE_COLOR, FACE_B, FACE_D, FACE_F, FACE_L, FACE_R, FACE_U, MOVE_TOKENS
+from core.cube_state import CubeState
+
+
+_ALL_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+_N_MOVES = len(MOVE_TOKENS)
+_MOVE_INDEX = {tok: k for k, tok in enumerate(MOVE_TOKENS)}
+_FACE_BY_COLOR = {int(color): face for face, color in DEFAULT_FACE_COLOR.items()}
+_DEFAULT_CENTERS = tuple(int(DEFAULT_FACE_COLOR[f]) for f in range(6))
+
+
+@lru_cache(maxsize=None)
+def _frame_moves(centers: tuple[int, ...]) -> tuple[int, ...]:
+    """Physical move index -> move index in the default-center frame (one tuple per holding)."""
+    out = []
+    for tok in MOVE_TOKENS:
+        face = _FACE_BY_COLOR[centers['UDFBLR'.index(tok[0])]]
+        out.append(_MOVE_INDEX['UDFBLR'[face] + tok[1:]])
+    return tuple(out)
+
+
+@lru_cache(maxsize=1)
+def _move_view() -> memoryview:
+    """Flat int view of the cross move table (built once per process, never evicted)."""
+    return memoryview(cross_move_table()).cast('B').cast('i')
+
+
+def _distance_views() -> list[memoryview]:
+    """Flat int views of each face's distance table.
+
+    Fetched per call so the tables stay under the table manager's budget;
+    the views keep whatever they point at alive while in use.
+    """
+    return [memoryview(cross_distance_table(face)).cast('B').cast('h') for face in _ALL_FACES]
+
+
+class CrossSession:
+    """Cross state of one physical cube, updated move by move.
+
+    Holds only the six cross-table indices (one per face), so applying a
+    move is six lookups in the shared cross move table and an idle session
+    costs about 2 KB. Distances and solutions are read from the
+    tables on demand by `state`. Moves are face turns as performed on the
+    cube, in the holding the session was started with.
+    """
+
+    __slots__ = ('_coords', '_frame', '_centers', '_cond', 'move_count', 'last_move', 'version', 'last_active')
+
+    def __init__(self, cube: Optional[CubeState] = None):
+        cube = CubeState.solved() if cube is None else cube
+        normalized, _ = normalize_orientation(cube)
+        ai_state = CubeAIState.from_cube_state(normalized)
+        self._coords = [
+            int(cross_coordinates(ai_state.edge_permutation, ai_state.edge_orientation, face)) for face in _ALL_FACES
+        ]
+        centers = center_colors(cube)
+        self._centers = None if centers == _DEFAULT_CENTERS else centers
+        self._frame = _frame_moves(centers)
+        self._cond = threading.Condition()
+        self.move_count = 0
+        self.last_move: Optional[str] = None
+        self.version = 0
+        self.last_active = time.monotonic()
+
+    def apply(self, moves: Iterable[str]) -> int:
+        """Apply face turns; all are checked before any is applied. Returns the new version."""
+        moves = list(moves)
+        unknown = [mv for mv in moves if mv not in _MOVE_INDEX]
+        if unknown:
+            raise ValueError(f'only face turns are supported, got: {unknown}')
+        if not moves:
+            return self.version
+        table = _move_view()
+        with self._cond:
+            coords = self._coords
+            for mv in moves:
+                k = self._frame[_MOVE_INDEX[mv]]
+                for i in range(6):
+                    coords[i] = table[coords[i] * _N_MOVES + k]
+            self.move_count += len(moves)
+            self.last_move = moves[-1]
+            self.version += 1
+            self.last_active = time.monotonic()
+            self._cond.notify_all()
+            return self.version
+
+    def distances(self) -> dict[int, int]:
+        """Optimal cross length per face."""
+        dists = _distance_views()
+        with self._cond:
+            coords = list(self._coords)
+        return {face: int(dists[i][coords[i]]) for i, face in enumerate(_ALL_FACES)}
+
+    def state(self) -> dict:
+        """Version, move count and, per face, the optimal cross length and one optimal solution.
+
+        Solutions are found by walking down the distance table (at most eight
+        steps of 18 lookups) and are written as physical moves.
+        """
+        moves_table, dists = _move_view(), _distance_views()
+        with self._cond:
+            coords = list(self._coords)
+            version, move_count, last_move = self.version, self.move_count, self.last_move
+        solutions = {}
+        for i, face in enumerate(_ALL_FACES):
+            dist, index, path = dists[i], coords[i], []
+            while dist[index]:
+                base = index * _N_MOVES
+                k = next(k for k in range(_N_MOVES) if dist[moves_table[base + k]] < dist[index])
+                path.append(MOVE_TOKENS[k])
+                index = moves_table[base + k]
+            solutions[face] = path if self._centers is None else translate_moves(path, self._centers)
+        return {"version": version, "move_count": move_count, "last_move": last_move, "solutions": solutions}
+
+    def wait(self, after_version: int, timeout: Optional[float] = None) -> bool:
+        """Block until the version passes ``after_version``; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.version > after_version, timeout)
+
+
+class SessionRegistry:
+    """Live sessions by id. Sessions idle for ``max_idle`` seconds are dropped.
+
+    When more than ``capacity`` sessions are open the least recently used is
+    dropped as well.
+    """
+
+    def __init__(self, capacity: int = 10000, max_idle: float = 3600.0):
+        self.capacity = capacity
+        self.max_idle = max_idle
+        self._sessions: OrderedDict[str, CrossSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def create(self, cube: Optional[CubeState] = None) -> tuple[str, CrossSession]:
+        session = CrossSession(cube)
+        session_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._sessions[session_id] = session
+            self._expire()
+        return session_id, session
+
+    def get(self, session_id: str) -> Optional[CrossSession]:
+        """The session, marked as recently used; None if unknown or expired."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.monotonic() - session.last_active > self.max_idle:
+                del self._sessions[session_id]
+                return None
+            session.last_active = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def peek(self, session_id: str) -> Optional[CrossSession]:
+        """Like `get`, but without marking the session as used (an idle watcher must not keep it alive)."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or time.monotonic() - session.last_active > self.max_idle:
+                return None
+            return session
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.capacity and now - session.last_active <= self.max_idle:
+                break
+            del self._sessions[session_id]
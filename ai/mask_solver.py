@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from ai.batch_move_engine import NO_FACE, may_follow
+from ai.orientation import center_colors, is_default_orientation, normalize_orientation, translate_moves
+from ai.pruning_table import CORNER, EDGE, PieceSet, PruningTable, TableSpec
+from conversion.cube_to_ai import cube_to_ai_arrays
+from core.constants import (
+    CORNER_STICKER_POSITIONS,
+    EDGE_STICKER_POSITIONS,
+    FACE_D,
+    MOVE_TOKENS,
+)
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+Sticker = tuple[int, int, int]  # (face, row, col) in CubeState.stickers
+
+_BITS = 5  # one piece is position * orientations + orientation < 24 < 2**5
+
+
+@dataclass(frozen=True)
+class StickerGoal:
+    """Goal given as stickers that must be back in place, relative to the centers.
+
+    A sticker is matched by the piece it belongs to, so any masked sticker
+    of a piece pins that piece's position and orientation; masking whole
+    pieces (blocks, crosses, pairs) is the intended use. ``targets`` lists
+    alternative goal states as move sequences applied to a solved cube, e.g.
+    the four D-layer turns of a pseudo-cross.
+    """
+
+    stickers: frozenset[Sticker]
+    targets: tuple[tuple[str, ...], ...] = ((),)
+
+    def pieces(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """(corner ids, edge ids) owning at least one masked sticker."""
+        corners = tuple(c for c, pos in CORNER_STICKER_POSITIONS.items() if self.stickers.intersection(pos))
+        edges = tuple(e for e, pos in EDGE_STICKER_POSITIONS.items() if self.stickers.intersection(pos))
+        return corners, edges
+
+
+def piece_stickers(corners: Iterable[int] = (), edges: Iterable[int] = ()) -> frozenset[Sticker]:
+    """All stickers of the given pieces."""
+    stickers = [s for c in corners for s in CORNER_STICKER_POSITIONS[c]]
+    stickers += [s for e in edges for s in EDGE_STICKER_POSITIONS[e]]
+    return frozenset(stickers)
+
+
+def block_goal(corner: int) -> StickerGoal:
+    """2x2x2 block around ``corner``: the corner and its three edges."""
+    faces = {f for f, _, _ in CORNER_STICKER_POSITIONS[corner]}
+    edges = [e for e, pos in EDGE_STICKER_POSITIONS.items() if {f for f, _, _ in pos} <= faces]
+    return StickerGoal(piece_stickers([corner], edges))
+
+
+def pseudo_cross_goal(face: int = FACE_D) -> StickerGoal:
+    """Cross on ``face`` solved up to a turn of that face."""
+    edges = [e for e, pos in EDGE_STICKER_POSITIONS.items() if face in {f for f, _, _ in pos}]
+    token = 'UDFBLR'[face]
+    return StickerGoal(piece_stickers(edges=edges), ((), (token,), (token + '2',), (token + "'",)))
+
+
+def _pair_ok(first: int, second: int, complete: set[int]) -> bool:
+    """Whether a move on face ``second`` may directly follow one on ``first``.
+
+    Opposite faces commute, so only one order is kept; a face is never
+    turned twice in a row when all three of its turns are available.
+    """
+    if first == second:
+        return first not in complete
+    return may_follow(first, second)
+
+
+def _canonical_pairs(faces: Sequence[int]) -> tuple[np.ndarray, np.ndarray]:
+    """(forward, backward) masks indexed [stored face, move]; row 6 is the empty path.
+
+    Forward states store the face of their last move, backward states the
+    face of the first move on their path to the goal.
+    """
+    complete = {f for f in range(6) if sum(1 for g in faces if g == f) == 3}
+    forward = np.ones((NO_FACE + 1, len(faces)), dtype=bool)
+    backward = np.ones((NO_FACE + 1, len(faces)), dtype=bool)
+    for stored in range(6):
+        for k, face in enumerate(faces):
+            forward[stored, k] = _pair_ok(stored, face, complete)
+            backward[stored, k] = _pair_ok(face, stored, complete)
+    return forward, backward
+
+
+class _Side:
+    """One direction of the search: BFS levels of packed states with parent links."""
+
+    def __init__(self, starts: np.ndarray) -> None:
+        starts = np.unique(starts)
+        self.levels = [(starts, np.full(starts.size, -1), np.full(starts.size, -1), np.full(starts.size, NO_FACE))]
+        self.seen = starts
+        self.seen_level = np.zeros(starts.size, dtype=np.int64)
+        self.seen_index = np.arange(starts.size)
+
+    @property
+    def depth(self) -> int:
+        return len(self.levels) - 1
+
+    @property
+    def frontier_size(self) -> int:
+        return self.levels[-1][0].size
+
+    def expand(self, maps: list[list[np.ndarray]], allowed: np.ndarray, move_faces: np.ndarray) -> np.ndarray:
+        """Add the next level; ``allowed[face, k]`` filters by the stored face. Returns the new states."""
+        states, _, _, faces = self.levels[-1]
+        new_states, parents, moves = [], [], []
+        for k, piece_maps in enumerate(maps):
+            idx = np.flatnonzero(allowed[faces, k])
+            if not idx.size:
+                continue
+            new_states.append(_apply(states[idx], piece_maps))
+            parents.append(idx)
+            moves.append(np.full(idx.size, k))
+        if not new_states:
+            level = np.empty(0, dtype=np.int64)
+            self.levels.append((level, level, level, level))
+            return level
+        cand = np.concatenate(new_states)
+        parent = np.concatenate(parents)
+        move = np.concatenate(moves)
+        fresh = ~np.isin(cand, self.seen)
+        cand, first = np.unique(cand[fresh], return_index=True)
+        parent, move = parent[fresh][first], move[fresh][first]
+        self.levels.append((cand, parent, move, move_faces[move]))
+        order = np.argsort(np.concatenate([self.seen, cand]), kind='stable')
+        self.seen = np.concatenate([self.seen, cand])[order]
+        self.seen_level = np.concatenate([self.seen_level, np.full(cand.size, self.depth)])[order]
+        self.seen_index = np.concatenate([self.seen_index, np.arange(cand.size)])[order]
+        return cand
+
+    def locate(self, state: int) -> tuple[int, int]:
+        at = int(np.searchsorted(self.seen, state))
+        return int(self.seen_level[at]), int(self.seen_index[at])
+
+    def moves_from_root(self, level: int, index: int) -> list[int]:
+        """Move indices along the parent links, from this state back to a start state."""
+        out = []
+        while level > 0:
+            _, parent, move, _ = self.levels[level]
+            out.append(int(move[index]))
+            index = int(parent[index])
+            level -= 1
+        return out
+
+
+def _apply(states: np.ndarray, piece_maps: list[np.ndarray]) -> np.ndarray:
+    out = np.zeros_like(states)
+    for i, table in enumerate(piece_maps):
+        out |= table[(states >> (_BITS * i)) & 31] << (_BITS * i)
+    return out
+
+
+class BidirectionalSolver:
+    """Optimal solutions for a `StickerGoal` by meet-in-the-middle search, without tables.
+
+    Only the masked pieces are tracked: each as one 5-bit code (position and
+    orientation), packed into a single int64 per state. Both sides expand
+    whole BFS levels with NumPy, the smaller frontier first, so a goal of
+    about 10 moves needs two searches of depth 5 rather than a table over
+    the whole piece set.
+    """
+
+    def __init__(self, goal: StickerGoal, moves: Sequence[str] = MOVE_TOKENS):
+        unknown = [mv for mv in moves if mv not in MOVE_TOKENS]
+        if unknown:
+            raise ValueError(f'only face turns are supported, got: {unknown}')
+        corners, edges = goal.pieces()
+        if not corners and not edges:
+            raise ValueError('the sticker mask covers no corner or edge')
+        if len(corners) + len(edges) > 12:
+            raise ValueError('at most 12 masked pieces are supported')
+        self.goal = goal
+        self.moves = tuple(moves)
+        # Single-piece specs: their components give the coordinates and move
+        # tables without building any distance table.
+        self._tables = [PruningTable(TableSpec(f'piece_c{c}', (PieceSet(CORNER, (c,)),), moves=self.moves)) for c in corners]
+        self._tables += [PruningTable(TableSpec(f'piece_e{e}', (PieceSet(EDGE, (e,)),), moves=self.moves)) for e in edges]
+        per_piece = [t.components[0].move_table(self.moves).astype(np.int64) for t in self._tables]
+        self._forward = [[m[:, k] for m in per_piece] for k in range(len(self.moves))]
+        self._backward = [[np.argsort(m[:, k]) for m in per_piece] for k in range(len(self.moves))]
+        self._faces = np.array(['UDFBLR'.index(mv[0]) for mv in self.moves])
+        self._allowed_forward, self._allowed_backward = _canonical_pairs(self._faces.tolist())
+        self._targets = np.array([self._encode(_target_cube(seq)) for seq in goal.targets], dtype=np.int64)
+
+    def _encode(self, cube: CubeState) -> int:
+        cp, co, ep, eo = (np.asarray(a)[None] for a in cube_to_ai_arrays(normalize_orientation(cube)[0]))
+        code = 0
+        for i, table in enumerate(self._tables):
+            code |= int(table.indices(cp, co, ep, eo)[0]) << (_BITS * i)
+        return code
+
+    def is_solved(self, cube: CubeState) -> bool:
+        return self._encode(cube) in set(self._targets.tolist())
+
+    def solve(self, cube: CubeState, max_depth: int = 14, max_solutions: int = 1) -> list[list[str]]:
+        """Up to ``max_solutions`` optimal solutions, as moves to perform on ``cube``.
+
+        Empty when nothing is found within ``max_depth`` moves.
+        """
+        forward = _Side(np.array([self._encode(cube)], dtype=np.int64))
+        backward = _Side(self._targets)
+        meets = np.intersect1d(forward.seen, backward.seen)
+        while not meets.size and forward.depth + backward.depth < max_depth:
+            grow_forward = forward.frontier_size <= backward.frontier_size
+            side, other = (forward, backward) if grow_forward else (backward, forward)
+            maps = self._forward if grow_forward else self._backward
+            allowed = self._allowed_forward if grow_forward else self._allowed_backward
+            new = side.expand(maps, allowed, self._faces)
+            if not new.size:
+                break  # that side has seen every reachable state
+            meets = new[np.isin(new, other.seen)]
+
+        if not meets.size:
+            return []
+        solutions = []
+        best = None
+        for state in meets.tolist():
+            f_level, f_index = forward.locate(state)
+            b_level, b_index = backward.locate(state)
+            length = f_level + b_level
+            if best is None or length < best:
+                best, solutions = length, []
+            if length == best:
+                path = forward.moves_from_root(f_level, f_index)[::-1] + backward.moves_from_root(b_level, b_index)
+                solutions.append([self.moves[k] for k in path])
+        solutions = solutions[:max_solutions]
+        if is_default_orientation(cube):
+            return solutions
+        centers = center_colors(cube)
+        return [translate_moves(moves, centers) for moves in solutions]
+
+
+def _target_cube(sequence: Sequence[str]) -> CubeState:
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply_sequence(list(sequence))
+    return cube
+
+
+def solve_sticker_goal(
+    cube: CubeState, goal: StickerGoal, max_depth: int = 14, max_solutions: int = 1
+) -> Optional[list[str]]:
+    """One optimal solution for ``goal``, or None if none fits ``max_depth``."""
+    solutions = BidirectionalSolver(goal).solve(cube, max_depth, max_solutions)
+    return solutions[0] if solutions else None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import (
+    SLICE_TOKENS,
+    Rotation,
+    center_colors,
+    normalize_orientation,
+    physical_moves,
+    reframe,
+    rotations,
+    unframe_moves,
+)
+from ai.pruning_table import EDGE, PieceSet, PruningTable, TableSpec
+from core.constants import EDGE_DB, EDGE_DF, EDGE_DL, EDGE_DR, FACE_B, FACE_D, FACE_F, FACE_L, FACE_R, FACE_U, MOVE_TOKENS
+from core.cube_state import CubeState
+
+
+HTM = 'htm'  # half-turn metric: any face turn counts 1
+STM = 'stm'  # slice-turn metric: face turns and M/E/S slices count 1
+QTM = 'qtm'  # quarter-turn metric: a half turn counts 2
+METRICS = (HTM, STM, QTM)
+
+# Wide turns are not listed: relative to the centers a wide turn is the
+# opposite face turn, so they never shorten a cross in any metric.
+METRIC_MOVES: dict[str, tuple[str, ...]] = {
+    HTM: tuple(MOVE_TOKENS),
+    STM: tuple(MOVE_TOKENS) + SLICE_TOKENS,
+    QTM: tuple(mv for mv in MOVE_TOKENS if not mv.endswith('2')),
+}
+
+_ALL_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+_TABLES: dict[str, PruningTable] = {}
+_FRAMES: dict[int, Rotation] = {}
+
+
+def metric_length(moves: Iterable[str], metric: str) -> int:
+    """Length of a move sequence in ``metric``."""
+    if metric not in METRIC_MOVES:
+        raise ValueError(f'unknown metric: {metric!r}')
+    if metric == QTM:
+        return sum(2 if mv.endswith('2') else 1 for mv in moves)
+    return sum(1 for _ in moves)
+
+
+def cross_table(metric: str) -> PruningTable:
+    """D-cross distance table in ``metric``; other faces are reached by rotation."""
+    if metric not in METRIC_MOVES:
+        raise ValueError(f'unknown metric: {metric!r}')
+    table = _TABLES.get(metric)
+    if table is None:
+        spec = TableSpec(
+            f'cross_{metric}', (PieceSet(EDGE, (EDGE_DF, EDGE_DR, EDGE_DB, EDGE_DL)),), moves=METRIC_MOVES[metric]
+        )
+        table = _TABLES[metric] = PruningTable(spec)
+    return table
+
+
+def _frame_for(face: int) -> Rotation:
+    frame = _FRAMES.get(face)
+    if frame is None:
+        frame = _FRAMES[face] = next(rot for rot in rotations() if rot.perm[FACE_D] == face)
+    return frame
+
+
+def _merge_quarter_turns(moves: list[str]) -> list[str]:
+    """Write repeated quarter turns (R R) as half turns (R2); the QTM count is unchanged."""
+    out: list[str] = []
+    for mv in moves:
+        if out and out[-1] == mv and not mv.endswith('2'):
+            out[-1] = mv[0] + '2'
+        else:
+            out.append(mv)
+    return out
+
+
+def solve_cross_in_metric(cube: CubeState, face: int, metric: str) -> Optional[list[str]]:
+    """Optimal cross on ``face`` in ``metric``, as moves to perform on ``cube``."""
+    normalized, _ = normalize_orientation(cube)
+    frame = _frame_for(face)
+    moves = cross_table(metric).solve(CubeAIState.from_cube_state(reframe(normalized, frame)))
+    if moves is None:
+        return None
+    moves = physical_moves(unframe_moves(moves, frame), center_colors(cube))
+    return _merge_quarter_turns(moves) if metric == QTM else moves
+
+
+def find_metric_cross_solutions(
+    cube: CubeState,
+    metric: str,
+    faces: Iterable[int] = _ALL_FACES,
+) -> list[tuple[int, int, list[str]]]:  # (face_id, metric_length, solution_moves)
+    """One optimal cross per face in ``metric``, sorted like `find_multiple_cross_solutions`."""
+    results = []
+    for face in faces:
+        moves = solve_cross_in_metric(cube, face, metric)
+        if moves is not None:
+            results.append((face, metric_length(moves, metric), moves))
+    results.sort(key=lambda x: (x[1], x[0]))
+    return results
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ai.bfs_solver import cross_edges
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, normalize_orientation, translate_moves
+from ai.pruning_table import EDGE, PieceSet, PruningTable, TableSpec
+from core.constants import DEFAULT_FACE_COLOR, FACE_B, FACE_D, FACE_F, FACE_L, FACE_NAMES, FACE_R, FACE_U, MOVE_TOKENS
+from core.cube_state import CubeState
+
+
+_ALL_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+_FACE_BY_COLOR = {int(color): face for face, color in DEFAULT_FACE_COLOR.items()}
+# PruningTable objects are small: their distances are held (and budgeted) by
+# TABLES, and their move tables are columns of the shared cross move table,
+# used only while a table is built.
+_MAX_CACHED_TABLES = 64
+_TABLES: OrderedDict[tuple[int, tuple[str, ...]], PruningTable] = OrderedDict()
+# Every new subset leaves one 190 KB file per face; beyond this many the least
+# recently used ones are deleted (they are rebuilt in well under a second).
+_MAX_TABLE_FILES = 192
+_TABLE_DIR = Path(__file__).resolve().with_name('_tables')
+
+
+def parse_move_subset(text: str) -> tuple[str, ...]:
+    """Allowed face turns from e.g. ``'R U F L D'``, ``'RUFLD'`` or ``"R, U, U2, F'"``.
+
+    A bare face letter allows all three turns of that face. The result is in
+    `MOVE_TOKENS` order, so equivalent spellings share one table.
+    """
+    allowed: set[str] = set()
+    for item in re.split(r'[\s,]+', text.strip()):
+        if not item:
+            continue
+        if all(ch in FACE_NAMES for ch in item):
+            allowed.update(ch + suffix for ch in item for suffix in ('', "'", '2'))
+        elif item in MOVE_TOKENS:
+            allowed.add(item)
+        else:
+            raise ValueError(f'unknown move in subset: {item!r}')
+    if not allowed:
+        raise ValueError('empty move subset')
+    return tuple(mv for mv in MOVE_TOKENS if mv in allowed)
+
+
+def _to_center_frame(moves: Iterable[str], centers: tuple[int, ...]) -> tuple[str, ...]:
+    """Inverse of `translate_moves`: physical turns on a cube showing ``centers`` -> default-frame turns."""
+    letter_map = {FACE_NAMES[face]: FACE_NAMES[_FACE_BY_COLOR[color]] for face, color in enumerate(centers)}
+    frame_moves = {letter_map[mv[0]] + mv[1:] for mv in moves}
+    return tuple(mv for mv in MOVE_TOKENS if mv in frame_moves)
+
+
+def subset_cross_table(face: int, moves: tuple[str, ...]) -> PruningTable:
+    """Cross table for ``face`` restricted to ``moves`` (default frame), built on first use.
+
+    A restricted move set is not symmetric under rotations, so each (face,
+    subset) pair gets its own table; recently used ones stay in memory.
+    """
+    edges = cross_edges(face)
+    key = (face, tuple(moves))
+    table = _TABLES.get(key)
+    if table is not None:
+        _TABLES.move_to_end(key)
+        return table
+    spec = TableSpec(f'cross_{FACE_NAMES[face]}_subset', (PieceSet(EDGE, edges),), moves=moves)
+    table = _TABLES[key] = PruningTable(spec, table_dir=_TABLE_DIR)
+    if len(_TABLES) > _MAX_CACHED_TABLES:
+        _TABLES.popitem(last=False)
+    _prune_table_files(table.path)
+    return table
+
+
+def _prune_table_files(path: Path) -> None:
+    """Mark ``path`` as just used and delete old subset tables, leaving room for ``path``."""
+    try:
+        if path.exists():
+            path.touch()
+        files = sorted(
+            (p for p in _TABLE_DIR.glob('cross_*_subset_*.npy') if p != path),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for old in files[: max(0, len(files) - (_MAX_TABLE_FILES - 1))]:
+            old.unlink()
+    except OSError:
+        pass  # best effort, like saving the tables; another process may be pruning too
+
+
+def subset_cross_tables(cube: CubeState, moves: tuple[str, ...], faces: Iterable[int] = _ALL_FACES) -> list[PruningTable]:
+    """The tables `find_subset_cross_solutions` uses for ``cube`` (not built yet)."""
+    frame_moves = _to_center_frame(moves, center_colors(cube))
+    return [subset_cross_table(face, frame_moves) for face in faces]
+
+
+def solve_cross_with_moves(cube: CubeState, face: int, moves: tuple[str, ...]) -> Optional[list[str]]:
+    """Optimal cross on ``face`` using only ``moves`` as performed on ``cube``; None if unreachable.
+
+    ``face`` is a default-frame face id (i.e. a cross color), like `BFSSolver`.
+    """
+    normalized, _ = normalize_orientation(cube)
+    centers = center_colors(cube)
+    table = subset_cross_table(face, _to_center_frame(moves, centers))
+    solution = table.solve(CubeAIState.from_cube_state(normalized))
+    if solution is None:
+        return None
+    return translate_moves(solution, centers)
+
+
+def find_subset_cross_solutions(
+    cube: CubeState,
+    moves: tuple[str, ...],
+    faces: Iterable[int] = _ALL_FACES,
+) -> list[tuple[int, int, list[str]]]:  # (face_id, solution_length, solution_moves)
+    """One optimal restricted-move cross per reachable face, sorted by length."""
+    results = []
+    for face in faces:
+        solution = solve_cross_with_moves(cube, face, moves)
+        if solution is not None:
+            results.append((face, len(solution), solution))
+    results.sort(key=lambda x: (x[1], x[0]))
+    return results
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+
+from core.constants import DEFAULT_FACE_COLOR, FACE_B, FACE_D, FACE_F, FACE_L, FACE_NAMES, FACE_R, FACE_U
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+ROTATION_TOKENS = ('x', "x'", 'x2', 'y', "y'", 'y2', 'z', "z'", 'z2')
+SLICE_TOKENS = ('M', "M'", 'M2', 'E', "E'", 'E2', 'S', "S'", 'S2')
+
+# Each slice turns like one face: M like L, E like D, S like F.
+_SLICE_FACE = {'M': FACE_L, 'E': FACE_D, 'S': FACE_F}
+_OPPOSITE = {FACE_U: FACE_D, FACE_D: FACE_U, FACE_F: FACE_B, FACE_B: FACE_F, FACE_L: FACE_R, FACE_R: FACE_L}
+_INVERSE_SUFFIX = {'': "'", "'": '', '2': '2'}
+
+_FACE_BY_COLOR = {int(color): face for face, color in DEFAULT_FACE_COLOR.items()}
+_DEFAULT_CENTERS = tuple(int(DEFAULT_FACE_COLOR[f]) for f in range(6))
+
+# new_centers[P] = centers[_TOKEN_PERMS[tok][P]] for a rotation or slice token.
+_TOKEN_PERMS: dict[str, tuple[int, ...]] = {}
+_ROTATIONS_BY_COST: dict[tuple, list[Rotation]] = {}
+
+
+@dataclass(frozen=True)
+class Rotation:
+    """One of the 24 holding orientations, reached by the cheapest token sequence."""
+
+    tokens: tuple[str, ...]
+    perm: tuple[int, ...]  # new_centers[P] = centers[perm[P]]
+    cost: float
+
+
+@dataclass(frozen=True)
+class OrientedCrossSolution:
+    rotation: tuple[str, ...]  # inspection rotation, applied first
+    moves: tuple[str, ...]  # face turns in the rotated frame
+    color: int  # cross color code
+    rotation_cost: float
+    cost: float  # rotation_cost + len(moves)
+
+    @property
+    def move_count(self) -> int:
+        return len(self.moves)
+
+    @property
+    def sequence(self) -> list[str]:
+        return [*self.rotation, *self.moves]
+
+
+def _token_perms() -> dict[str, tuple[int, ...]]:
+    if not _TOKEN_PERMS:
+        for tok in ROTATION_TOKENS + SLICE_TOKENS:
+            cube = CubeState.solved()
+            CubeMoveEngine(cube).apply(tok)
+            _TOKEN_PERMS[tok] = tuple(_FACE_BY_COLOR[c] for c in center_colors(cube))
+    return _TOKEN_PERMS
+
+
+def _token_costs(rotation_cost: float | Mapping[str, float]) -> dict[str, float]:
+    if isinstance(rotation_cost, Mapping):
+        unknown = set(rotation_cost) - set(ROTATION_TOKENS)
+        if unknown:
+            raise ValueError(f'unknown rotation tokens: {sorted(unknown)!r}')
+        return {tok: float(rotation_cost.get(tok, 1.0)) for tok in ROTATION_TOKENS}
+    return {tok: float(rotation_cost) for tok in ROTATION_TOKENS}
+
+
+def rotations(rotation_cost: float | Mapping[str, float] = 1.0) -> list[Rotation]:
+    """All 24 orientations with their cheapest rotation sequence (Dijkstra over tokens).
+
+    ``rotation_cost`` is either a cost per rotation token or a mapping from
+    token (``'x'``, ``"y'"``, ``'z2'``, ...) to cost; missing tokens cost 1.
+    """
+    costs = _token_costs(rotation_cost)
+    key = tuple(sorted(costs.items()))
+    cached = _ROTATIONS_BY_COST.get(key)
+    if cached is not None:
+        return cached
+
+    perms = _token_perms()
+    identity = tuple(range(6))
+    best: dict[tuple[int, ...], Rotation] = {}
+    heap: list[tuple[float, int, tuple[str, ...], tuple[int, ...]]] = [(0.0, 0, (), identity)]
+    while heap:
+        cost, _, tokens, perm = heapq.heappop(heap)
+        if perm in best:
+            continue
+        best[perm] = Rotation(tokens, perm, cost)
+        for tok in ROTATION_TOKENS:
+            nxt = tuple(perm[p] for p in perms[tok])
+            if nxt not in best:
+                heapq.heappush(heap, (cost + costs[tok], len(tokens) + 1, tokens + (tok,), nxt))
+
+    result = sorted(best.values(), key=lambda r: (r.cost, len(r.tokens)))
+    _ROTATIONS_BY_COST[key] = result
+    return result
+
+
+def center_colors(cube: CubeState) -> tuple[int, ...]:
+    return tuple(int(c) for c in cube.stickers[:, 1, 1])
+
+
+def is_default_orientation(cube: CubeState) -> bool:
+    return center_colors(cube) == _DEFAULT_CENTERS
+
+
+def normalize_orientation(cube: CubeState) -> tuple[CubeState, tuple[str, ...]]:
+    """Rotate a copy of ``cube`` so its centers match `DEFAULT_FACE_COLOR`.
+
+    Scrambles containing x/y/z, slice or wide moves leave the centers permuted;
+    the cubie conversion assumes default centers, so solvers work on the
+    normalized copy. Returns the copy and the rotation tokens that were applied.
+    """
+    centers = center_colors(cube)
+    if centers == _DEFAULT_CENTERS:
+        return cube.copy(), ()
+    for rot in rotations():
+        if tuple(centers[p] for p in rot.perm) == _DEFAULT_CENTERS:
+            normalized = cube.copy()
+            CubeMoveEngine(normalized).apply_sequence(list(rot.tokens))
+            return normalized, rot.tokens
+    raise ValueError(f'invalid center layout: {centers!r}')
+
+
+def translate_moves(moves: list[str], centers: tuple[int, ...]) -> list[str]:
+    """Rewrite face turns from the default-center frame into a frame with ``centers``.
+
+    A turn of the face whose default color is c becomes a turn of whichever
+    face currently shows the c center; the direction is unchanged.
+    """
+    face_of_color = {color: face for face, color in enumerate(centers)}
+    letter_map = {
+        FACE_NAMES[face]: FACE_NAMES[face_of_color[int(color)]] for face, color in DEFAULT_FACE_COLOR.items()
+    }
+    return [letter_map[mv[0]] + mv[1:] for mv in moves]
+
+
+def reframe(cube: CubeState, rotation: Rotation) -> CubeState:
+    """View ``cube`` (default centers) as held after ``rotation``, recolored to default centers.
+
+    Face turns solved on the returned cube are written for the rotated holding;
+    `unframe_moves` maps them back to the original holding. This lets one
+    canonical table (e.g. a D cross) serve every face by symmetry.
+    """
+    rotated = cube.copy()
+    CubeMoveEngine(rotated).apply_sequence(list(rotation.tokens))
+    recolor = np.zeros(7, dtype=rotated.stickers.dtype)
+    for face, color in enumerate(center_colors(rotated)):
+        recolor[color] = DEFAULT_FACE_COLOR[face]
+    return CubeState(recolor[rotated.stickers])
+
+
+def _slice_token(face: int, suffix: str) -> str:
+    """The slice turn that moves like a turn of ``face`` with ``suffix``."""
+    for letter, ref in _SLICE_FACE.items():
+        if face == ref:
+            return letter + suffix
+        if face == _OPPOSITE[ref]:
+            return letter + _INVERSE_SUFFIX[suffix]
+    raise ValueError(f'unknown face id: {face!r}')
+
+
+def unframe_moves(moves: list[str], rotation: Rotation) -> list[str]:
+    """Rewrite face turns (and M/E/S slices) made after ``rotation`` as turns in the original holding."""
+    out = []
+    for mv in moves:
+        if mv[0] in _SLICE_FACE:
+            out.append(_slice_token(rotation.perm[_SLICE_FACE[mv[0]]], mv[1:]))
+        else:
+            out.append(FACE_NAMES[rotation.perm[FACE_NAMES.index(mv[0])]] + mv[1:])
+    return out
+
+
+def physical_moves(moves: list[str], centers: tuple[int, ...]) -> list[str]:
+    """Rewrite center-relative moves as the turns to perform on a cube showing ``centers``.
+
+    Like `translate_moves`, but ``moves`` may contain M/E/S slices whose
+    effect is taken relative to the centers (as in `ai.pruning_table`).
+    Performing a slice moves the centers, so later moves are mapped onto
+    the updated layout.
+    """
+    perms = _token_perms()
+    centers = tuple(centers)
+    out = []
+    for mv in moves:
+        face_of_color = {color: face for face, color in enumerate(centers)}
+        if mv[0] in _SLICE_FACE:
+            tok = _slice_token(face_of_color[int(DEFAULT_FACE_COLOR[_SLICE_FACE[mv[0]]])], mv[1:])
+            centers = tuple(centers[p] for p in perms[tok])
+        else:
+            tok = FACE_NAMES[face_of_color[int(DEFAULT_FACE_COLOR[FACE_NAMES.index(mv[0])])]] + mv[1:]
+        out.append(tok)
+    return out
+
+
+def find_oriented_cross_solutions(
+    cube: CubeState,
+    rotation_cost: float | Mapping[str, float] = 1.0,
+    cross_face: int = FACE_D,
+    max_depth: Optional[int] = None,
+) -> list[OrientedCrossSolution]:
+    """Cheapest rotation + cross combinations over all 24 holding orientations.
+
+    For each orientation the cross is built on ``cross_face`` (bottom by
+    default), so the cross color is whatever center the rotation brings there.
+    The six crosses are solved once from the tables in the default frame; each
+    orientation only relabels faces. Results are sorted by total cost
+    (rotation cost + move count).
+    """
+    # Local import to avoid circular import at module import time.
+    from ai.bfs_solver import BFSSolver
+    from ai.cube_ai_state import CubeAIState
+
+    normalized, _ = normalize_orientation(cube)
+    ai_state = CubeAIState.from_cube_state(normalized)
+    solutions = {
+        face: BFSSolver(target_center_face=face).solve_cross(ai_state, max_depth=max_depth)
+        for face in DEFAULT_FACE_COLOR
+    }
+
+    start_centers = np.array(center_colors(cube))
+    results: list[OrientedCrossSolution] = []
+    for rot in rotations(rotation_cost):
+        centers = tuple(int(c) for c in start_centers[list(rot.perm)])
+        color = centers[cross_face]
+        solution = solutions[_FACE_BY_COLOR[color]]
+        if solution is None:
+            continue
+        results.append(
+            OrientedCrossSolution(
+                rotation=rot.tokens,
+                moves=tuple(translate_moves(solution, centers)),
+                color=color,
+                rotation_cost=rot.cost,
+                cost=rot.cost + len(solution),
+            )
+        )
+    results.sort(key=lambda r: (r.cost, len(r.rotation), r.rotation))
+    return results
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from ai.batch_move_engine import fb_edge_orientation
+from ai.bfs_solver import cross_move_table
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, is_default_orientation, normalize_orientation, translate_moves
+from ai.table_manager import TABLES
+from conversion.cube_to_ai import cube_to_ai_arrays
+from core.constants import MOVE_TOKENS
+from core.cube_state import CubeState
+from core.cubie import CORNER_TWIST_SIGN
+from core.move_engine import CubeMoveEngine
+
+
+EDGE = 'edge'
+CORNER = 'corner'
+
+_FORMAT_VERSION = 1
+_TABLE_DIR = Path(__file__).resolve().with_name('_tables')
+_N_POSITIONS = {EDGE: 12, CORNER: 8}
+_N_TWISTS = {EDGE: 2, CORNER: 3}
+_MAX_MOVE_TABLE = 1 << 25  # entries; larger components compute transitions on the fly
+_BFS_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class PieceSet:
+    """One component of a table: which pieces are tracked and which properties count.
+
+    With ``position=True`` the listed pieces are followed wherever they go and
+    their orientation is recorded if ``orientation=True``. With
+    ``position=False`` only orientation is tracked, per position, for every
+    piece of the kind (``pieces`` must be empty); edge orientation is then the
+    usual F/B-axis definition and corner orientation the U/D twist.
+    """
+
+    kind: str
+    pieces: tuple[int, ...] = ()
+    position: bool = True
+    orientation: bool = True
+
+    def __post_init__(self) -> None:
+        if self.kind not in _N_POSITIONS:
+            raise ValueError(f'unknown piece kind: {self.kind!r}')
+        object.__setattr__(self, 'pieces', tuple(int(p) for p in self.pieces))
+        n = _N_POSITIONS[self.kind]
+        if self.position:
+            if not self.pieces:
+                raise ValueError('a positional piece set needs at least one piece')
+            if len(set(self.pieces)) != len(self.pieces) or not all(0 <= p < n for p in self.pieces):
+                raise ValueError(f'invalid {self.kind} pieces: {self.pieces!r}')
+        else:
+            if not self.orientation:
+                raise ValueError('a piece set must track position, orientation or both')
+            if self.pieces:
+                raise ValueError('orientation-only piece sets always cover every piece of the kind')
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Declarative description of a pruning table.
+
+    ``goals`` are move sequences applied to a solved cube; every resulting
+    state is a distance-0 state (several goals allow e.g. a free AUF).
+    ``moves`` may include slice moves, whose effect is taken relative to the
+    centers, so solutions using them are expressed in the center frame.
+    """
+
+    name: str
+    pieces: tuple[PieceSet, ...]
+    goals: tuple[tuple[str, ...], ...] = ((),)
+    moves: tuple[str, ...] = field(default_factory=lambda: tuple(MOVE_TOKENS))
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'pieces', tuple(self.pieces))
+        object.__setattr__(self, 'goals', tuple(tuple(g) for g in self.goals))
+        object.__setattr__(self, 'moves', tuple(self.moves))
+        if not self.pieces:
+            raise ValueError('a table needs at least one piece set')
+        if not self.goals:
+            raise ValueError('a table needs at least one goal')
+        if not self.moves:
+            raise ValueError('a table needs at least one move')
+
+    def digest(self) -> str:
+        text = repr((_FORMAT_VERSION, self.pieces, self.goals, self.moves))
+        return hashlib.sha1(text.encode('ascii')).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class _MoveArrays:
+    corner_src: np.ndarray  # new_cp[pos] = cp[corner_src[pos]]
+    corner_mult: np.ndarray
+    corner_add: np.ndarray
+    edge_src: np.ndarray
+    edge_flip: np.ndarray
+    edge_fb_flip: np.ndarray  # F/B-axis orientation xor at the landing position
+
+
+_MOVE_ARRAYS: dict[str, _MoveArrays] = {}
+
+
+def _move_arrays(token: str) -> _MoveArrays:
+    arrays = _MOVE_ARRAYS.get(token)
+    if arrays is not None:
+        return arrays
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply(token)
+    # Slices and rotations move centers; read the pieces relative to them.
+    cube, _ = normalize_orientation(cube)
+    cp, co, ep, eo = (np.asarray(a, dtype=np.int64) for a in cube_to_ai_arrays(cube))
+    arrays = _MoveArrays(
+        corner_src=cp,
+        corner_mult=(CORNER_TWIST_SIGN * CORNER_TWIST_SIGN[cp]).astype(np.int64),
+        corner_add=co,
+        edge_src=ep,
+        edge_flip=eo,
+        edge_fb_flip=fb_edge_orientation(ep, eo).astype(np.int64),
+    )
+    _MOVE_ARRAYS[token] = arrays
+    return arrays
+
+
+def _inverse_token(token: str) -> str:
+    if token.endswith('2'):
+        return token
+    return token[:-1] if token.endswith("'") else token + "'"
+
+
+def _falling_weights(n: int, k: int) -> np.ndarray:
+    weights = np.ones(k, dtype=np.int64)
+    for i in range(k - 2, -1, -1):
+        weights[i] = weights[i + 1] * (n - i - 1)
+    return weights
+
+
+class _Component:
+    """Mixed-radix coordinate of one piece set: position rank, then orientation digits."""
+
+    def __init__(self, piece_set: PieceSet) -> None:
+        self.piece_set = piece_set
+        self.kind = piece_set.kind
+        self.n = _N_POSITIONS[self.kind]
+        self.radix = _N_TWISTS[self.kind]
+        if piece_set.position:
+            k = len(piece_set.pieces)
+            self.k = k
+            self.weights = _falling_weights(self.n, k)
+            self.n_ranks = int(self.weights[0]) * self.n
+            self.n_orient = self.radix**k if piece_set.orientation else 1
+        else:
+            self.k = self.n
+            self.weights = None
+            self.n_ranks = 1
+            self.n_orient = self.radix**self.n
+        self.size = self.n_ranks * self.n_orient
+        self._digit_scale = self.radix ** np.arange(self.k, dtype=np.int64)
+
+    # -- encoding -----------------------------------------------------------
+
+    def _rank(self, positions: np.ndarray) -> np.ndarray:
+        smaller = (positions[:, None, :] < positions[:, :, None]) & np.tri(self.k, k=-1, dtype=bool)
+        digits = positions - smaller.sum(axis=2)
+        return digits @ self.weights
+
+    def _unrank(self, rank: np.ndarray) -> np.ndarray:
+        out = np.empty((rank.size, self.k), dtype=np.int64)
+        free = np.ones((rank.size, self.n), dtype=bool)
+        rows = np.arange(rank.size)
+        for i in range(self.k):
+            digit = rank // self.weights[i] % (self.n - i)
+            hit = free & (np.cumsum(free, axis=1) == (digit + 1)[:, None])
+            out[:, i] = np.argmax(hit, axis=1)
+            free[rows, out[:, i]] = False
+        return out
+
+    def encode(self, positions: np.ndarray | None, orientations: np.ndarray) -> np.ndarray:
+        ori = orientations @ self._digit_scale if self.piece_set.orientation else 0
+        if positions is None:
+            return ori
+        return self._rank(positions) * self.n_orient + ori
+
+    def decode(self, coords: np.ndarray) -> tuple[np.ndarray | None, np.ndarray]:
+        rank, ori = np.divmod(coords, self.n_orient)
+        orientations = ori[:, None] // self._digit_scale % self.radix
+        if not self.piece_set.position:
+            return None, orientations
+        return self._unrank(rank), orientations
+
+    def from_arrays(self, cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray) -> np.ndarray:
+        """Coordinates of (N, 8) / (N, 12) cubie arrays."""
+        perm, ori = (ep, eo) if self.kind == EDGE else (cp, co)
+        perm = np.asarray(perm, dtype=np.int64)
+        ori = np.asarray(ori, dtype=np.int64)
+        if not self.piece_set.position:
+            if self.kind == EDGE:
+                ori = fb_edge_orientation(perm, ori).astype(np.int64)
+            return self.encode(None, ori)
+        positions = np.stack([np.argmax(perm == p, axis=1) for p in self.piece_set.pieces], axis=1)
+        return self.encode(positions, np.take_along_axis(ori, positions, axis=1))
+
+    # -- transitions --------------------------------------------------------
+
+    def apply(self, coords: np.ndarray, token: str) -> np.ndarray:
+        return self._apply_decoded(*self.decode(np.asarray(coords, dtype=np.int64)), token)
+
+    def _apply_decoded(self, positions: np.ndarray | None, ori: np.ndarray, token: str) -> np.ndarray:
+        m = _move_arrays(token)
+        if positions is None:
+            if self.kind == EDGE:
+                return self.encode(None, ori[:, m.edge_src] ^ m.edge_fb_flip)
+            return self.encode(None, (m.corner_mult * ori[:, m.corner_src] + m.corner_add) % 3)
+        src = m.edge_src if self.kind == EDGE else m.corner_src
+        new_positions = np.argsort(src)[positions]
+        if self.kind == EDGE:
+            ori = ori ^ m.edge_flip[new_positions]
+        else:
+            ori = (m.corner_mult[new_positions] * ori + m.corner_add[new_positions]) % 3
+        return self.encode(new_positions, ori)
+
+    def move_table(self, moves: tuple[str, ...]) -> np.ndarray | None:
+        """(size, len(moves)) int32 transition table, or None when it would be too large.
+
+        Four tracked edges under face turns encode like the cross coordinate
+        whichever edges they are, so those tables are columns of the shared
+        `cross_move_table` (the table itself for all of `MOVE_TOKENS`). Others
+        are computed and not cached: at up to 128 MB per table, callers decide
+        how long to keep it.
+        """
+        if self.size * len(moves) > _MAX_MOVE_TABLE:
+            return None
+        if self.kind == EDGE and self.k == 4 and self.piece_set.orientation and set(moves) <= set(MOVE_TOKENS):
+            if tuple(moves) == tuple(MOVE_TOKENS):
+                return cross_move_table()
+            return cross_move_table()[:, [MOVE_TOKENS.index(mv) for mv in moves]]
+        decoded = self.decode(np.arange(self.size, dtype=np.int64))
+        table = np.stack([self._apply_decoded(*decoded, mv) for mv in moves], axis=1).astype(np.int32)
+        table.setflags(write=False)
+        return table
+
+
+def load_or_build(
+    path: Path, shape: tuple[int, ...], build: Callable[[], np.ndarray], pinned: bool = False
+) -> np.ndarray:
+    """Load an int8 table saved at ``path``, or build and save it; returned read-only.
+
+    Goes through the process-wide `TableManager`, named by the file stem, so
+    the table counts towards its memory budget and may be evicted unless
+    ``pinned``.
+    """
+    return TABLES.load_or_build(path.stem, path, shape, build, pinned=pinned)
+
+
+class PruningTable:
+    """Exact distance table for a `TableSpec`, built by vectorized BFS.
+
+    The index is mixed radix over the piece sets (first set most significant);
+    within a set it is rank * orient_states + orientation digits, so a set of
+    four edges encodes exactly like the cross tables in `ai.bfs_solver`.
+    Tables are stored as int8 .npy files in ``ai/_tables`` keyed by the spec
+    and kept in memory by `ai.table_manager.TABLES`.
+    """
+
+    def __init__(self, spec: TableSpec, table_dir: Path | None = None) -> None:
+        self.spec = spec
+        self.components = [_Component(ps) for ps in spec.pieces]
+        self.sizes = [c.size for c in self.components]
+        self.size = int(np.prod(self.sizes, dtype=np.int64))
+        self.path = (table_dir or _TABLE_DIR) / f'{spec.name}_{spec.digest()}.npy'
+        for mv in spec.moves:
+            _move_arrays(mv)  # validates the tokens up front
+
+    # -- coordinates ----------------------------------------------------------
+
+    def _combine(self, parts: Sequence[np.ndarray]) -> np.ndarray:
+        index = np.zeros_like(np.asarray(parts[0], dtype=np.int64))
+        for size, part in zip(self.sizes, parts):
+            index = index * size + part
+        return index
+
+    def _split(self, index: np.ndarray) -> list[np.ndarray]:
+        parts = []
+        for size in reversed(self.sizes):
+            index, part = np.divmod(index, size)
+            parts.append(part)
+        return parts[::-1]
+
+    def indices(self, cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray) -> np.ndarray:
+        """Table indices of (N, 8) / (N, 12) cubie arrays."""
+        arrays = [np.atleast_2d(a) for a in (cp, co, ep, eo)]
+        return self._combine([c.from_arrays(*arrays) for c in self.components])
+
+    def index(self, state: CubeState | CubeAIState) -> int:
+        if isinstance(state, CubeState):
+            state = CubeAIState.from_cube_state(normalize_orientation(state)[0])
+        return int(self.indices(
+            state.corner_permutation, state.corner_orientation, state.edge_permutation, state.edge_orientation
+        )[0])
+
+    def step(
+        self,
+        index: np.ndarray,
+        move: int,
+        moves: tuple[str, ...] | None = None,
+        move_tables: Sequence[np.ndarray | None] | None = None,
+    ) -> np.ndarray:
+        """Indices after applying ``moves[move]`` (``spec.moves`` by default).
+
+        ``move_tables`` are per-component `_Component.move_table` results for
+        ``moves``; without them every component is transformed directly, which
+        is the cheaper choice for a few indices.
+        """
+        moves = self.spec.moves if moves is None else moves
+        token = moves[move]
+        tables = move_tables if move_tables is not None else [None] * len(self.components)
+        parts = []
+        for comp, table, part in zip(self.components, tables, self._split(np.asarray(index, dtype=np.int64))):
+            parts.append(table[part, move] if table is not None else comp.apply(part, token))
+        return self._combine(parts)
+
+    def goal_indices(self) -> np.ndarray:
+        goals = []
+        for seq in self.spec.goals:
+            cube = CubeState.solved()
+            CubeMoveEngine(cube).apply_sequence(list(seq))
+            goals.append(self.index(cube))
+        return np.unique(np.array(goals, dtype=np.int64))
+
+    # -- table ----------------------------------------------------------------
+
+    @property
+    def table(self) -> np.ndarray:
+        """The distance table, loaded (memory-mapped) or built on demand by `TableManager`."""
+        return load_or_build(self.path, (self.size,), self._build)
+
+    def _build(self) -> np.ndarray:
+        # Distances are towards the goal, so the BFS from the goal expands by
+        # inverse moves; for inverse-closed move sets that is the same set.
+        inverse = tuple(_inverse_token(mv) for mv in self.spec.moves)
+        bfs_moves = self.spec.moves if set(inverse) == set(self.spec.moves) else inverse
+        # Built for this BFS only; a solve steps a handful of indices and does
+        # not need them, so they are not kept alongside the distance table.
+        move_tables = [c.move_table(bfs_moves) for c in self.components]
+        dist = np.full(self.size, -1, dtype=np.int8)
+        frontier = self.goal_indices()
+        dist[frontier] = 0
+        depth = 0
+        while frontier.size:
+            depth += 1
+            for start in range(0, frontier.size, _BFS_CHUNK):
+                chunk = frontier[start:start + _BFS_CHUNK]
+                for k in range(len(bfs_moves)):
+                    nxt = self.step(chunk, k, bfs_moves, move_tables)
+                    dist[nxt[dist[nxt] < 0]] = depth
+            frontier = np.flatnonzero(dist == depth)
+        return dist
+
+    # -- solving --------------------------------------------------------------
+
+    def distance(self, state: CubeState | CubeAIState) -> int:
+        return int(self.table[self.index(state)])
+
+    def solve_index(self, index: int) -> Optional[list[str]]:
+        """Optimal move sequence from ``index`` to a goal by descending the table."""
+        return self.solve_indices(np.array([index], dtype=np.int64))[0]
+
+    def solve_indices(self, indices: np.ndarray) -> list[Optional[list[str]]]:
+        """`solve_index` for many indices at once, descending all of them in lockstep.
+
+        Each level steps every unfinished index by every move in one batch and
+        keeps the first move (in ``spec.moves`` order) that gets one closer.
+        """
+        table = self.table
+        here = np.array(indices, dtype=np.int64).reshape(-1)
+        dist = table[here].astype(np.int64)
+        paths: list[Optional[list[str]]] = [[] if d >= 0 else None for d in dist]
+        active = np.flatnonzero(dist > 0)
+        while active.size:
+            nxt = np.stack([self.step(here[active], k) for k in range(len(self.spec.moves))], axis=1)
+            pick = np.argmax(table[nxt] == (dist[active] - 1)[:, None], axis=1)
+            here[active] = nxt[np.arange(active.size), pick]
+            dist[active] -= 1
+            for row, k in zip(active, pick):
+                paths[row].append(self.spec.moves[k])
+            active = active[dist[active] > 0]
+        return paths
+
+    def solve(self, state: CubeState | CubeAIState) -> Optional[list[str]]:
+        """Optimal solution for the table's substep; None if unreachable with ``spec.moves``.
+
+        A `CubeState` with rotated centers gets moves in its own frame, like
+        `BFSSolver.solve_cross`.
+        """
+        moves = self.solve_index(self.index(state))
+        if moves is None or not isinstance(state, CubeState) or is_default_orientation(state):
+            return moves
+        return translate_moves(moves, center_colors(state))
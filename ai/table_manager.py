@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+
+_DEFAULT_BUDGET_MB = 512
+
+DISTANCE = 'distance'  # pruning / distance tables
+MOVE = 'move'  # coordinate transition tables
+KINDS = (DISTANCE, MOVE)
+
+
+@dataclass
+class _Entry:
+    table: Any  # np.ndarray, np.memmap or array.array
+    nbytes: int
+    mapped: bool
+    pinned: bool
+    kind: str
+
+
+@dataclass
+class _Counters:
+    hits: int = 0
+    loads: int = 0  # read from disk
+    builds: int = 0  # computed because no usable file existed
+    evictions: int = 0
+
+
+def _nbytes(table: Any) -> int:
+    if isinstance(table, np.ndarray):
+        return int(table.nbytes)
+    if isinstance(table, list):
+        # Lists of ints, possibly nested: the lists plus every int outside the small-int cache.
+        return sys.getsizeof(table) + sum(
+            _nbytes(v) if isinstance(v, list) else 0 if -5 <= v <= 256 else sys.getsizeof(v) for v in table
+        )
+    return len(memoryview(table).cast('B'))
+
+
+class TableManager:
+    """Owner of the loaded distance tables, under a memory budget.
+
+    Tables are fetched by name through `get` (any loader) or `load_or_build`
+    (.npy files, memory-mapped read-only when loaded from disk). When the
+    resident total goes over ``budget_bytes`` the least recently used
+    tables are dropped and reloaded on next use; ``pinned`` tables are held
+    by long-lived solver objects anyway and are never evicted. Callers that
+    keep a table (or a view of it) for the length of a search are unaffected
+    by eviction: it only drops the manager's reference. Move tables held for
+    the life of the process are registered as pinned ``kind=MOVE`` entries,
+    so they count towards the budget and show up in `stats`.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self._budget = budget_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._counters: dict[str, _Counters] = {}
+        self._kinds: dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._loading: dict[str, threading.Lock] = {}
+
+    @property
+    def budget_bytes(self) -> Optional[int]:
+        return self._budget
+
+    def set_budget(self, budget_bytes: Optional[int]) -> None:
+        """Change the budget (None for unlimited), evicting at once if needed."""
+        if budget_bytes is not None and budget_bytes < 0:
+            raise ValueError('budget must be non-negative')
+        with self._lock:
+            self._budget = budget_bytes
+            self._evict()
+
+    def get(self, name: str, load: Callable[[], tuple[Any, bool]], pinned: bool = False, kind: str = DISTANCE) -> Any:
+        """Table ``name``, calling ``load() -> (table, built)`` if it is not resident."""
+        if kind not in KINDS:
+            raise ValueError(f'unknown table kind: {kind!r}')
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                self._counter(name).hits += 1
+                return entry.table
+            name_lock = self._loading.setdefault(name, threading.Lock())
+        with name_lock:  # one loader per table; others wait and reuse its result
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None:
+                    self._entries.move_to_end(name)
+                    self._counter(name).hits += 1
+                    return entry.table
+            table, built = load()
+            with self._lock:
+                counter = self._counter(name)
+                counter.builds += built
+                counter.loads += not built
+                self._entries[name] = _Entry(table, _nbytes(table), isinstance(table, np.memmap), pinned, kind)
+                self._kinds[name] = kind
+                self._evict(keep=name)
+        return table
+
+    def load_or_build(
+        self, name: str, path: Path, shape: tuple[int, ...], build: Callable[[], np.ndarray],
+        dtype: Any = np.int8, pinned: bool = False,
+    ) -> np.ndarray:
+        """Read-only table saved at ``path``, or build and save it.
+
+        A file with the wrong shape or dtype is rebuilt. Saving is best effort:
+        a read-only checkout still works, it just rebuilds on every start.
+        """
+
+        def load() -> tuple[np.ndarray, bool]:
+            try:
+                table = np.load(path, mmap_mode='r')
+                if table.shape == shape and table.dtype == dtype:
+                    return table, False
+            except (OSError, ValueError):
+                pass
+            table = build()
+            try:
+                path.parent.mkdir(exist_ok=True)
+                tmp = path.with_suffix(f'.{os.getpid()}-{threading.get_ident()}.tmp.npy')  # concurrent builders
+                np.save(tmp, table)
+                tmp.replace(path)
+                table = np.load(path, mmap_mode='r')
+            except OSError:
+                table.setflags(write=False)
+            return table, True
+
+        return self.get(name, load, pinned)
+
+    def evict(self, name: str) -> bool:
+        """Drop ``name`` if it is resident and not pinned."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.pinned:
+                return False
+            del self._entries[name]
+            self._counter(name).evictions += 1
+            return True
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(e.nbytes for e in self._entries.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Residency and counters, per table and in total (JSON-friendly)."""
+        with self._lock:
+            tables = {}
+            for name, counter in sorted(self._counters.items()):
+                entry = self._entries.get(name)
+                tables[name] = {
+                    "kind": self._kinds.get(name, DISTANCE),
+                    "resident": entry is not None,
+                    "bytes": entry.nbytes if entry is not None else 0,
+                    "mapped": entry.mapped if entry is not None else False,
+                    "pinned": entry.pinned if entry is not None else False,
+                    "hits": counter.hits,
+                    "loads": counter.loads,
+                    "builds": counter.builds,
+                    "evictions": counter.evictions,
+                }
+            return {
+                "budget_bytes": self._budget,
+                "resident_bytes": sum(e.nbytes for e in self._entries.values()),
+                "resident_bytes_by_kind": {
+                    kind: sum(e.nbytes for e in self._entries.values() if e.kind == kind) for kind in KINDS
+                },
+                "resident_tables": len(self._entries),
+                "loads": sum(c.loads for c in self._counters.values()),
+                "builds": sum(c.builds for c in self._counters.values()),
+                "evictions": sum(c.evictions for c in self._counters.values()),
+                "tables": tables,
+            }
+
+    def _counter(self, name: str) -> _Counters:
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters[name] = _Counters()
+        return counter
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        if self._budget is None:
+            return
+        total = sum(e.nbytes for e in self._entries.values())
+        for name in list(self._entries):
+            if total <= self._budget:
+                break
+            entry = self._entries[name]
+            if entry.pinned or name == keep:
+                continue
+            del self._entries[name]
+            self._counter(name).evictions += 1
+            total -= entry.nbytes
+
+
+def _budget_from_env() -> Optional[int]:
+    """``CUBE_TABLE_BUDGET_MB`` (0 or negative for unlimited), default 512 MB."""
+    value = os.environ.get('CUBE_TABLE_BUDGET_MB')
+    try:
+        mb = float(value) if value else _DEFAULT_BUDGET_MB
+    except ValueError:
+        mb = _DEFAULT_BUDGET_MB
+    return None if mb <= 0 else int(mb * 1024 * 1024)
+
+
+# Process-wide manager used by the solvers
+TABLES = TableManager(_budget_from_env())
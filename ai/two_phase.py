@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import time
+from itertools import combinations, permutations
+from math import factorial
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from ai.batch_move_engine import additive_twist, canonical_successors, fb_edge_orientation, move_tables
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, is_default_orientation, normalize_orientation, translate_moves
+from ai.pruning_table import load_or_build
+from ai.table_manager import MOVE, TABLES
+from core.constants import MOVE_TOKENS
+from core.cube_state import CubeState
+from core.cubie import permutation_parity, twist_total
+
+
+_TABLE_VERSION = 1
+_TABLE_DIR = Path(__file__).resolve().with_name('_tables')
+_N_MOVES = len(MOVE_TOKENS)
+
+_N_TWIST = 3**7  # twist of the first 7 corners, the 8th follows
+_N_FLIP = 2**11  # F/B flip of the first 11 edges, the 12th follows
+_N_SLICE = 495  # C(12, 4) positions of the four E-slice edges
+_N_PERM8 = factorial(8)
+_N_SLICE_PERM = factorial(4)
+
+_SLICE_POSITIONS = (4, 5, 6, 7)  # FR, RB, BL, LF
+_UD_POSITIONS = (0, 1, 2, 3, 8, 9, 10, 11)
+
+# Phase 2 keeps twist, flip and the slice: U and D turns plus R2 L2 F2 B2.
+_PHASE2_MOVES = tuple(MOVE_TOKENS.index(t) for t in ('U', "U'", 'U2', 'D', "D'", 'D2', 'R2', 'L2', 'F2', 'B2'))
+
+_SLICE_COMBOS = list(combinations(range(12), 4))
+_SLICE_INDEX_BY_MASK = np.full(1 << 12, -1, dtype=np.int64)
+for _i, _combo in enumerate(_SLICE_COMBOS):
+    _SLICE_INDEX_BY_MASK[sum(1 << p for p in _combo)] = _i
+_SLICE_GOAL = _SLICE_COMBOS.index(_SLICE_POSITIONS)
+_UD_LOCAL = {pos: i for i, pos in enumerate(_UD_POSITIONS)}
+
+# Longest phase 2 tried after a phase-1 solution. Phase 2 can need up to 18
+# moves, but short phase-1 paths with long phase 2 rarely beat the target
+# length and searching them dominated the solve time; longer phase-1 paths
+# followed by a short phase 2 are found soon instead.
+_PHASE2_MAX_DEPTH = 11
+
+_TABLES: _Tables | None = None
+
+
+_NEXT1 = canonical_successors(range(_N_MOVES))
+_NEXT2 = canonical_successors(_PHASE2_MOVES)
+
+
+# -- coordinates ----------------------------------------------------------------
+
+
+def _perm_rank(perms: np.ndarray) -> np.ndarray:
+    """Lexicographic rank of each row of an (N, n) permutation array."""
+    n = perms.shape[1]
+    rank = np.zeros(len(perms), dtype=np.int64)
+    for i in range(n - 1):
+        smaller_after = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+        rank = rank + smaller_after * factorial(n - 1 - i)
+    return rank
+
+
+def _rank(perm: list[int]) -> int:
+    """Scalar `_perm_rank` for the search."""
+    n = len(perm)
+    rank = 0
+    for i in range(n - 1):
+        rank += sum(1 for x in perm[i + 1:] if x < perm[i]) * factorial(n - 1 - i)
+    return rank
+
+
+def _twist_coord(twist: np.ndarray) -> np.ndarray:
+    return twist[:, :7].astype(np.int64) @ (3 ** np.arange(6, -1, -1))
+
+
+def _twist_digits(coords: np.ndarray) -> np.ndarray:
+    digits = coords[:, None] // (3 ** np.arange(6, -1, -1)) % 3
+    return np.concatenate([digits, (-digits.sum(axis=1, keepdims=True)) % 3], axis=1)
+
+
+def _flip_coord(flip: np.ndarray) -> np.ndarray:
+    return flip[:, :11].astype(np.int64) @ (2 ** np.arange(10, -1, -1))
+
+
+def _flip_digits(coords: np.ndarray) -> np.ndarray:
+    digits = coords[:, None] // (2 ** np.arange(10, -1, -1)) % 2
+    return np.concatenate([digits, digits.sum(axis=1, keepdims=True) % 2], axis=1)
+
+
+def _slice_coord(is_slice: np.ndarray) -> np.ndarray:
+    """Coordinate of an (N, 12) bool array marking positions that hold E-slice edges."""
+    return _SLICE_INDEX_BY_MASK[is_slice.astype(np.int64) @ (1 << np.arange(12))]
+
+
+# -- tables -------------------------------------------------------------------
+
+
+class _Tables:
+    """Move tables as flat lists (index coord * n_moves + k) and int8 pruning tables.
+
+    The lists (about 60 MB of Python ints) are registered with `TABLES` as
+    pinned move tables; the NumPy move tables are only kept for the builds.
+    """
+
+    def __init__(self) -> None:
+        t = move_tables()
+        twist_add = additive_twist(t.corner_add)
+        fb_flip = np.stack([fb_edge_orientation(t.edge_src[k], t.edge_flip[k]) for k in range(_N_MOVES)])
+
+        twist = _twist_digits(np.arange(_N_TWIST))
+        flip = _flip_digits(np.arange(_N_FLIP))
+        slices = np.array([[p in combo for p in range(12)] for combo in _SLICE_COMBOS])
+        perm8 = np.array(list(permutations(range(8))), dtype=np.int64)
+        perm4 = np.array(list(permutations(range(4))), dtype=np.int64)
+
+        twist_move, flip_move, slice_move, corner_move = [], [], [], []
+        ud_move, slice_perm_move = [], []
+        for k in range(_N_MOVES):
+            twist_move.append(_twist_coord((twist[:, t.corner_src[k]] + twist_add[k]) % 3))
+            flip_move.append(_flip_coord(flip[:, t.edge_src[k]] ^ fb_flip[k]))
+            slice_move.append(_slice_coord(slices[:, t.edge_src[k]]))
+            corner_move.append(_perm_rank(perm8[:, t.corner_src[k]]))
+            if k in _PHASE2_MOVES:
+                ud_src = [_UD_LOCAL[int(t.edge_src[k][pos])] for pos in _UD_POSITIONS]
+                slice_src = [int(t.edge_src[k][pos]) - 4 for pos in _SLICE_POSITIONS]
+                ud_move.append(_perm_rank(perm8[:, ud_src]))
+                slice_perm_move.append(_perm_rank(perm4[:, slice_src]))
+            else:
+                ud_move.append(np.zeros(_N_PERM8, dtype=np.int64))
+                slice_perm_move.append(np.zeros(_N_SLICE_PERM, dtype=np.int64))
+
+        moves = {
+            'twist': np.stack(twist_move, axis=1),
+            'flip': np.stack(flip_move, axis=1),
+            'slice': np.stack(slice_move, axis=1),
+            'corner': np.stack(corner_move, axis=1),
+            'ud': np.stack(ud_move, axis=1),
+            'slice_perm': np.stack(slice_perm_move, axis=1),
+        }
+
+        self.slice_twist = self._pruning('slice_twist', moves['slice'], moves['twist'], _SLICE_GOAL, 0, range(_N_MOVES))
+        self.slice_flip = self._pruning('slice_flip', moves['slice'], moves['flip'], _SLICE_GOAL, 0, range(_N_MOVES))
+        self.corner_slice = self._pruning('corner_slice', moves['corner'], moves['slice_perm'], 0, 0, _PHASE2_MOVES)
+        self.ud_slice = self._pruning('ud_slice', moves['ud'], moves['slice_perm'], 0, 0, _PHASE2_MOVES)
+        self.twist_flip = self._pruning('twist_flip', moves['twist'], moves['flip'], 0, 0, range(_N_MOVES))
+
+        # Search-side views: flat lists index as coord * n_moves + move.
+        for name, table in moves.items():
+            move_list = TABLES.get(
+                f'two_phase_{name}_moves', lambda table=table: (table.ravel().tolist(), True), pinned=True, kind=MOVE
+            )
+            setattr(self, f'{name}_move_list', move_list)
+        for name in ('slice_twist', 'slice_flip', 'twist_flip', 'corner_slice', 'ud_slice'):
+            setattr(self, f'{name}_view', memoryview(getattr(self, name)).cast('b'))
+        self.corner_src = t.corner_src.tolist()
+        self.edge_src = t.edge_src.tolist()
+
+    @staticmethod
+    def _pruning(name, move_a: np.ndarray, move_b: np.ndarray, goal_a: int, goal_b: int, moves) -> np.ndarray:
+        n_b = move_b.shape[0]
+        size = move_a.shape[0] * n_b
+        moves = list(moves)
+
+        def build() -> np.ndarray:
+            dist = np.full(size, -1, dtype=np.int8)
+            dist[goal_a * n_b + goal_b] = 0
+            frontier = np.array([goal_a * n_b + goal_b], dtype=np.int64)
+            depth = 0
+            while frontier.size:
+                depth += 1
+                a, b = np.divmod(frontier, n_b)
+                nxt = (move_a[a][:, moves] * n_b + move_b[b][:, moves]).reshape(-1)
+                dist[nxt[dist[nxt] < 0]] = depth
+                frontier = np.flatnonzero(dist == depth)
+            return dist
+
+        # Pinned: the solver keeps views of all five for the life of the process.
+        return load_or_build(_TABLE_DIR / f'two_phase_{name}_v{_TABLE_VERSION}.npy', (size,), build, pinned=True)
+
+
+def _tables() -> _Tables:
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = _Tables()
+    return _TABLES
+
+
+# -- search -------------------------------------------------------------------
+
+
+def _check_solvable(ai_state: CubeAIState) -> None:
+    cp = np.asarray(ai_state.corner_permutation)
+    ep = np.asarray(ai_state.edge_permutation)
+    if sorted(cp.tolist()) != list(range(8)) or sorted(ep.tolist()) != list(range(12)):
+        raise ValueError('invalid cube: pieces are missing or duplicated')
+    if twist_total(ai_state.corner_orientation):
+        raise ValueError('invalid cube: corner twist does not sum to zero')
+    if int(np.sum(ai_state.edge_orientation)) % 2:
+        raise ValueError('invalid cube: odd number of flipped edges')
+    if permutation_parity(cp) != permutation_parity(ep):
+        raise ValueError('invalid cube: corner and edge permutation parities differ')
+
+
+class _Search:
+    """Kociemba's two-phase search on flat Python lists; keeps the best solution found."""
+
+    def __init__(
+        self,
+        ai_state: CubeAIState,
+        max_length: int,
+        deadline: Optional[float],
+        on_improve: Optional[Callable[[list[int]], None]] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        self.tables = _tables()
+        self.cp = [int(x) for x in ai_state.corner_permutation]
+        self.ep = [int(x) for x in ai_state.edge_permutation]
+        self.start = (
+            int(_twist_coord(additive_twist(ai_state.corner_orientation)[None])[0]),
+            int(_flip_coord(fb_edge_orientation(ai_state.edge_permutation, ai_state.edge_orientation)[None])[0]),
+            int(_slice_coord(np.isin(ai_state.edge_permutation, _SLICE_POSITIONS)[None])[0]),
+        )
+        self.max_length = max_length
+        self.deadline = deadline
+        self.on_improve = on_improve
+        self.stop = stop
+        self.best: Optional[list[int]] = None
+
+    def run(self) -> Optional[list[int]]:
+        # Everything the recursion touches is bound to closure locals; this is
+        # the hot loop of the solver and attribute lookups dominate otherwise.
+        t = self.tables
+        twist_move, flip_move, slice_move = t.twist_move_list, t.flip_move_list, t.slice_move_list
+        corner_move, ud_move, slice_perm_move = t.corner_move_list, t.ud_move_list, t.slice_perm_move_list
+        slice_twist, slice_flip, twist_flip = t.slice_twist_view, t.slice_flip_view, t.twist_flip_view
+        corner_slice, ud_slice = t.corner_slice_view, t.ud_slice_view
+        corner_src, edge_src = t.corner_src, t.edge_src
+        next1, next2, phase2_moves = _NEXT1, _NEXT2, frozenset(_PHASE2_MOVES)
+        path: list[int] = []
+
+        def phase1(twist: int, flip: int, slc: int, togo: int, prev: int) -> bool:
+            if togo == 0:
+                # A phase-2 move last means a shorter phase 1 was already tried.
+                if twist == 0 and flip == 0 and slc == _SLICE_GOAL and (not path or path[-1] not in phase2_moves):
+                    return start_phase2()
+                return False
+            togo -= 1
+            twist *= _N_MOVES
+            flip *= _N_MOVES
+            slc *= _N_MOVES
+            for k in next1[prev]:
+                nt = twist_move[twist + k]
+                nf = flip_move[flip + k]
+                ns = slice_move[slc + k]
+                if (
+                    slice_twist[ns * _N_TWIST + nt] > togo
+                    or slice_flip[ns * _N_FLIP + nf] > togo
+                    or twist_flip[nt * _N_FLIP + nf] > togo
+                ):
+                    continue
+                path.append(k)
+                found = phase1(nt, nf, ns, togo, k // 3)
+                path.pop()
+                if found:
+                    return True
+            return False
+
+        def phase2(corner: int, ud: int, sp: int, togo: int, prev: int, tail: list[int]) -> bool:
+            if togo == 0:
+                return corner == 0 and ud == 0 and sp == 0
+            togo -= 1
+            corner *= _N_MOVES
+            ud *= _N_MOVES
+            sp *= _N_MOVES
+            for k in next2[prev]:
+                nc = corner_move[corner + k]
+                nu = ud_move[ud + k]
+                ns = slice_perm_move[sp + k]
+                if corner_slice[nc * _N_SLICE_PERM + ns] > togo or ud_slice[nu * _N_SLICE_PERM + ns] > togo:
+                    continue
+                if phase2(nc, nu, ns, togo, k // 3, tail):
+                    tail.append(k)
+                    return True
+            return False
+
+        def start_phase2() -> bool:
+            cp, ep = self.cp, self.ep
+            for k in path:
+                src = corner_src[k]
+                cp = [cp[i] for i in src]
+                src = edge_src[k]
+                ep = [ep[i] for i in src]
+            corner = _rank(cp)
+            ud = _rank([_UD_LOCAL[ep[p]] for p in _UD_POSITIONS])
+            sp = _rank([ep[p] - 4 for p in _SLICE_POSITIONS])
+
+            limit = min((len(self.best) - 1 if self.best is not None else 30) - len(path), _PHASE2_MAX_DEPTH)
+            h = max(corner_slice[corner * _N_SLICE_PERM + sp], ud_slice[ud * _N_SLICE_PERM + sp])
+            prev = path[-1] // 3 if path else 6
+            for togo in range(h, limit + 1):
+                tail: list[int] = []
+                if phase2(corner, ud, sp, togo, prev, tail):
+                    self.best = path + tail[::-1]
+                    if self.on_improve is not None:
+                        self.on_improve(list(self.best))
+                    break
+            return self._done()
+
+        twist, flip, slc = self.start
+        depth = max(
+            slice_twist[slc * _N_TWIST + twist], slice_flip[slc * _N_FLIP + flip], twist_flip[twist * _N_FLIP + flip]
+        )
+        while self.best is None or depth < len(self.best):
+            if phase1(twist, flip, slc, depth, 6):
+                break
+            depth += 1
+        return self.best
+
+    def _done(self) -> bool:
+        if self.stop is not None and self.stop():
+            return True
+        if self.best is None:
+            return False
+        if len(self.best) <= self.max_length:
+            return True
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+
+class TwoPhaseSolver:
+    """Full-cube solver using Kociemba's two-phase algorithm.
+
+    Phase 1 reaches the subgroup <U, D, R2, L2, F2, B2> (corners twisted and
+    edges flipped correctly, E-slice edges in the slice), phase 2 solves
+    within it. Coordinates come from `CubeAIState`; the five pruning tables
+    (about 8.5M entries together) are built once and cached in ``ai/_tables``.
+    The search keeps improving its best solution until it is at most
+    ``max_length`` moves or ``timeout`` seconds have passed.
+    """
+
+    def __init__(self, max_length: int = 21, timeout: Optional[float] = 5.0):
+        self.max_length = max_length
+        self.timeout = timeout
+
+    @staticmethod
+    def warmup() -> None:
+        """Build or load all tables now instead of on the first solve."""
+        _tables()
+
+    def solve(
+        self,
+        start_cube: CubeState | CubeAIState,
+        on_improve: Optional[Callable[[list[str]], None]] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> Optional[list[str]]:
+        """Solution in face turns; raises ValueError for an unsolvable cube.
+
+        ``on_improve`` is called with every shorter solution as it is found and
+        ``stop`` is polled to end the search early. The result is None only
+        when ``stop`` ends the search before the first solution.
+        """
+        if isinstance(start_cube, CubeState):
+            normalized, _ = normalize_orientation(start_cube)
+            if is_default_orientation(start_cube):
+                return self.solve(CubeAIState.from_cube_state(normalized), on_improve, stop)
+            centers = center_colors(start_cube)
+            report = None if on_improve is None else (lambda moves: on_improve(translate_moves(moves, centers)))
+            moves = self.solve(CubeAIState.from_cube_state(normalized), report, stop)
+            return None if moves is None else translate_moves(moves, centers)
+
+        _check_solvable(start_cube)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        report = None if on_improve is None else (lambda best: on_improve([MOVE_TOKENS[k] for k in best]))
+        best = _Search(start_cube, self.max_length, deadline, report, stop).run()
+        return None if best is None else [MOVE_TOKENS[k] for k in best]
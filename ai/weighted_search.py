@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping, Optional
+
+from ai.bfs_solver import cross_coordinates, cross_distance_table, cross_move_table
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, normalize_orientation, translate_moves
+from core.constants import FACE_B, FACE_D, FACE_F, FACE_L, FACE_NAMES, FACE_R, FACE_U, MOVE_TOKENS
+from core.cube_state import CubeState
+
+
+_ALL_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+_N_MOVES = len(MOVE_TOKENS)
+_START = _N_MOVES  # "previous move" of the empty sequence
+
+# The A* heuristic is the move-count table times the cheapest move, so a move
+# much cheaper than the rest makes it weak: with U at 0.2 and everything else
+# at 1 one search took 18 s. Keeping the cheapest turn at half the median or
+# more keeps the worst case under about half a second per cube.
+MIN_COST_RATIO = 0.5
+
+
+@dataclass(frozen=True)
+class MoveCosts:
+    """Execution cost of each physical move, plus extra cost for move pairs.
+
+    ``moves`` maps a token (``"D'"``) or a face letter (``'B'``, all its turns)
+    to a cost; tokens win over letters and anything unlisted costs
+    ``default``. ``transitions`` maps (previous, next) pairs, again tokens or
+    face letters, to a non-negative extra cost, e.g. a regrip between R and F.
+    """
+
+    moves: Mapping[str, float] = field(default_factory=dict)
+    transitions: Mapping[tuple[str, str], float] = field(default_factory=dict)
+    default: float = 1.0
+
+    def __post_init__(self) -> None:
+        known = set(MOVE_TOKENS) | set(FACE_NAMES)
+        for key in [*self.moves, *(k for pair in self.transitions for k in pair)]:
+            if key not in known:
+                raise ValueError(f'unknown move in costs: {key!r}')
+        if not all(math.isfinite(c) for c in [self.default, *self.moves.values(), *self.transitions.values()]):
+            raise ValueError('costs must be finite numbers')
+        if self.default <= 0 or any(c <= 0 for c in self.moves.values()):
+            raise ValueError('move costs must be positive')
+        if any(c < 0 for c in self.transitions.values()):
+            raise ValueError('transition costs must be non-negative')
+        token_costs = [self.move_cost(tok) for tok in MOVE_TOKENS]
+        floor = MIN_COST_RATIO * statistics.median(token_costs)
+        if min(token_costs) < floor:
+            raise ValueError(f'the cheapest move must cost at least {floor:g} (half the median move cost)')
+
+    def move_cost(self, token: str) -> float:
+        return float(self.moves.get(token, self.moves.get(token[0], self.default)))
+
+    def transition_cost(self, prev: str, token: str) -> float:
+        for key in ((prev, token), (prev, token[0]), (prev[0], token), (prev[0], token[0])):
+            if key in self.transitions:
+                return float(self.transitions[key])
+        return 0.0
+
+    def sequence_cost(self, moves: Iterable[str]) -> float:
+        total, prev = 0.0, None
+        for mv in moves:
+            total += self.move_cost(mv) + (0.0 if prev is None else self.transition_cost(prev, mv))
+            prev = mv
+        return round(total, 6)
+
+
+# Rough right-handed execution costs: R/U/L cheap, F and D slower, B and
+# back-to-front regrips slowest. Meant as a starting point for `parse_costs`.
+ERGONOMIC_COSTS = MoveCosts(
+    moves={'R': 1.0, 'U': 1.0, "U'": 1.0, 'L': 1.1, 'F': 1.3, 'D': 1.3, "D'": 1.5, 'B': 2.0,
+           'R2': 1.4, 'U2': 1.4, 'L2': 1.5, 'F2': 1.8, 'D2': 1.8, 'B2': 2.6},
+    transitions={('R', 'F'): 0.4, ('F', 'R'): 0.4, ('L', 'F'): 0.4, ('F', 'L'): 0.4, ('B', 'F'): 0.6, ('F', 'B'): 0.6},
+)
+
+
+def parse_costs(text: str, base: MoveCosts = ERGONOMIC_COSTS) -> MoveCosts:
+    """Override ``base`` from e.g. ``"B=3, D'=1.6, R>F=0.5"`` (``a>b`` sets a transition)."""
+    moves = dict(base.moves)
+    transitions = dict(base.transitions)
+    for item in re.split(r'[\s,;]+', text.strip()):
+        if not item:
+            continue
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f'expected move=cost, got {item!r}')
+        try:
+            cost = float(value)
+        except ValueError:
+            raise ValueError(f'invalid cost in {item!r}') from None
+        if '>' in key:
+            prev, nxt = key.split('>', 1)
+            transitions[(prev, nxt)] = cost
+        else:
+            moves[key] = cost
+    return MoveCosts(moves, transitions, base.default)
+
+
+@dataclass(frozen=True)
+class WeightedCrossSolution:
+    face: int
+    moves: tuple[str, ...]
+    cost: float
+
+    @property
+    def move_count(self) -> int:
+        return len(self.moves)
+
+
+def _cost_tables(costs: MoveCosts, physical: list[str]) -> tuple[list[float], list[list[float]]]:
+    """Per-move and (prev, move) costs indexed like `MOVE_TOKENS`, for the physical tokens."""
+    step = [costs.move_cost(tok) for tok in physical]
+    trans = [[costs.transition_cost(prev, tok) for tok in physical] for prev in physical]
+    trans.append([0.0] * _N_MOVES)  # nothing before the first move
+    return step, trans
+
+
+def _astar(
+    start: int, dist, move_table, step: list[float], trans: list[list[float]], stop: Optional[Callable[[], bool]] = None
+) -> Optional[tuple[list[int], float]]:
+    """A* over (cross index, previous move) with the move-count table scaled by the cheapest move."""
+    scale = min(step)
+    pops = 0
+    best_g = {(start, _START): 0.0}
+    parent: dict[tuple[int, int], tuple[int, int]] = {}
+    heap = [(dist[start] * scale, 0.0, start, _START)]
+    while heap:
+        _, g, index, prev = heapq.heappop(heap)
+        if g > best_g[(index, prev)]:
+            continue
+        pops += 1
+        if stop is not None and pops % 1024 == 0 and stop():
+            return None
+        if dist[index] == 0:
+            path = []
+            node = (index, prev)
+            while node[1] != _START:
+                path.append(node[1])
+                node = parent[node]
+            return path[::-1], g
+        row = trans[prev]
+        base = index * _N_MOVES
+        for k in range(_N_MOVES):
+            nxt = move_table[base + k]
+            ng = g + step[k] + row[k]
+            key = (nxt, k)
+            if ng < best_g.get(key, float('inf')):
+                best_g[key] = ng
+                parent[key] = (index, prev)
+                heapq.heappush(heap, (ng + dist[nxt] * scale, ng, nxt, k))
+    return None
+
+
+def find_weighted_cross_solutions(
+    cube: CubeState,
+    costs: MoveCosts = ERGONOMIC_COSTS,
+    faces: Iterable[int] = _ALL_FACES,
+    stop: Optional[Callable[[], bool]] = None,
+) -> list[WeightedCrossSolution]:
+    """Cheapest-to-execute cross per face under ``costs``, sorted by cost.
+
+    Optimal under the cost model: the move-count distance table times the
+    cheapest move cost never overestimates, so A* returns the cheapest
+    sequence. Costs refer to the moves as performed on ``cube``, including
+    after rotations in the scramble. Faces whose search is cut short by
+    ``stop`` are left out.
+    """
+    normalized, _ = normalize_orientation(cube)
+    ai_state = CubeAIState.from_cube_state(normalized)
+    physical = translate_moves(list(MOVE_TOKENS), center_colors(cube))
+    step, trans = _cost_tables(costs, physical)
+    move_table = memoryview(cross_move_table()).cast('B').cast('i')
+
+    results = []
+    for face in faces:
+        dist = memoryview(cross_distance_table(face)).cast('B').cast('h')
+        start = int(cross_coordinates(ai_state.edge_permutation, ai_state.edge_orientation, face))
+        found = _astar(start, dist, move_table, step, trans, stop)
+        if found is not None:
+            path, cost = found
+            results.append(WeightedCrossSolution(face, tuple(physical[k] for k in path), round(cost, 6)))
+    results.sort(key=lambda r: (r.cost, r.move_count, r.face))
+    return results
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from ai.batch_move_engine import canonical_successors
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import Rotation, center_colors, normalize_orientation, reframe, rotations, translate_moves, unframe_moves
+from ai.pruning_table import CORNER, EDGE, PieceSet, PruningTable, TableSpec
+from ai.table_manager import MOVE, TABLES
+from core.constants import (
+    CORNER_DFR,
+    EDGE_DB,
+    EDGE_DF,
+    EDGE_DL,
+    EDGE_DR,
+    EDGE_FR,
+    EDGE_STICKER_POSITIONS,
+    FACE_B,
+    FACE_D,
+    FACE_F,
+    FACE_L,
+    FACE_R,
+    FACE_U,
+    MOVE_TOKENS,
+)
+from core.cube_state import CubeState
+
+
+_MOVES = tuple(MOVE_TOKENS)
+_N_MOVES = len(_MOVES)
+_N_PIECE = 24  # 8 corner positions x 3 twists, or 12 edge positions x 2 flips
+
+# Canonical problem: D cross plus the DFR corner / FR edge pair. Every other
+# (cross face, slot) combination is mapped onto it by a whole-cube rotation.
+_CANON_CORNER = CORNER_DFR
+_CANON_EDGE = EDGE_FR
+_CANON_CROSS = (EDGE_DF, EDGE_DR, EDGE_DB, EDGE_DL)
+
+XCROSS_CORNER_SPEC = TableSpec('xcross_corner', (PieceSet(EDGE, _CANON_CROSS), PieceSet(CORNER, (_CANON_CORNER,))))
+XCROSS_EDGE_SPEC = TableSpec('xcross_edge', (PieceSet(EDGE, _CANON_CROSS), PieceSet(EDGE, (_CANON_EDGE,))))
+
+_PRUNE: tuple[PruningTable, PruningTable] | None = None
+_MOVE_LISTS: tuple[memoryview, list[list[int]], list[list[int]]] | None = None
+_FRAMES: dict[tuple[int, int], Rotation] = {}
+
+
+@dataclass(frozen=True)
+class XCrossSolution:
+    face: int  # cross face
+    slot: int  # edge id of the F2L slot
+    moves: tuple[str, ...]
+
+
+def _faces_of(coords: list[tuple[int, int, int]]) -> frozenset[int]:
+    return frozenset(f for f, _, _ in coords)
+
+
+def slots_for_face(face: int) -> tuple[int, ...]:
+    """F2L slot edges next to a cross face: edges touching neither it nor its opposite."""
+    opposite = {FACE_U: FACE_D, FACE_D: FACE_U, FACE_F: FACE_B, FACE_B: FACE_F, FACE_L: FACE_R, FACE_R: FACE_L}
+    if face not in opposite:
+        raise ValueError(f'unknown face id: {face!r}')
+    banned = {face, opposite[face]}
+    return tuple(e for e, coords in EDGE_STICKER_POSITIONS.items() if not _faces_of(coords) & banned)
+
+
+def _frame_for(face: int, slot: int) -> Rotation:
+    """Rotation that brings ``face`` to D and the ``slot`` edge to FR."""
+    frame = _FRAMES.get((face, slot))
+    if frame is not None:
+        return frame
+    if slot not in slots_for_face(face):
+        raise ValueError(f'edge {slot!r} is not an F2L slot of face {face!r}')
+    slot_faces = _faces_of(EDGE_STICKER_POSITIONS[slot])
+    for rot in rotations():
+        if rot.perm[FACE_D] == face and {rot.perm[FACE_F], rot.perm[FACE_R]} == slot_faces:
+            _FRAMES[(face, slot)] = rot
+            return rot
+    raise AssertionError('no rotation found')  # unreachable: the 24 rotations cover every frame
+
+
+def _pruning_tables() -> tuple[PruningTable, PruningTable]:
+    global _PRUNE
+    if _PRUNE is None:
+        _PRUNE = (PruningTable(XCROSS_CORNER_SPEC), PruningTable(XCROSS_EDGE_SPEC))
+    return _PRUNE
+
+
+def _move_lists() -> tuple[memoryview, list[list[int]], list[list[int]]]:
+    """Cross, corner and edge transitions for the search (the cross one is `cross_move_table`)."""
+    global _MOVE_LISTS
+    if _MOVE_LISTS is None:
+        corner_table, edge_table = _pruning_tables()
+        cross, corner = corner_table.components
+        edge = edge_table.components[1]
+        _MOVE_LISTS = (
+            memoryview(np.ascontiguousarray(cross.move_table(_MOVES))).cast('B').cast('i'),
+            *(
+                TABLES.get(f'xcross_{c.kind}_moves', lambda c=c: (c.move_table(_MOVES).tolist(), True), pinned=True, kind=MOVE)
+                for c in (corner, edge)
+            ),
+        )
+    return _MOVE_LISTS
+
+
+def _canonical_coords(ai_state: CubeAIState) -> tuple[int, int, int]:
+    corner_table, edge_table = _pruning_tables()
+    cross, corner = divmod(corner_table.index(ai_state), _N_PIECE)
+    edge = edge_table.index(ai_state) % _N_PIECE
+    return cross, corner, edge
+
+
+_NEXT_MOVES = canonical_successors(range(_N_MOVES))
+
+
+class _Search:
+    """IDA* state shared by the recursive search of one canonical x-cross."""
+
+    def __init__(self, coords: tuple[int, int, int], stop: Optional[Callable[[], bool]] = None) -> None:
+        corner_table, edge_table = _pruning_tables()
+        self.cross_moves, self.corner_moves, self.edge_moves = _move_lists()
+        self.corner_table = memoryview(corner_table.table).cast('b')
+        self.edge_table = memoryview(edge_table.table).cast('b')
+        self.coords = coords
+        self.stop = stop
+        self.stopped = False
+        self.path: list[int] = []
+
+    def heuristic(self, cross: int, corner: int, edge: int) -> int:
+        return max(self.corner_table[cross * _N_PIECE + corner], self.edge_table[cross * _N_PIECE + edge])
+
+    def lower_bound(self) -> int:
+        return self.heuristic(*self.coords)
+
+    def search(self, bound: int) -> Optional[list[str]]:
+        self.path = []
+        if self._dfs(*self.coords, 0, bound, 6):
+            return [MOVE_TOKENS[k] for k in self.path]
+        return None
+
+    def _dfs(self, cross: int, corner: int, edge: int, depth: int, bound: int, prev: int) -> bool:
+        h = self.heuristic(cross, corner, edge)
+        if h == 0:
+            return True
+        if depth + h > bound:
+            return False
+        if depth < 4 and self.stop is not None and (self.stopped or self.stop()):
+            self.stopped = True  # unwinds the recursion; the caller discards this iteration
+            return False
+        for k in _NEXT_MOVES[prev]:
+            self.path.append(k)
+            if self._dfs(
+                self.cross_moves[cross * _N_MOVES + k],
+                self.corner_moves[corner][k],
+                self.edge_moves[edge][k],
+                depth + 1,
+                bound,
+                k // 3,
+            ):
+                return True
+            self.path.pop()
+        return False
+
+
+def _canonical_searches(
+    cube: CubeState, combos: Iterable[tuple[int, int]], stop: Optional[Callable[[], bool]] = None
+) -> list[tuple[int, int, Rotation, _Search]]:
+    out = []
+    for face, slot in combos:
+        frame = _frame_for(face, slot)
+        ai_state = CubeAIState.from_cube_state(reframe(cube, frame))
+        out.append((face, slot, frame, _Search(_canonical_coords(ai_state), stop)))
+    return out
+
+
+def _to_cube_frame(moves: list[str], frame: Rotation, cube: CubeState) -> tuple[str, ...]:
+    moves = unframe_moves(moves, frame)
+    return tuple(translate_moves(moves, center_colors(cube)))
+
+
+def iter_xcross_depths(
+    cube: CubeState,
+    faces: Iterable[int] = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R),
+    max_depth: Optional[int] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[tuple[int, list[XCrossSolution]]]:
+    """Deepen all face/slot combinations together, yielding (depth, solutions) per completed depth.
+
+    Solutions stay empty until the first depth where any x-cross exists, which
+    is the last one yielded, so every yielded depth is a proven lower bound.
+    When ``stop`` returns true the generator ends without yielding the
+    interrupted depth.
+    """
+    normalized, _ = normalize_orientation(cube)
+    combos = [(face, slot) for face in faces for slot in slots_for_face(face)]
+    searches = _canonical_searches(normalized, combos, stop)
+    bound = min(search.lower_bound() for *_, search in searches)
+    limit = 20 if max_depth is None else max_depth
+    while bound <= limit:
+        found = []
+        for face, slot, frame, search in searches:
+            if search.lower_bound() > bound:
+                continue
+            moves = search.search(bound)
+            if search.stopped:
+                return
+            if moves is not None:
+                found.append(XCrossSolution(face, slot, _to_cube_frame(moves, frame, cube)))
+        yield bound, found
+        if found:
+            return
+        bound += 1
+
+
+def find_best_xcross_solutions(
+    cube: CubeState,
+    faces: Iterable[int] = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R),
+    max_depth: Optional[int] = None,
+) -> tuple[int, list[XCrossSolution]]:
+    """Optimal x-crosses over every requested cross face and each of its four slots.
+
+    All combinations are deepened together, so the search stops at the first
+    depth where any x-cross exists and returns every combination tied there.
+    Returns (best_len, solutions); (10**9, []) when nothing fits ``max_depth``.
+    """
+    for bound, found in iter_xcross_depths(cube, faces, max_depth):
+        if found:
+            return bound, found
+    return 10**9, []
+
+
+class XCrossSolver:
+    """Optimal cross + first pair for one cross face and F2L slot.
+
+    IDA* over (cross index, corner coord, edge coord), using two pruning tables
+    declared through `ai.pruning_table`: cross x slot corner and cross x slot
+    edge. The larger of the two distances is an admissible heuristic. Both
+    tables are built once for the D cross / FR slot (about 4.5M entries each,
+    cached on disk) and shared by all 24 face/slot combinations through
+    whole-cube rotations.
+    """
+
+    def __init__(self, target_center_face: int = FACE_D, slot: int | None = None):
+        self.target_center_face = target_center_face
+        self.slot = slots_for_face(target_center_face)[0] if slot is None else slot
+        _frame_for(self.target_center_face, self.slot)  # validates the combination
+
+    def solve_xcross(self, start_cube: CubeState, max_depth: Optional[int] = None) -> Optional[list[str]]:
+        normalized, _ = normalize_orientation(start_cube)
+        (_, _, frame, search), = _canonical_searches(normalized, [(self.target_center_face, self.slot)])
+        limit = 20 if max_depth is None else max_depth
+        for bound in range(search.lower_bound(), limit + 1):
+            moves = search.search(bound)
+            if moves is not None:
+                return list(_to_cube_frame(moves, frame, start_cube))
+        return None
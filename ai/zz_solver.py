@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import center_colors, reframe, rotations
+from ai.pruning_table import EDGE, PieceSet, PruningTable, TableSpec
+from core.constants import EDGE_DB, EDGE_DF, EDGE_DL, EDGE_DR, FACE_D, FACE_F
+from core.cube_state import CubeState
+
+
+EOLINE = 'eoline'
+EOCROSS = 'eocross'
+ZZ_STEPS = (EOLINE, EOCROSS)
+
+# Edge orientation is the F/B-axis definition; the line or cross edges only
+# need to be placed, their orientation is part of the EO coordinate.
+_EO = PieceSet(EDGE, position=False)
+ZZ_SPECS = {
+    EOLINE: TableSpec(EOLINE, (_EO, PieceSet(EDGE, (EDGE_DF, EDGE_DB), orientation=False))),
+    EOCROSS: TableSpec(EOCROSS, (_EO, PieceSet(EDGE, (EDGE_DF, EDGE_DR, EDGE_DB, EDGE_DL), orientation=False))),
+}
+
+_TABLES: dict[str, PruningTable] = {}
+
+
+@dataclass(frozen=True)
+class ZZSolution:
+    step: str  # EOLINE or EOCROSS
+    rotation: tuple[str, ...]  # inspection rotation, applied first
+    moves: tuple[str, ...]  # face turns in the rotated frame
+    bottom_color: int  # color code of the line / cross center
+    front_color: int  # color code of the front center (fixes the EO axis)
+    rotation_cost: float
+    cost: float  # rotation_cost + len(moves)
+
+    @property
+    def move_count(self) -> int:
+        return len(self.moves)
+
+    @property
+    def sequence(self) -> list[str]:
+        return [*self.rotation, *self.moves]
+
+
+def zz_table(step: str) -> PruningTable:
+    """Pruning table of a ZZ step (EOLine is 0.5M entries, EOCross 48.7M; both cached on disk)."""
+    if step not in ZZ_SPECS:
+        raise ValueError(f'unknown ZZ step: {step!r}')
+    table = _TABLES.get(step)
+    if table is None:
+        table = _TABLES[step] = PruningTable(ZZ_SPECS[step])
+    return table
+
+
+def find_zz_solutions(
+    cube: CubeState,
+    step: str = EOLINE,
+    rotation_cost: float | Mapping[str, float] = 1.0,
+) -> list[ZZSolution]:
+    """Optimal EOLine / EOCross for each of the 24 holding orientations.
+
+    Each orientation is solved on the canonical D line / cross with F/B edge
+    orientation after recoloring the rotated cube (see `reframe`), so one
+    table serves all of them. Sorted by total cost like
+    `find_oriented_cross_solutions`.
+    """
+    table = zz_table(step)
+    centers = center_colors(cube)
+    rots = list(rotations(rotation_cost))
+    held = [CubeAIState.from_cube_state(reframe(cube, rot)) for rot in rots]
+    indices = table.indices(*(
+        np.stack([getattr(state, name) for state in held])
+        for name in ('corner_permutation', 'corner_orientation', 'edge_permutation', 'edge_orientation')
+    ))
+    results: list[ZZSolution] = []
+    for rot, moves in zip(rots, table.solve_indices(indices)):
+        if moves is None:
+            continue
+        results.append(
+            ZZSolution(
+                step=step,
+                rotation=rot.tokens,
+                moves=tuple(moves),
+                bottom_color=centers[rot.perm[FACE_D]],
+                front_color=centers[rot.perm[FACE_F]],
+                rotation_cost=rot.cost,
+                cost=rot.cost + len(moves),
+            )
+        )
+    results.sort(key=lambda r: (r.cost, len(r.rotation), r.rotation))
+    return results
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from ai.bfs_solver import BFSSolver, cross_distance_table, cross_distances
+from core.constants import DEFAULT_FACE_COLOR, FACE_B, FACE_D, FACE_F, FACE_L, FACE_R, FACE_U
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+FACE_ORDER = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+
+_COLOR_NAME_BY_CODE = {
+    1: 'white',
+    2: 'yellow',
+    3: 'green',
+    4: 'blue',
+    5: 'orange',
+    6: 'red',
+}
+
+COLOR_BY_FACE = {face: _COLOR_NAME_BY_CODE[int(DEFAULT_FACE_COLOR[face])] for face in FACE_ORDER}
+
+# A single move token as accepted by CubeMoveEngine.apply().
+_MOVE_RE = re.compile(r"^[URFDLBMESxyzurfdlb](2|'|2'|)$")
+
+
+@dataclass(frozen=True)
+class ScrambleResult:
+    index: int
+    scramble: str
+    lengths: tuple[int, ...] = ()  # optimal cross length per face, in FACE_ORDER
+    best_length: int | None = None
+    best_faces: tuple[int, ...] = ()
+    solution: tuple[str, ...] = ()  # a shortest cross for best_faces[0]
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_scramble_line(line: str) -> list[str]:
+    """Extract the move tokens from one line of a session export.
+
+    Accepts bare scrambles as well as csTimer-style text exports such as
+    ``"12. 9.87   R U2 F' ..."``: leading numbering and times are skipped and
+    the first run of move tokens is returned. Blank lines and ``#`` comments
+    yield an empty list.
+    """
+    text = line.strip()
+    if not text or text.startswith('#'):
+        return []
+    tokens = text.replace(',', ' ').split()
+    start = 0
+    while start < len(tokens) and not _MOVE_RE.match(tokens[start]):
+        start += 1
+    moves: list[str] = []
+    for tok in tokens[start:]:
+        if not _MOVE_RE.match(tok):
+            break
+        # csTimer writes "2'" for double turns in some puzzles; it is just "2".
+        moves.append(tok[:-1] if tok.endswith("2'") else tok)
+    return moves
+
+
+def iter_scrambles(stream: TextIO) -> Iterator[str]:
+    """Lazily yield one normalized scramble string per non-empty input line."""
+    for line in stream:
+        moves = parse_scramble_line(line)
+        if moves:
+            yield ' '.join(moves)
+
+
+def solve_scramble(index: int, scramble: str) -> ScrambleResult:
+    cube = CubeState.solved()
+    try:
+        CubeMoveEngine(cube).apply_sequence(scramble.split())
+        by_face = cross_distances(cube)
+    except Exception as e:
+        return ScrambleResult(index=index, scramble=scramble, error=str(e))
+
+    lengths = tuple(by_face[face] for face in FACE_ORDER)
+    best_length = min(lengths)
+    best_faces = tuple(face for face in FACE_ORDER if by_face[face] == best_length)
+    solution = BFSSolver(target_center_face=best_faces[0]).solve_cross(cube) or []
+    return ScrambleResult(
+        index=index,
+        scramble=scramble,
+        lengths=lengths,
+        best_length=best_length,
+        best_faces=best_faces,
+        solution=tuple(solution),
+    )
+
+
+def _solve_chunk(chunk: list[tuple[int, str]]) -> list[ScrambleResult]:
+    return [solve_scramble(index, scramble) for index, scramble in chunk]
+
+
+def _init_worker() -> None:
+    # Load (or build) every cross table once per worker process, not per task.
+    for face in FACE_ORDER:
+        cross_distance_table(face)
+
+
+def _chunks(scrambles: Iterable[str], chunk_size: int) -> Iterator[list[tuple[int, str]]]:
+    it = enumerate(scrambles)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_stream(
+    scrambles: Iterable[str],
+    workers: int | None = None,
+    chunk_size: int = 256,
+    max_pending: int | None = None,
+) -> Iterator[ScrambleResult]:
+    """Solve scrambles as a stream, in input order.
+
+    With ``workers != 1`` the chunks are spread over a process pool. At most
+    ``max_pending`` chunks (default: two per worker) are in flight at any time,
+    so memory stays bounded regardless of the corpus size.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be >= 1')
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _init_worker()
+        for chunk in _chunks(scrambles, chunk_size):
+            yield from _solve_chunk(chunk)
+        return
+
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending: deque[Future] = deque()
+        for chunk in _chunks(scrambles, chunk_size):
+            pending.append(pool.submit(_solve_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+@dataclass
+class CorpusStats:
+    """Running aggregates over a stream of ScrambleResult."""
+
+    total: int = 0
+    failed: int = 0
+    ties: int = 0
+    length_counts: dict[int, Counter] = field(default_factory=lambda: {f: Counter() for f in FACE_ORDER})
+    best_length_counts: Counter = field(default_factory=Counter)
+    best_face_counts: Counter = field(default_factory=Counter)
+
+    def update(self, result: ScrambleResult) -> None:
+        self.total += 1
+        if not result.ok:
+            self.failed += 1
+            return
+        for face, length in zip(FACE_ORDER, result.lengths):
+            self.length_counts[face][length] += 1
+        self.best_length_counts[result.best_length] += 1
+        for face in result.best_faces:
+            self.best_face_counts[face] += 1
+        if len(result.best_faces) > 1:
+            self.ties += 1
+
+    def to_dict(self) -> dict:
+        solved = self.total - self.failed
+
+        def _dist(counter: Counter) -> dict[str, int]:
+            return {str(k): counter[k] for k in sorted(counter)}
+
+        def _mean(counter: Counter) -> float | None:
+            n = sum(counter.values())
+            return sum(k * v for k, v in counter.items()) / n if n else None
+
+        return {
+            'total': self.total,
+            'solved': solved,
+            'failed': self.failed,
+            'tie_rate': self.ties / solved if solved else None,
+            'best_length': {
+                'mean': _mean(self.best_length_counts),
+                'distribution': _dist(self.best_length_counts),
+            },
+            'colors': {
+                COLOR_BY_FACE[face]: {
+                    'mean': _mean(self.length_counts[face]),
+                    'distribution': _dist(self.length_counts[face]),
+                    'best_count': self.best_face_counts[face],
+                    'best_rate': self.best_face_counts[face] / solved if solved else None,
+                }
+                for face in FACE_ORDER
+            },
+        }
+
+
+class ResultWriter:
+    """Write per-scramble results as CSV or JSON lines, one row at a time."""
+
+    FORMATS = ('csv', 'jsonl')
+
+    def __init__(self, stream: TextIO, fmt: str = 'csv') -> None:
+        if fmt not in self.FORMATS:
+            raise ValueError(f'unknown output format: {fmt!r}')
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.writer(stream)
+            self._csv.writerow(
+                ['index', 'scramble']
+                + [COLOR_BY_FACE[f] for f in FACE_ORDER]
+                + ['best_length', 'best_colors', 'solution', 'error']
+            )
+
+    def write(self, result: ScrambleResult) -> None:
+        best_colors = [COLOR_BY_FACE[f] for f in result.best_faces]
+        if self._csv is not None:
+            lengths = list(result.lengths) if result.ok else [''] * len(FACE_ORDER)
+            self._csv.writerow(
+                [result.index, result.scramble]
+                + lengths
+                + [
+                    '' if result.best_length is None else result.best_length,
+                    ' '.join(best_colors),
+                    ' '.join(result.solution),
+                    result.error or '',
+                ]
+            )
+            return
+
+        row: dict = {'index': result.index, 'scramble': result.scramble}
+        if result.ok:
+            row['lengths'] = {COLOR_BY_FACE[f]: l for f, l in zip(FACE_ORDER, result.lengths)}
+            row['best_length'] = result.best_length
+            row['best_colors'] = best_colors
+            row['solution'] = ' '.join(result.solution)
+        else:
+            row['error'] = result.error
+        self.stream.write(json.dumps(row) + '\n')
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from ai.bfs_solver import _CROSS_EDGES_BY_FACE, _POSITIONS_BY_RANK, _init_rank_tables, cross_coordinates, cross_distance_table
+from analysis.corpus import FACE_ORDER
+
+
+@dataclass(frozen=True)
+class LengthDistribution:
+    """Probability of each optimal cross length for a uniformly random cube.
+
+    ``exact`` distributions are derived by enumerating the tables; otherwise
+    ``samples`` random states were drawn and ``stderr`` holds the binomial
+    standard error of every probability.
+    """
+
+    probabilities: dict[int, float]
+    exact: bool
+    samples: int | None = None
+    stderr: dict[int, float] | None = None
+
+    @property
+    def mean(self) -> float:
+        return sum(k * p for k, p in self.probabilities.items())
+
+    def to_dict(self) -> dict:
+        out = {
+            'exact': self.exact,
+            'mean': self.mean,
+            'probabilities': {str(k): p for k, p in self.probabilities.items()},
+        }
+        if not self.exact:
+            out['samples'] = self.samples
+            out['stderr'] = {str(k): e for k, e in (self.stderr or {}).items()}
+        return out
+
+
+def _from_counts(counts: np.ndarray) -> dict[int, float]:
+    total = int(counts.sum())
+    return {int(k): int(c) / total for k, c in enumerate(counts) if c}
+
+
+def _face_counts_by_mask(face: int) -> tuple[np.ndarray, np.ndarray]:
+    """Length histogram of one face's table grouped by the set of occupied positions.
+
+    Returns (masks, counts) where masks[i] is a 12-bit occupancy mask and
+    counts[i, d] the number of cross states on that mask at distance d.
+    """
+    _init_rank_tables()
+    positions = np.asarray(_POSITIONS_BY_RANK, dtype=np.int64)
+    rank_masks = (np.int64(1) << positions).sum(axis=1)
+    masks, mask_ids = np.unique(rank_masks, return_inverse=True)
+
+    dist = cross_distance_table(face).reshape(len(positions), 16).astype(np.int64)
+    n_lengths = int(dist.max()) + 1
+    counts = np.zeros((len(masks), n_lengths), dtype=np.int64)
+    np.add.at(counts, (np.repeat(mask_ids, 16), dist.reshape(-1)), 1)
+    return masks, counts
+
+
+def face_length_distribution(face: int) -> LengthDistribution:
+    """Exact cross length distribution for one face (a plain table histogram)."""
+    dist = cross_distance_table(face)
+    counts = np.bincount(dist[dist >= 0])
+    return LengthDistribution(_from_counts(counts), exact=True)
+
+
+def pair_length_distribution(face_a: int, face_b: int) -> LengthDistribution:
+    """Exact distribution of min(cross_a, cross_b) for two faces with disjoint cross edges.
+
+    Given the set of positions occupied by face_a's edges, face_b's edges are
+    uniformly placed and oriented over the remaining eight positions, so the two
+    lengths are conditionally independent and the joint histogram is a sum over
+    the 495 occupancy sets.
+    """
+    if set(_CROSS_EDGES_BY_FACE[face_a]) & set(_CROSS_EDGES_BY_FACE[face_b]):
+        raise ValueError(f'faces {face_a} and {face_b} share cross edges; use color_neutral_length_distribution')
+
+    masks_a, counts_a = _face_counts_by_mask(face_a)
+    masks_b, counts_b = _face_counts_by_mask(face_b)
+    disjoint = ((masks_a[:, None] & masks_b[None, :]) == 0).astype(np.int64)
+    counts_b_given_a = disjoint @ counts_b  # (|masks_a|, lengths_b)
+    joint = counts_a.T @ counts_b_given_a  # joint[la, lb]
+
+    la, lb = np.indices(joint.shape)
+    counts = np.bincount(np.minimum(la, lb).reshape(-1), weights=joint.reshape(-1)).astype(np.int64)
+    return LengthDistribution(_from_counts(counts), exact=True)
+
+
+def random_edge_states(n: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Uniformly random reachable edge permutations/orientations, shape (n, 12) each."""
+    ep = np.argsort(rng.random((n, 12)), axis=1).astype(np.int8)
+    eo = rng.integers(0, 2, size=(n, 12), dtype=np.int8)
+    eo[:, 11] = eo[:, :11].sum(axis=1) & 1  # total flip is always even
+    return ep, eo
+
+
+def color_neutral_length_distribution(
+    faces: Iterable[int] = FACE_ORDER,
+    samples: int = 1_000_000,
+    seed: int | None = None,
+    batch_size: int = 250_000,
+) -> LengthDistribution:
+    """Distribution of the best cross over ``faces``.
+
+    One face, or two faces with disjoint cross edges (opposite colors), are
+    answered exactly. Otherwise random edge states are drawn and every face is
+    looked up in its table; no search is involved, so a million samples take
+    about a second.
+    """
+    faces = tuple(dict.fromkeys(faces))
+    if not faces:
+        raise ValueError('faces must not be empty')
+    if len(faces) == 1:
+        return face_length_distribution(faces[0])
+    if len(faces) == 2 and not set(_CROSS_EDGES_BY_FACE[faces[0]]) & set(_CROSS_EDGES_BY_FACE[faces[1]]):
+        return pair_length_distribution(*faces)
+    if samples < 1:
+        raise ValueError('samples must be >= 1')
+
+    rng = np.random.default_rng(seed)
+    tables = {face: cross_distance_table(face) for face in faces}
+    counts = np.zeros(16, dtype=np.int64)
+    remaining = samples
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        ep, eo = random_edge_states(n, rng)
+        best = np.full(n, np.iinfo(np.int16).max, dtype=np.int16)
+        for face, dist in tables.items():
+            np.minimum(best, dist[cross_coordinates(ep, eo, face)], out=best)
+        counts += np.bincount(best, minlength=len(counts))[: len(counts)]
+        remaining -= n
+
+    probabilities = _from_counts(counts)
+    stderr = {k: math.sqrt(p * (1.0 - p) / samples) for k, p in probabilities.items()}
+    return LengthDistribution(probabilities, exact=False, samples=samples, stderr=stderr)
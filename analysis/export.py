@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from ai.bfs_solver import cross_coordinates, cross_distance_table
+from analysis.corpus import FACE_ORDER
+from analysis.distributions import random_edge_states
+from conversion.packing import pack_cubies
+from core.cubie import CORNER_TWIST_SIGN, permutation_parity
+
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ExportField:
+    dtype: str
+    width: int  # values per row
+    description: str
+
+
+EXPORT_FIELDS = {
+    'cp': ExportField('int8', 8, 'corner permutation (cube_to_ai_arrays convention)'),
+    'co': ExportField('int8', 8, 'corner orientation'),
+    'ep': ExportField('int8', 12, 'edge permutation'),
+    'eo': ExportField('int8', 12, 'edge orientation'),
+    'packed': ExportField('uint64', 2, 'conversion.packing.pack_cubies keys'),
+    'cross_index': ExportField('int32', 6, 'cross-table index per face, in FACE_ORDER'),
+    'distance': ExportField('int8', 6, 'optimal cross length per face, in FACE_ORDER'),
+}
+DEFAULT_FIELDS = ('cp', 'co', 'ep', 'eo', 'cross_index', 'distance')
+
+# Peak temporary memory per row while a batch is computed (int64 copies made by
+# the permutation ranking and coordinate code): about 700 bytes with every
+# field under tracemalloc, rounded up. Turns a memory budget into a batch size.
+_WORK_BYTES_PER_ROW = 1024
+
+# Every block of this many rows in a chunk draws from its own seed, so the
+# data depends only on the seed and chunk_rows, not on the batch size.
+_SEED_BLOCK_ROWS = 1024
+
+
+def random_cube_states(n: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Uniformly random reachable cubie states (cp, co, ep, eo), one row per cube."""
+    ep, eo = random_edge_states(n, rng)
+    cp = np.argsort(rng.random((n, 8)), axis=1).astype(np.int8)
+    odd = permutation_parity(cp) != permutation_parity(ep)
+    cp[odd, :2] = cp[odd, 1::-1]
+    co = rng.integers(0, 3, size=(n, 8), dtype=np.int8)
+    # U-layer twists minus D-layer twists must vanish mod 3; DLF (a D corner) absorbs it.
+    co[:, 7] = (co[:, :7].astype(np.int64) * CORNER_TWIST_SIGN[:7]).sum(axis=1) % 3
+    return cp, co, ep, eo
+
+
+def compute_rows(cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray, fields: Iterable[str]) -> dict[str, np.ndarray]:
+    """Every requested field for a batch of cubie states, as (N, width) arrays."""
+    fields = tuple(fields)
+    out: dict[str, np.ndarray] = {'cp': cp, 'co': co, 'ep': ep, 'eo': eo}
+    if 'packed' in fields:
+        out['packed'] = pack_cubies(cp, co, ep, eo)
+    if 'cross_index' in fields or 'distance' in fields:
+        coords = np.stack([cross_coordinates(ep, eo, face) for face in FACE_ORDER], axis=1)
+        out['cross_index'] = coords.astype(np.int32)
+        if 'distance' in fields:
+            out['distance'] = np.stack(
+                [cross_distance_table(face)[coords[:, i]] for i, face in enumerate(FACE_ORDER)], axis=1
+            ).astype(np.int8)
+    return {name: out[name] for name in fields}
+
+
+def batch_rows_for_budget(memory_budget: int, fields: Iterable[str]) -> int:
+    """Rows per batch so one batch's arrays and temporaries fit in ``memory_budget`` bytes."""
+    row_bytes = _WORK_BYTES_PER_ROW + sum(
+        np.dtype(EXPORT_FIELDS[f].dtype).itemsize * EXPORT_FIELDS[f].width for f in fields
+    )
+    rows = memory_budget // row_bytes
+    if rows < 1:
+        raise ValueError(f'memory budget must be at least {row_bytes} bytes')
+    return int(rows)
+
+
+def export_dataset(
+    out_dir: str | Path,
+    rows: int,
+    chunk_rows: int = 1_000_000,
+    fields: Iterable[str] = DEFAULT_FIELDS,
+    seed: int | None = None,
+    memory_budget: int = 256 * 2**20,
+) -> dict:
+    """Write ``rows`` random cube states and their cross labels under ``out_dir``.
+
+    Each chunk of up to ``chunk_rows`` rows is one ``.npy`` file per field
+    (``<field>-00000.npy``, shape (rows, width)), filled through a memory map
+    in batches sized to ``memory_budget``; the chunk is flushed before the
+    next one starts, so memory use does not grow with ``rows``. The manifest
+    is rewritten after every chunk and lists only finished chunks. Returns it.
+    The same ``seed`` and ``chunk_rows`` give the same states whatever the
+    fields and memory budget.
+    """
+    fields = tuple(dict.fromkeys(fields))
+    unknown = [f for f in fields if f not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {unknown} (expected some of {', '.join(EXPORT_FIELDS)})")
+    if not fields:
+        raise ValueError('fields must not be empty')
+    if rows < 1 or chunk_rows < 1:
+        raise ValueError('rows and chunk_rows must be >= 1')
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    batch_rows = batch_rows_for_budget(memory_budget, fields) // _SEED_BLOCK_ROWS * _SEED_BLOCK_ROWS
+    if batch_rows < 1:
+        raise ValueError(f'memory budget is too small for a batch of {_SEED_BLOCK_ROWS} rows')
+    seed_seq = np.random.SeedSequence(seed)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'rows': 0,
+        'seed': seed_seq.entropy,
+        'chunk_rows': chunk_rows,
+        'batch_rows': batch_rows,
+        'face_order': list(FACE_ORDER),
+        'fields': {f: {'dtype': EXPORT_FIELDS[f].dtype, 'width': EXPORT_FIELDS[f].width,
+                       'description': EXPORT_FIELDS[f].description} for f in fields},
+        'chunks': [],
+    }
+    _write_manifest(out_dir, manifest)  # drop any earlier export's chunk list first
+    start_time = time.time()
+    n_chunks = -(-rows // chunk_rows)
+    for index, chunk_seed in enumerate(seed_seq.spawn(n_chunks)):
+        n = min(chunk_rows, rows - index * chunk_rows)
+        block_seeds = chunk_seed.spawn(-(-n // _SEED_BLOCK_ROWS))
+        files = {f: f'{f}-{index:05d}.npy' for f in fields}
+        maps = {
+            f: np.lib.format.open_memmap(
+                out_dir / files[f], mode='w+', dtype=EXPORT_FIELDS[f].dtype, shape=(n, EXPORT_FIELDS[f].width)
+            )
+            for f in fields
+        }
+        for lo in range(0, n, batch_rows):
+            hi = min(lo + batch_rows, n)
+            blocks = [
+                random_cube_states(min(b + _SEED_BLOCK_ROWS, hi) - b, np.random.default_rng(block_seeds[b // _SEED_BLOCK_ROWS]))
+                for b in range(lo, hi, _SEED_BLOCK_ROWS)
+            ]
+            states = tuple(np.concatenate(parts) for parts in zip(*blocks))
+            for f, values in compute_rows(*states, fields).items():
+                maps[f][lo:hi] = values
+        for m in maps.values():
+            m.flush()
+        del maps
+        manifest['chunks'].append({'index': index, 'rows': n, 'files': files})
+        manifest['rows'] += n
+        manifest['elapsed_seconds'] = time.time() - start_time
+        _write_manifest(out_dir, manifest)
+    return manifest
+
+
+def _write_manifest(out_dir: Path, manifest: dict) -> None:
+    tmp = out_dir / (MANIFEST_NAME + '.tmp')
+    tmp.write_text(json.dumps(manifest, indent=2) + '\n', encoding='utf-8')
+    tmp.replace(out_dir / MANIFEST_NAME)
+
+
+def read_manifest(out_dir: str | Path) -> dict:
+    manifest = json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding='utf-8'))
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"unsupported manifest version: {manifest.get('version')!r}")
+    return manifest
+
+
+def iter_chunks(out_dir: str | Path, fields: Iterable[str] | None = None) -> Iterator[dict[str, np.ndarray]]:
+    """Yield each exported chunk as ``{field: read-only memory-mapped array}``."""
+    out_dir = Path(out_dir)
+    manifest = read_manifest(out_dir)
+    fields = tuple(manifest['fields']) if fields is None else tuple(fields)
+    for chunk in manifest['chunks']:
+        yield {f: np.load(out_dir / chunk['files'][f], mmap_mode='r') for f in fields}
@@ -253,25 +253,46 @@ function makeDraggable(element, handle) {
     }
 }
 
-// 스크램블 찾기 함수
-function findScramble() {
-    // cstimer에서 스크램블을 찾는 여러 가지 방법
-    const scrambleSelectors = [
-        'div[style*="font-size: 0.95em"]',  // font-size가 0.95em으로 변경됨
-        'div[style*="font-size: 1em"]',     // 기존 1em도 유지 (호환성을 위해)
-        '#scrambleDiv',
-        '.scramble',
-        'div:contains("scramble")'
-    ];
-    
+// 서버 요청 / 캐시 설정
+const API_BASE = 'https://cube-cross-solver.onrender.com';
+const REQUEST_TIMEOUT_MS = 8000;     // 요청 하나의 제한 시간
+const MAX_RETRIES = 3;               // 네트워크 오류, 5xx, 시간 초과 시 재시도 횟수
+const RETRY_BASE_DELAY_MS = 500;     // 재시도 간격: 500ms, 1s, 2s ...
+const CACHE_SIZE = 50;               // 최근 스크램블 결과를 이만큼 보관
+const SCRAMBLE_DEBOUNCE_MS = 150;    // 스크램블 DOM 변경이 멈춘 뒤 이만큼 기다렸다가 확인
+const PREFETCH_BATCH_SIZE = 10;      // /solve_batch 한 번에 미리 요청할 스크램블 수
+
+// cstimer에서 스크램블이 표시되는 요소 후보
+const scrambleSelectors = [
+    'div[style*="font-size: 0.95em"]',  // font-size가 0.95em으로 변경됨
+    'div[style*="font-size: 1em"]',     // 기존 1em도 유지 (호환성을 위해)
+    '#scrambleDiv',
+    '.scramble'
+];
+
+function normalizeScramble(text) {
+    return (text || '').trim().replace(/\s+/g, ' ');
+}
+
+function debounce(fn, delayMs) {
+    let timer = null;
+    return function(...args) {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn.apply(this, args), delayMs);
+    };
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+// 스크램블 요소 찾기 (전체 DOM 검색은 요소를 처음 찾을 때와 다시 붙일 때만 수행)
+function findScrambleElement() {
     for (const selector of scrambleSelectors) {
         const element = document.querySelector(selector);
-        if (element && element.textContent.trim()) {
-            const text = element.textContent.trim();
-            // 루빅스 큐브 스크램블 패턴 확인 (U, R, F, D, L, B와 ', 2가 포함된)
-            if (/[URFDLB]['2]?\s/.test(text)) {
-                return text;
-            }
+        // 루빅스 큐브 스크램블 패턴 확인 (U, R, F, D, L, B와 ', 2가 포함된)
+        if (element && /[URFDLB]['2]?\s/.test(element.textContent.trim())) {
+            return element;
         }
     }
     
@@ -280,47 +301,162 @@ function findScramble() {
     for (const div of allDivs) {
         const text = div.textContent.trim();
         if (text && /^[URFDLB]['2]?\s+[URFDLB]/.test(text) && text.length > 10 && text.length < 200) {
-            return text;
+            return div;
         }
     }
     
     return null;
 }
 
-// 솔루션 요청 함수
-async function getSolution(scramble) {
-    try {
-        const encodedScramble = encodeURIComponent(scramble);
-        const response = await fetch(`https://cube-cross-solver.onrender.com/solve?scramble=${encodedScramble}`);
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+// 스크램블 찾기 함수
+function findScramble() {
+    const element = findScrambleElement();
+    return element ? normalizeScramble(element.textContent) : null;
+}
+
+// 최근 결과 캐시 (Map의 삽입 순서를 LRU 순서로 사용)
+const solutionCache = new Map();
+// 진행 중인 요청: 스크램블 -> Promise (결과, 또는 일괄 요청이 실패했을 때 null)
+const pendingRequests = new Map();
+
+function cacheGet(scramble) {
+    if (!solutionCache.has(scramble)) return undefined;
+    const value = solutionCache.get(scramble);
+    solutionCache.delete(scramble);
+    solutionCache.set(scramble, value);
+    return value;
+}
+
+function cachePut(scramble, value) {
+    solutionCache.delete(scramble);
+    solutionCache.set(scramble, value);
+    while (solutionCache.size > CACHE_SIZE) {
+        solutionCache.delete(solutionCache.keys().next().value);
+    }
+}
+
+function trackPending(scramble, promise) {
+    pendingRequests.set(scramble, promise);
+    promise.finally(() => {
+        if (pendingRequests.get(scramble) === promise) pendingRequests.delete(scramble);
+    });
+    return promise;
+}
+
+// 시간 제한과 지수 백오프 재시도가 있는 JSON 요청 (4xx는 재시도하지 않음)
+async function fetchJson(url, options = {}) {
+    let lastError = null;
+    for (let attempt = 0; attempt <= MAX_RETRIES; attempt++) {
+        if (attempt > 0) {
+            await sleep(RETRY_BASE_DELAY_MS * 2 ** (attempt - 1));
         }
-        
-        const data = await response.json();
-        return data;
-    } catch (error) {
-        console.error('Error getting solution:', error);
-        return { error: error.message };
+        const controller = new AbortController();
+        const timer = setTimeout(() => controller.abort(), REQUEST_TIMEOUT_MS);
+        try {
+            const response = await fetch(url, { ...options, signal: controller.signal });
+            const data = await response.json().catch(() => ({}));
+            if (response.ok) return data;
+            const message = data.error || `HTTP error! status: ${response.status}`;
+            if (response.status < 500) return { error: message };
+            lastError = new Error(message);
+        } catch (error) {
+            lastError = error.name === 'AbortError' ? new Error(`Request timed out after ${REQUEST_TIMEOUT_MS} ms`) : error;
+        } finally {
+            clearTimeout(timer);
+        }
+    }
+    throw lastError;
+}
+
+function requestSolution(scramble) {
+    const request = fetchJson(`${API_BASE}/solve?scramble=${encodeURIComponent(scramble)}`)
+        .then(data => {
+            if (!data.error) cachePut(scramble, data);
+            return data;
+        })
+        .catch(error => {
+            console.error('Error getting solution:', error);
+            return { error: error.message };
+        });
+    return trackPending(scramble, request);
+}
+
+// 솔루션 요청 함수: 캐시 -> 진행 중인 요청(미리 받기 포함) -> 새 요청 순서
+async function getSolution(scramble) {
+    const key = normalizeScramble(scramble);
+    const cached = cacheGet(key);
+    if (cached) return cached;
+    const pending = pendingRequests.get(key);
+    if (pending) {
+        const result = await pending;
+        if (result) return result;
     }
+    return requestSolution(key);
+}
+
+// 다음 스크램블들을 /solve_batch 한 번으로 미리 풀어서 캐시에 넣기
+function prefetchSolutions(scrambles) {
+    const todo = [...new Set(scrambles.map(normalizeScramble))]
+        .filter(s => s && !solutionCache.has(s) && !pendingRequests.has(s))
+        .slice(0, PREFETCH_BATCH_SIZE);
+    if (!todo.length) return;
+    
+    const batch = fetchJson(`${API_BASE}/solve_batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ scrambles: todo })
+    }).then(data => {
+        const byScramble = new Map();
+        (data.results || []).forEach(result => {
+            if (!result.error) cachePut(result.scramble, result);
+            byScramble.set(result.scramble, result);
+        });
+        return byScramble;
+    }).catch(error => {
+        console.warn('Prefetch failed:', error);
+        return new Map();
+    });
+    // 일괄 요청이 끝나기 전에 그 스크램블이 나타나면 같은 요청을 기다림 (실패하면 null -> 개별 요청)
+    todo.forEach(s => trackPending(s, batch.then(results => results.get(s) || null)));
+    console.log(`⏩ Prefetching ${todo.length} scramble(s)`);
 }
 
+// 페이지에 미리 보이는 다음 스크램블들 (예: 스크램블 생성기 결과, 대회 스크램블 목록)
+function findUpcomingScrambles(current) {
+    const found = [];
+    document.querySelectorAll('textarea').forEach(area => {
+        area.value.split('\n').forEach(line => {
+            const text = normalizeScramble(line.replace(/^\s*\d+[.)]\s*/, ''));
+            if (/^[URFDLB]['2]?\s+[URFDLB]/.test(text) && text !== current) found.push(text);
+        });
+    });
+    return found;
+}
+
+// 다른 스크립트가 다음 스크램블을 알려줄 수도 있음: window.postMessage({type: 'cross-solver-prefetch', scrambles: [...]})
+window.addEventListener('message', event => {
+    if (event.source !== window || !event.data || event.data.type !== 'cross-solver-prefetch') return;
+    if (Array.isArray(event.data.scrambles)) prefetchSolutions(event.data.scrambles.filter(s => typeof s === 'string'));
+});
+
 // 자동 솔루션 업데이트 관련 변수들
 let currentScramble = '';
 let autoSolveEnabled = false;
-let isProcessing = false;
+let scrambleElement = null;
+let scrambleObserver = null;
+let attachRetryTimer = null;
 
 // 자동으로 솔루션을 업데이트하는 함수
 async function autoUpdateSolution() {
-    if (isProcessing) return;
-    
-    const newScramble = findScramble();
-    if (!newScramble || newScramble === currentScramble) {
+    if (!scrambleElement || !scrambleElement.isConnected) {
+        attachScrambleObserver();
+    }
+    const newScramble = scrambleElement ? normalizeScramble(scrambleElement.textContent) : '';
+    if (!newScramble || newScramble === currentScramble || !/[URFDLB]['2]?\s/.test(newScramble)) {
         return; // 스크램블이 없거나 이전과 같으면 패스
     }
     
     currentScramble = newScramble;
-    isProcessing = true;
     
     console.log('🔄 Auto-solving new scramble:', newScramble);
     
@@ -329,9 +465,9 @@ async function autoUpdateSolution() {
         solutionDiv = createSolutionDiv();
     }
     
-    // 로딩 표시
+    // 로딩 표시 (캐시에 있으면 바로 표시하므로 생략)
     const contentDiv = document.getElementById('solution-content');
-    if (contentDiv) {
+    if (contentDiv && !solutionCache.has(newScramble)) {
         contentDiv.innerHTML = `
             <div style="text-align: center; padding: 20px;">
                 <div style="font-size: 16px; margin-bottom: 10px;">🔄 Auto-solving...</div>
@@ -343,21 +479,40 @@ async function autoUpdateSolution() {
     // 창 표시
     solutionDiv.style.display = 'block';
     
-    try {
-        const solution = await getSolution(newScramble);
+    const solution = await getSolution(newScramble);
+    // 기다리는 동안 스크램블이 바뀌었으면 오래된 결과는 버림
+    if (newScramble === currentScramble) {
         displaySolution(solution, solutionDiv);
-    } catch (error) {
-        if (contentDiv) {
-            contentDiv.innerHTML = `
-                <div style="color: red; text-align: center; padding: 20px;">
-                    ❌ Auto-solve failed<br>
-                    <small>${error.message}</small>
-                </div>
-            `;
-        }
-    } finally {
-        isProcessing = false;
     }
+    
+    // 남는 시간에 다음 스크램블 미리 받기
+    const idle = window.requestIdleCallback || (fn => setTimeout(fn, 200));
+    idle(() => prefetchSolutions(findUpcomingScrambles(newScramble)));
+}
+
+const checkScrambleSoon = debounce(() => {
+    if (autoSolveEnabled) autoUpdateSolution();
+}, SCRAMBLE_DEBOUNCE_MS);
+
+// 스크램블 요소만 감시 (요소가 아직 없으면 잠시 뒤 다시 시도)
+function attachScrambleObserver() {
+    clearTimeout(attachRetryTimer);
+    if (scrambleObserver) {
+        scrambleObserver.disconnect();
+        scrambleObserver = null;
+    }
+    scrambleElement = findScrambleElement();
+    if (!scrambleElement) {
+        attachRetryTimer = setTimeout(attachScrambleObserver, 2000);
+        return;
+    }
+    scrambleObserver = new MutationObserver(checkScrambleSoon);
+    scrambleObserver.observe(scrambleElement, {
+        childList: true,
+        subtree: true,
+        characterData: true
+    });
+    console.log('🎯 Scramble auto-detection enabled');
 }
 
 // 솔루션 표시 함수
@@ -547,7 +702,7 @@ if (document.readyState === 'loading') {
     setupKeyboardShortcuts();
 }
 
-// 페이지 변경 감지 (SPA를 위해)
+// 페이지 변경 감지 (SPA를 위해) - URL과 스크램블 요소 연결 상태만 확인하는 가벼운 콜백
 let lastUrl = location.href;
 new MutationObserver(() => {
     const url = location.href;
@@ -555,32 +710,15 @@ new MutationObserver(() => {
         lastUrl = url;
         setTimeout(addSolveButton, 1000); // 페이지 변경 후 잠시 기다림
     }
-}).observe(document, { subtree: true, childList: true });
-
-// 스크램블 변경 감지를 위한 MutationObserver
-const scrambleObserver = new MutationObserver((mutations) => {
-    if (!autoSolveEnabled) return;
-    
-    let shouldCheck = false;
-    mutations.forEach((mutation) => {
-        if (mutation.type === 'childList' || mutation.type === 'characterData') {
-            // 텍스트 변경이나 DOM 변경 감지
-            shouldCheck = true;
-        }
-    });
-    
-    if (shouldCheck) {
-        // 약간의 지연을 두고 체크 (너무 빈번한 호출 방지)
-        setTimeout(autoUpdateSolution, 500);
+    if (scrambleElement && !scrambleElement.isConnected) {
+        // 스크램블 요소가 교체됨: 새 요소에 다시 연결
+        scrambleElement = null;
+        setTimeout(() => {
+            attachScrambleObserver();
+            checkScrambleSoon();
+        }, 0);
     }
-});
+}).observe(document, { subtree: true, childList: true });
 
-// 전체 document를 감시 (스크램블이 어디에 나타날지 모르므로)
-setTimeout(() => {
-    scrambleObserver.observe(document.body, { 
-        childList: true, 
-        subtree: true, 
-        characterData: true 
-    });
-    console.log('🎯 Scramble auto-detection enabled');
-}, 2000);
\ No newline at end of file
+// 스크램블 요소를 찾아 그 요소만 감시
+setTimeout(attachScrambleObserver, 2000);
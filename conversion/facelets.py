@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import numpy as np
+
+from core.cube_state import CubeState
+from core.cubie import permutation_parity, twist_total
+from core.constants import (
+    COLOR_LETTER_TO_CODE,
+    COLOR_WHITE,
+    COLOR_YELLOW,
+    CORNER_COLOR_SETS,
+    CORNER_STICKER_POSITIONS,
+    DEFAULT_FACE_COLOR,
+    EDGE_COLOR_SETS,
+    EDGE_STICKER_POSITIONS,
+    FACE_B,
+    FACE_D,
+    FACE_F,
+    FACE_L,
+    FACE_R,
+    FACE_U,
+)
+
+
+# Kociemba order: U R F D L B, each face row by row as seen from outside
+# with U / D read with F at the bottom / top; this matches CubeState's
+# (face, row, col) layout, so only the face order differs.
+FACELET_FACE_ORDER = (FACE_U, FACE_R, FACE_F, FACE_D, FACE_L, FACE_B)
+_FACE_LETTERS = 'UDFBLR'  # indexed by face id
+
+_FLAT = lambda f, r, c: f * 9 + r * 3 + c  # noqa: E731
+_CORNER_IDX = np.array([[_FLAT(*s) for s in CORNER_STICKER_POSITIONS[p]] for p in range(8)])
+_EDGE_IDX = np.array([[_FLAT(*s) for s in EDGE_STICKER_POSITIONS[p]] for p in range(12)])
+_SOLVED = CubeState.solved().stickers.reshape(-1).astype(np.int64)
+_SOLVED_CORNER = _SOLVED[_CORNER_IDX]  # (8, 3): each piece's colors at home, U/D color first
+_SOLVED_EDGE = _SOLVED[_EDGE_IDX]
+
+
+def _piece_lookup(color_sets: dict[int, set[int]]) -> np.ndarray:
+    """Color bitmask -> piece id, -1 for no piece."""
+    lookup = np.full(1 << 7, -1, dtype=np.int64)
+    for piece, colors in color_sets.items():
+        lookup[sum(1 << c for c in colors)] = piece
+    return lookup
+
+
+_CORNER_BY_MASK = _piece_lookup(CORNER_COLOR_SETS)
+_EDGE_BY_MASK = _piece_lookup(EDGE_COLOR_SETS)
+_D_LAYER = np.arange(8) >= 4  # corner positions DFR..DLF
+_DEFAULT_CENTERS = np.array([DEFAULT_FACE_COLOR[f] for f in range(6)])
+
+
+def parse_facelets(text: str) -> CubeState:
+    """54-character facelet string -> `CubeState`.
+
+    Faces come in U R F D L B order. Stickers are either face letters
+    (``UUUUUUUUURRR...``, naming the face whose center they match) or color
+    letters ``w y g b o r`` in any case, which may describe the cube in any
+    holding orientation.
+    """
+    text = ''.join(text.split())
+    if len(text) != 54:
+        raise ValueError(f'expected 54 facelets, got {len(text)}')
+    if set(text) <= set(_FACE_LETTERS):
+        codes = [int(DEFAULT_FACE_COLOR[_FACE_LETTERS.index(ch)]) for ch in text]
+    elif set(text.lower()) <= set(COLOR_LETTER_TO_CODE):
+        codes = [COLOR_LETTER_TO_CODE[ch] for ch in text.lower()]
+    else:
+        bad = set(text) - set(_FACE_LETTERS) - set(COLOR_LETTER_TO_CODE) - set(''.join(COLOR_LETTER_TO_CODE).upper())
+        if not bad:
+            raise ValueError('facelets mix face letters and color letters')
+        raise ValueError(f"unknown facelet letters: {''.join(sorted(bad))}")
+    stickers = np.empty((6, 3, 3), dtype=np.int8)
+    for i, face in enumerate(FACELET_FACE_ORDER):
+        stickers[face] = np.array(codes[i * 9:(i + 1) * 9], dtype=np.int8).reshape(3, 3)
+    cube = CubeState(stickers)
+    cube.validate()
+    counts = np.bincount(stickers.reshape(-1), minlength=7)[1:]
+    if not np.all(counts == 9):
+        raise ValueError(f'each color must appear 9 times, got {counts.tolist()}')
+    return cube
+
+
+def to_facelets(cube: CubeState) -> str:
+    """Inverse of `parse_facelets`, in color letters."""
+    letters = {code: letter for letter, code in COLOR_LETTER_TO_CODE.items()}
+    return ''.join(letters[int(c)] for face in FACELET_FACE_ORDER for c in cube.stickers[face].reshape(-1))
+
+
+def validated_ai_arrays(cube: CubeState) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """`cube_to_ai_arrays` for untrusted input: the same arrays, or ValueError saying why.
+
+    The cube must have default centers (see `ai.orientation.normalize_orientation`).
+    Pieces are identified by a color bitmask lookup and every check is one
+    NumPy expression: piece identification and mirrored corners, duplicate
+    pieces, corner twist, edge flip and permutation parity.
+    """
+    cube.validate()
+    flat = cube.stickers.reshape(-1).astype(np.int64)
+    if not np.array_equal(flat[4::9], _DEFAULT_CENTERS):
+        raise ValueError('centers must be in the default layout')
+
+    corners = flat[_CORNER_IDX]
+    edges = flat[_EDGE_IDX]
+    cp = _CORNER_BY_MASK[(1 << corners).sum(axis=1)]
+    ep = _EDGE_BY_MASK[(1 << edges).sum(axis=1)]
+    if np.any(cp < 0):
+        raise ValueError(f'unknown corner colors at {np.flatnonzero(cp < 0).tolist()}')
+    if np.any(ep < 0):
+        raise ValueError(f'unknown edge colors at {np.flatnonzero(ep < 0).tolist()}')
+    if np.any(np.bincount(cp, minlength=8) != 1) or np.any(np.bincount(ep, minlength=12) != 1):
+        raise ValueError('pieces are missing or duplicated')
+
+    co = np.argmax((corners == COLOR_WHITE) | (corners == COLOR_YELLOW), axis=1)
+    # Read from the U/D sticker on, a corner shows its home colors in the same
+    # cyclic order when it stays in its layer and in reverse when it changes
+    # layer; anything else is a corner with two stickers swapped.
+    rolled = np.take_along_axis(corners, (co[:, None] + np.arange(3)) % 3, axis=1)
+    expected = _SOLVED_CORNER[cp]
+    expected = np.where((_D_LAYER != _D_LAYER[cp])[:, None], expected[:, [0, 2, 1]], expected)
+    if not np.array_equal(rolled, expected):
+        raise ValueError(f'mirrored corner at {np.flatnonzero(np.any(rolled != expected, axis=1)).tolist()}')
+    eo = (edges[:, 0] != _SOLVED_EDGE[ep, 0]).astype(np.int64)
+
+    if twist_total(co):
+        raise ValueError('corner twist does not sum to zero')
+    if int(eo.sum()) % 2:
+        raise ValueError('odd number of flipped edges')
+    if permutation_parity(cp) != permutation_parity(ep):
+        raise ValueError('corner and edge permutation parities differ')
+    return cp.astype(np.int8), co.astype(np.int8), ep.astype(np.int8), eo.astype(np.int8)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from math import factorial
+
+import numpy as np
+
+from core.cube_state import CubeState
+
+
+# Cubie form: two integers per state.
+#   corner key = rank(cp) * 3**8 + co as base-3 digits   (< 2**28)
+#   edge key   = rank(ep) * 2**12 + eo as bits           (< 2**41)
+# All eight twists and twelve flips are stored, so any permutation and
+# orientation arrays round-trip, solvable or not.
+CORNER_KEYS = factorial(8) * 3**8
+EDGE_KEYS = factorial(12) * 2**12
+_EDGE_BITS = int(EDGE_KEYS - 1).bit_length()  # 41
+
+# Sticker form: 54 stickers x 3 bits (color code - 1), big-endian, in 21 bytes.
+STICKER_BYTES = 21
+
+_CO_SCALE = 3 ** np.arange(7, -1, -1, dtype=np.int64)
+_EO_SCALE = 2 ** np.arange(11, -1, -1, dtype=np.int64)
+_BIT_SHIFTS = np.array([2, 1, 0], dtype=np.uint8)
+
+
+def _weights(n: int) -> np.ndarray:
+    return np.array([factorial(n - 1 - i) for i in range(n)], dtype=np.int64)
+
+
+_WEIGHTS = {8: _weights(8), 12: _weights(12)}
+
+
+def _perm_rank(perms: np.ndarray) -> np.ndarray:
+    """Lexicographic rank of each row of an (N, n) permutation array."""
+    n = perms.shape[1]
+    smaller_after = (perms[:, None, :] < perms[:, :, None]) & np.tri(n, k=-1, dtype=bool).T
+    return smaller_after.sum(axis=2) @ _WEIGHTS[n]
+
+
+def _perm_unrank(ranks: np.ndarray, n: int) -> np.ndarray:
+    out = np.empty((ranks.size, n), dtype=np.int64)
+    free = np.ones((ranks.size, n), dtype=bool)
+    rows = np.arange(ranks.size)
+    for i, weight in enumerate(_WEIGHTS[n]):
+        digit = ranks // weight % (n - i)
+        hit = free & (np.cumsum(free, axis=1) == (digit + 1)[:, None])
+        out[:, i] = np.argmax(hit, axis=1)
+        free[rows, out[:, i]] = False
+    return out
+
+
+def _check_perms(perms: np.ndarray, name: str) -> None:
+    if np.any(np.sort(perms, axis=1) != np.arange(perms.shape[1])):
+        raise ValueError(f'{name} rows must be permutations of 0..{perms.shape[1] - 1}')
+
+
+def pack_cubies(cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray) -> np.ndarray:
+    """`cube_to_ai_arrays` output -> (corner key, edge key) as uint64.
+
+    Takes one state (shapes (8,), (8,), (12,), (12,)) or a batch with a
+    leading N axis, and returns shape (2,) or (N, 2) to match.
+    """
+    single = np.ndim(cp) == 1
+    cp, co, ep, eo = (np.atleast_2d(np.asarray(a)).astype(np.int64) for a in (cp, co, ep, eo))
+    if cp.shape[1:] != (8,) or co.shape[1:] != (8,) or ep.shape[1:] != (12,) or eo.shape[1:] != (12,):
+        raise ValueError('expected corner arrays of length 8 and edge arrays of length 12')
+    _check_perms(cp, 'cp')
+    _check_perms(ep, 'ep')
+    if np.any((co < 0) | (co > 2)) or np.any((eo < 0) | (eo > 1)):
+        raise ValueError('orientations must be 0..2 for corners and 0..1 for edges')
+    packed = np.empty((len(cp), 2), dtype=np.uint64)
+    packed[:, 0] = _perm_rank(cp) * 3**8 + co @ _CO_SCALE
+    packed[:, 1] = _perm_rank(ep) * 2**12 + eo @ _EO_SCALE
+    return packed[0] if single else packed
+
+
+def unpack_cubies(packed: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Inverse of `pack_cubies`: int8 (cp, co, ep, eo), batched like the input."""
+    packed = np.asarray(packed, dtype=np.uint64)
+    single = packed.ndim == 1
+    packed = np.atleast_2d(packed).astype(np.int64)
+    if packed.shape[1:] != (2,) or np.any(packed[:, 0] >= CORNER_KEYS) or np.any(packed[:, 1] >= EDGE_KEYS):
+        raise ValueError('not a packed cubie state')
+    corner_rank, co = np.divmod(packed[:, 0], 3**8)
+    edge_rank, eo = np.divmod(packed[:, 1], 2**12)
+    arrays = (
+        _perm_unrank(corner_rank, 8),
+        co[:, None] // _CO_SCALE % 3,
+        _perm_unrank(edge_rank, 12),
+        eo[:, None] // _EO_SCALE % 2,
+    )
+    arrays = tuple(a.astype(np.int8) for a in arrays)
+    return tuple(a[0] for a in arrays) if single else arrays
+
+
+def cubie_key(cp: np.ndarray, co: np.ndarray, ep: np.ndarray, eo: np.ndarray) -> int:
+    """One Python int for a cubie state (both keys side by side), for sets and dict keys."""
+    corner, edge = (int(k) for k in pack_cubies(cp, co, ep, eo))
+    return corner << _EDGE_BITS | edge
+
+
+def pack_stickers(stickers: np.ndarray) -> np.ndarray:
+    """(6, 3, 3) or (N, 6, 3, 3) color codes -> (21,) or (N, 21) uint8, 3 bits per sticker."""
+    stickers = np.asarray(stickers)
+    single = stickers.ndim == 3
+    codes = stickers.reshape(-1, 54)
+    if codes.size and (codes.min() < 1 or codes.max() > 6):
+        raise ValueError('sticker values must be in [1..6]')
+    bits = ((codes - 1).astype(np.uint8)[:, :, None] >> _BIT_SHIFTS) & 1
+    packed = np.packbits(bits.reshape(len(codes), -1), axis=1)
+    return packed[0] if single else packed
+
+
+def unpack_stickers(packed: np.ndarray) -> np.ndarray:
+    """Inverse of `pack_stickers`: int8 color codes, (6, 3, 3) or (N, 6, 3, 3)."""
+    packed = np.asarray(packed, dtype=np.uint8)
+    single = packed.ndim == 1
+    packed = np.atleast_2d(packed)
+    if packed.shape[1:] != (STICKER_BYTES,):
+        raise ValueError(f'expected {STICKER_BYTES} bytes per state')
+    bits = np.unpackbits(packed, axis=1)[:, :162].reshape(-1, 54, 3)
+    codes = (bits @ (1 << _BIT_SHIFTS).astype(np.int8) + 1).astype(np.int8)
+    if codes.max(initial=1) > 6:
+        raise ValueError('not a packed sticker state')
+    codes = codes.reshape(-1, 6, 3, 3)
+    return codes[0] if single else codes
+
+
+def state_key(cube: CubeState) -> int:
+    """The packed stickers as one Python int: equal iff the cubes are equal, and stable
+    across processes (unlike ``hash`` of bytes), so it can key caches and files."""
+    return int.from_bytes(pack_stickers(cube.stickers).tobytes(), 'big')
+
+
+def cube_from_key(key: int) -> CubeState:
+    """Inverse of `state_key`."""
+    return CubeState(unpack_stickers(np.frombuffer(key.to_bytes(STICKER_BYTES, 'big'), dtype=np.uint8)))
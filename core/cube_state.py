@@ -24,6 +24,12 @@ class CubeState:
     def as_numpy(self) -> np.ndarray:
         return self.stickers
 
+    def key(self) -> int:
+        """Compact, process-stable int for this state (see `conversion.packing.state_key`)."""
+        from conversion.packing import state_key  # conversion imports core, so import lazily
+
+        return state_key(self)
+
     def validate(self) -> None:
         if not isinstance(self.stickers, np.ndarray):
             raise TypeError('stickers must be a numpy array')
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+# `cube_to_ai_arrays` reads corner stickers U/D-first in a fixed sticker order,
+# which runs counter-clockwise on U-layer corners and clockwise on D-layer ones.
+# Twists only compose additively (and sum to 0 mod 3) after negating one layer.
+CORNER_TWIST_SIGN = np.array([1, 1, 1, 1, -1, -1, -1, -1], dtype=np.int8)
+
+_UPPER = {n: np.triu(np.ones((n, n), dtype=bool), 1) for n in (8, 12)}
+
+
+def permutation_parity(perms: np.ndarray) -> np.ndarray:
+    """Parity (0 even, 1 odd) of one permutation of shape (n,) or of each row of (N, n)."""
+    perms = np.asarray(perms)
+    n = perms.shape[-1]
+    inversions = (perms[..., :, None] > perms[..., None, :]) & _UPPER[n]
+    return np.count_nonzero(inversions, axis=(-2, -1)) & 1
+
+
+def twist_total(corner_orientation: np.ndarray) -> np.ndarray:
+    """Signed corner twist sum mod 3 per state; 0 for every reachable cube."""
+    co = np.asarray(corner_orientation, dtype=np.int64)
+    return (co * CORNER_TWIST_SIGN).sum(axis=-1) % 3
@@ -190,8 +190,9 @@ class CubeMoveEngine:
         temp = self.s[FACE_U].copy()
         self.s[FACE_U] = self.s[FACE_F]
         self.s[FACE_F] = self.s[FACE_D]
-        self.s[FACE_D] = self.s[FACE_B]
-        self.s[FACE_B] = temp
+        # B is stored as seen from behind, so it turns upside down on the way.
+        self.s[FACE_D] = np.rot90(self.s[FACE_B], 2)
+        self.s[FACE_B] = np.rot90(temp, 2)
 
     def x_prime(self) -> None:
         for _ in range(3):
@@ -222,10 +223,10 @@ class CubeMoveEngine:
         self._rot_cw(FACE_F)
         self.s[FACE_B] = np.rot90(self.s[FACE_B], 1)
         temp = self.s[FACE_U].copy()
-        self.s[FACE_U] = self.s[FACE_L][:, ::-1].T
-        self.s[FACE_L] = self.s[FACE_D][:, ::-1].T
-        self.s[FACE_D] = self.s[FACE_R][:, ::-1].T
-        self.s[FACE_R] = temp.T
+        self.s[FACE_U] = np.rot90(self.s[FACE_L], -1)
+        self.s[FACE_L] = np.rot90(self.s[FACE_D], -1)
+        self.s[FACE_D] = np.rot90(self.s[FACE_R], -1)
+        self.s[FACE_R] = np.rot90(temp, -1)
 
     def z_prime(self) -> None:
         for _ in range(3):
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Allow running this file directly from inside the package directory by ensuring
+# the package's parent directory is on sys.path.
+if __package__ in (None, ''):
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+from analysis.corpus import CorpusStats, ResultWriter, iter_scrambles, solve_stream
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Stream scrambles (one per line, e.g. a csTimer export) and report cross statistics.',
+    )
+    parser.add_argument('input', nargs='?', default='-', help="scramble file, or '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="per-scramble results file, or '-' for stdout")
+    parser.add_argument('-f', '--format', choices=ResultWriter.FORMATS, help='result format (default: from extension, else csv)')
+    parser.add_argument('-s', '--summary', help='write aggregate statistics as JSON here (default: stderr)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='scrambles per worker task')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = 'jsonl' if args.output.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    stats = CorpusStats()
+    start_time = time.time()
+    try:
+        writer = ResultWriter(dst, fmt)
+        for result in solve_stream(iter_scrambles(src), workers=args.workers, chunk_size=args.chunk_size):
+            writer.write(result)
+            stats.update(result)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    summary = stats.to_dict()
+    summary['elapsed_seconds'] = time.time() - start_time
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        Path(args.summary).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+# Allow running this file directly from inside the package directory by ensuring
+# the package's parent directory is on sys.path.
+if __package__ in (None, ''):
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+from core.constants import MOVE_TOKENS
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Stand-in for a Bluetooth smart cube: opens a live session and sends one turn at a time.',
+    )
+    parser.add_argument('--server', default='http://localhost:5000', help='web server base URL')
+    parser.add_argument('--scramble', default='', help='starting scramble (default: solved)')
+    parser.add_argument('--moves', help='turns to send, space separated (default: random)')
+    parser.add_argument('-n', '--count', type=int, default=20, help='number of random turns')
+    parser.add_argument('--interval', type=float, default=0.3, help='seconds between turns')
+    return parser.parse_args(argv)
+
+
+def _post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode('utf-8'), headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def _print_events(url: str) -> None:
+    """Read the server-sent event stream and print the best cross after every update."""
+    with urllib.request.urlopen(url) as response:
+        for raw in response:
+            line = raw.decode('utf-8').rstrip('\n')
+            if not line.startswith('data: '):
+                continue
+            state = json.loads(line[len('data: '):])
+            if not state.get('best_solutions'):
+                continue
+            best = state['best_solutions'][0]
+            print(f"[{state['move_count']:3d}] {state['last_move'] or '-':3s} "
+                  f"best {best['face']}: {best['solution_string'] or '(solved)'}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    created = _post(f'{args.server}/session', {'scramble': args.scramble})
+    session_id = created['session_id']
+    print(f'session {session_id}')
+    threading.Thread(target=_print_events, args=(f"{args.server}{created['events']}",), daemon=True).start()
+
+    moves = args.moves.split() if args.moves else [random.choice(MOVE_TOKENS) for _ in range(args.count)]
+    for mv in moves:
+        time.sleep(args.interval)
+        _post(f'{args.server}/session/{session_id}/moves', {'moves': mv})
+    time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Allow running this file directly from inside the package directory by ensuring
+# the package's parent directory is on sys.path.
+if __package__ in (None, ''):
+    project_root = Path(__file__).resolve().parents[1]
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+from analysis.export import DEFAULT_FIELDS, EXPORT_FIELDS, export_dataset
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Export random cube states with per-face cross lengths as chunked .npy files.',
+    )
+    parser.add_argument('output', help='output directory (a manifest.json is written there)')
+    parser.add_argument('-n', '--rows', type=int, default=1_000_000, help='number of states')
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help='rows per .npy chunk')
+    parser.add_argument(
+        '--fields', default=','.join(DEFAULT_FIELDS), help=f"comma separated, from: {', '.join(EXPORT_FIELDS)}"
+    )
+    parser.add_argument('--seed', type=int, default=None, help='random seed (default: fresh, recorded in manifest)')
+    parser.add_argument('--memory-mb', type=int, default=256, help='working memory budget in MiB')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    manifest = export_dataset(
+        args.output,
+        args.rows,
+        chunk_rows=args.chunk_rows,
+        fields=[f.strip() for f in args.fields.split(',') if f.strip()],
+        seed=args.seed,
+        memory_budget=args.memory_mb * 2**20,
+    )
+    summary = {k: manifest[k] for k in ('rows', 'seed', 'batch_rows', 'elapsed_seconds')}
+    summary['chunks'] = len(manifest['chunks'])
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import time
+import unittest
+
+from ai.anytime import AnytimeSearch, SearchRegistry, full_solve_search, weighted_search
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import normalize_orientation
+from ai.weighted_search import MoveCosts, find_weighted_cross_solutions
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+_SCRAMBLE = "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R".split()
+
+
+def _scrambled(moves):
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _solves(cube, moves):
+    cube = cube.copy()
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return CubeAIState.from_cube_state(normalize_orientation(cube)[0]).is_solved()
+
+
+class TestAnytimeSearch(unittest.TestCase):
+    def test_only_better_solutions_are_kept(self):
+        def body(search):
+            search.report(['R', 'U'], 2)
+            search.report(['R', 'U', 'F'], 3)
+            search.raise_lower_bound(1)
+            search.report(['F', 'F'], 2, proven_optimal=True)
+
+        result = AnytimeSearch('test', body).start().wait(5)
+        self.assertEqual((result.moves, result.cost, result.proven_optimal), (('F', 'F'), 2, True))
+        self.assertEqual(result.lower_bound, 2)
+
+    def test_budget_returns_best_so_far(self):
+        def body(search):
+            search.report(['R'], 1)
+            while not search.should_stop():
+                time.sleep(0.005)
+
+        search = AnytimeSearch('test', body, max_seconds=0.5).start()
+        start = time.monotonic()
+        result = search.wait(0.05)
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(result.moves, ('R',))
+        self.assertFalse(result.finished or result.proven_optimal)
+        self.assertTrue(search.wait(5).finished)  # max_seconds ends the background run
+
+    def test_errors_are_reported(self):
+        def body(search):
+            raise ValueError('unsolvable')
+
+        result = AnytimeSearch('test', body).start().wait(5)
+        self.assertTrue(result.finished)
+        self.assertEqual(result.error, 'unsolvable')
+
+    def test_weighted_matches_direct_search(self):
+        cube = _scrambled(_SCRAMBLE)
+        costs = MoveCosts(moves={'B': 3.0, 'D': 1.5})
+        result = weighted_search(cube, costs).start().wait(30)
+        self.assertTrue(result.proven_optimal)
+        self.assertEqual(result.cost, find_weighted_cross_solutions(cube, costs)[0].cost)
+
+    def test_full_solve_improves_and_proves_short_scrambles(self):
+        cube = _scrambled(['R', 'U', 'F', 'D2', 'L'])
+        result = full_solve_search(cube).start().wait(30)
+        self.assertTrue(result.proven_optimal)
+        self.assertEqual(result.cost, 5)
+        self.assertTrue(_solves(cube, result.moves))
+
+    def test_registry_cancels_evicted_searches(self):
+        registry = SearchRegistry(capacity=1)
+        first = AnytimeSearch('test', lambda s: None)
+        first_id = registry.add(first)
+        registry.add(AnytimeSearch('test', lambda s: None))
+        self.assertIsNone(registry.get(first_id))
+        self.assertTrue(first.should_stop())
+
+
+if __name__ == '__main__':
+    unittest.main()
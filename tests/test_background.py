@@ -0,0 +1,58 @@
+import threading
+import unittest
+
+from visualization.background import LatestJobRunner, poll_future
+
+
+class TestLatestJobRunner(unittest.TestCase):
+    def test_newer_job_supersedes_older(self):
+        runner = LatestJobRunner()
+        started, release = threading.Event(), threading.Event()
+        saw_stale = []
+
+        def slow(stale):
+            started.set()
+            release.wait(5)
+            saw_stale.append(stale())
+            return 'slow'
+
+        first = runner.submit(slow)
+        started.wait(5)
+        queued = runner.submit(lambda stale: 'queued')
+        last = runner.submit(lambda stale: 'last')
+        release.set()
+        self.assertEqual(last.future.result(5), 'last')
+        self.assertTrue(queued.future.cancelled())
+        self.assertEqual(first.future.result(5), 'slow')
+        self.assertEqual(saw_stale, [True])
+        self.assertFalse(runner.is_current(first))
+        self.assertTrue(runner.is_current(last))
+
+    def test_errors_reach_the_future(self):
+        runner = LatestJobRunner()
+
+        def fail(stale):
+            raise ValueError('bad cube')
+
+        job = runner.submit(fail)
+        self.assertIsInstance(job.future.exception(5), ValueError)
+
+    def test_poll_future_reschedules_until_done(self):
+        runner = LatestJobRunner()
+        release = threading.Event()
+        future = runner.run_in_background(lambda: release.wait(5) and 42)
+        pending = []
+        done = []
+        waits = []
+        poll_future(lambda ms, fn: pending.append(fn), future, done.append, on_wait=lambda: waits.append(1))
+        self.assertEqual(len(pending), 1)
+        release.set()
+        future.result(5)
+        pending.pop()()
+        self.assertEqual([f.result() for f in done], [42])
+        self.assertEqual(waits, [1])
+        self.assertEqual(pending, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from ai.batch_move_engine import BatchMoveEngine
+from conversion.cube_to_ai import cube_to_ai_arrays
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+from utils.scramble import generate_scramble_batch, scramble_tokens
+
+
+class TestBatchMoveEngine(unittest.TestCase):
+    def test_matches_sticker_engine(self):
+        moves = generate_scramble_batch(64, 25, rng=3)
+        batch = BatchMoveEngine.solved(len(moves))
+        batch.apply_sequences(moves)
+
+        for i, tokens in enumerate(scramble_tokens(moves)):
+            cube = CubeState.solved()
+            CubeMoveEngine(cube).apply_sequence(tokens)
+            cp, co, ep, eo = cube_to_ai_arrays(cube)
+            self.assertTrue(np.array_equal(batch.corner_permutation[i], cp))
+            self.assertTrue(np.array_equal(batch.corner_orientation[i], co))
+            self.assertTrue(np.array_equal(batch.edge_permutation[i], ep))
+            self.assertTrue(np.array_equal(batch.edge_orientation[i], eo))
+
+    def test_from_cube_states_round_trip(self):
+        cube = CubeState.solved()
+        CubeMoveEngine(cube).apply_sequence(["R", "U'", 'F2'])
+        batch = BatchMoveEngine.from_cube_states([CubeState.solved(), cube])
+        batch.apply(np.array([0, 0]))  # R on both
+        CubeMoveEngine(cube).apply('R')
+        self.assertTrue(np.array_equal(batch.edge_permutation[1], cube_to_ai_arrays(cube)[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
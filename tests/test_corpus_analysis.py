@@ -0,0 +1,77 @@
+import io
+import json
+import unittest
+
+from analysis.corpus import (
+    FACE_ORDER,
+    CorpusStats,
+    ResultWriter,
+    iter_scrambles,
+    parse_scramble_line,
+    solve_scramble,
+    solve_stream,
+)
+from ai.bfs_solver import BFSSolver
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+_CORPUS = """\
+# exported session
+1. 12.34   R U R' U'
+2. DNF(9.87)   F2 D' L B2
+3) R2 U F
+
+not a scramble
+"""
+
+
+class TestCorpusAnalysis(unittest.TestCase):
+    def test_parse_skips_numbering_and_times(self):
+        self.assertEqual(parse_scramble_line("12. 9.87   R U2 F'"), ['R', 'U2', "F'"])
+        self.assertEqual(parse_scramble_line('# comment'), [])
+        self.assertEqual(list(iter_scrambles(io.StringIO(_CORPUS))), ["R U R' U'", "F2 D' L B2", 'R2 U F'])
+
+    def test_solve_scramble_matches_solver(self):
+        result = solve_scramble(0, "R U R' U' F2 D")
+        cube = CubeState.solved()
+        CubeMoveEngine(cube).apply_sequence("R U R' U' F2 D".split())
+        for face, length in zip(FACE_ORDER, result.lengths):
+            self.assertEqual(length, len(BFSSolver(face).solve_cross(cube)))
+        self.assertEqual(result.best_length, min(result.lengths))
+        self.assertEqual(len(result.solution), result.best_length)
+
+    def test_rotated_scrambles_agree_with_solution(self):
+        for scramble in ('x R U F', 'z2 R U', 'M U2 E'):
+            result = solve_scramble(0, scramble)
+            self.assertEqual(result.best_length, len(result.solution), scramble)
+            cube = CubeState.solved()
+            CubeMoveEngine(cube).apply_sequence(scramble.split())
+            for face, length in zip(FACE_ORDER, result.lengths):
+                self.assertEqual(length, len(BFSSolver(face).solve_cross(cube)), scramble)
+
+    def test_invalid_scramble_is_reported_not_raised(self):
+        result = solve_scramble(3, 'R Q')
+        self.assertFalse(result.ok)
+
+    def test_pool_preserves_order_and_stats(self):
+        scrambles = list(iter_scrambles(io.StringIO(_CORPUS))) * 5
+        serial = list(solve_stream(scrambles, workers=1, chunk_size=2))
+        pooled = list(solve_stream(scrambles, workers=2, chunk_size=2, max_pending=2))
+        self.assertEqual(serial, pooled)
+
+        stats = CorpusStats()
+        out = io.StringIO()
+        writer = ResultWriter(out, 'jsonl')
+        for result in pooled:
+            stats.update(result)
+            writer.write(result)
+        summary = stats.to_dict()
+        self.assertEqual(summary['total'], 15)
+        self.assertEqual(sum(summary['colors']['white']['distribution'].values()), 15)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r['index'] for r in rows], list(range(15)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from analysis.distributions import (
+    color_neutral_length_distribution,
+    face_length_distribution,
+    pair_length_distribution,
+    random_edge_states,
+)
+from ai.bfs_solver import cross_coordinates, cross_distance_table
+from core.constants import FACE_D, FACE_F, FACE_U
+
+
+class TestDistributions(unittest.TestCase):
+    def test_face_distribution_is_exact_histogram(self):
+        dist = face_length_distribution(FACE_U)
+        self.assertTrue(dist.exact)
+        self.assertAlmostEqual(sum(dist.probabilities.values()), 1.0)
+        self.assertAlmostEqual(dist.probabilities[0], 1 / 190080)
+        self.assertEqual(max(dist.probabilities), 8)
+
+    def test_opposite_pair_is_exact_and_matches_sampling(self):
+        exact = pair_length_distribution(FACE_U, FACE_D)
+        self.assertTrue(exact.exact)
+        self.assertAlmostEqual(sum(exact.probabilities.values()), 1.0)
+
+        rng = np.random.default_rng(7)
+        ep, eo = random_edge_states(200_000, rng)
+        best = np.minimum(
+            cross_distance_table(FACE_U)[cross_coordinates(ep, eo, FACE_U)],
+            cross_distance_table(FACE_D)[cross_coordinates(ep, eo, FACE_D)],
+        )
+        for length, p in exact.probabilities.items():
+            self.assertAlmostEqual(float(np.mean(best == length)), p, delta=0.005)
+
+    def test_adjacent_faces_need_sampling(self):
+        with self.assertRaises(ValueError):
+            pair_length_distribution(FACE_U, FACE_F)
+        dist = color_neutral_length_distribution([FACE_U, FACE_F], samples=20_000, seed=1)
+        self.assertFalse(dist.exact)
+        self.assertEqual(dist.samples, 20_000)
+
+    def test_color_neutral_is_shorter_than_single_face(self):
+        single = face_length_distribution(FACE_U)
+        neutral = color_neutral_length_distribution(samples=50_000, seed=3)
+        self.assertLess(neutral.mean, single.mean)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from ai.bfs_solver import cross_distances
+from ai.cube_ai_state import CubeAIState
+from analysis.corpus import FACE_ORDER
+from analysis.export import export_dataset, iter_chunks, random_cube_states, read_manifest
+from conversion.packing import unpack_cubies
+from core.cubie import permutation_parity, twist_total
+
+
+class TestRandomCubeStates(unittest.TestCase):
+    def test_states_are_reachable(self):
+        cp, co, ep, eo = random_cube_states(500, np.random.default_rng(2))
+        np.testing.assert_array_equal(np.sort(cp, axis=1), np.tile(np.arange(8), (500, 1)))
+        np.testing.assert_array_equal(np.sort(ep, axis=1), np.tile(np.arange(12), (500, 1)))
+        np.testing.assert_array_equal(permutation_parity(cp), permutation_parity(ep))
+        self.assertFalse(twist_total(co).any())
+        self.assertFalse((eo.sum(axis=1) % 2).any())
+
+
+class TestExportDataset(unittest.TestCase):
+    def test_chunks_manifest_and_labels(self):
+        with tempfile.TemporaryDirectory() as out:
+            fields = ('cp', 'co', 'ep', 'eo', 'packed', 'distance')
+            # A small budget forces several batches per chunk.
+            manifest = export_dataset(out, 7000, chunk_rows=3000, fields=fields, seed=11, memory_budget=2 * 2**20)
+            self.assertEqual(manifest, read_manifest(out))
+            self.assertEqual(manifest['rows'], 7000)
+            self.assertEqual([c['rows'] for c in manifest['chunks']], [3000, 3000, 1000])
+            self.assertLess(manifest['batch_rows'], 3000)
+
+            chunks = list(iter_chunks(out))
+            self.assertEqual(len(chunks), 3)
+            for chunk in chunks:
+                self.assertEqual(set(chunk), set(fields))
+                self.assertEqual(chunk['distance'].dtype, np.int8)
+                for got, want in zip(unpack_cubies(chunk['packed']), (chunk['cp'], chunk['co'], chunk['ep'], chunk['eo'])):
+                    np.testing.assert_array_equal(got, want)
+                for row in range(0, len(chunk['cp']), 151):
+                    state = CubeAIState(*(np.array(chunk[f][row]) for f in ('cp', 'co', 'ep', 'eo')))
+                    expected = cross_distances(state)
+                    self.assertEqual(chunk['distance'][row].tolist(), [expected[f] for f in FACE_ORDER])
+
+            with tempfile.TemporaryDirectory() as again:
+                # Different fields and budget, same seed and chunking: same states.
+                export_dataset(again, 3000, chunk_rows=3000, fields=['packed'], seed=11)
+                np.testing.assert_array_equal(next(iter_chunks(again))['packed'], chunks[0]['packed'])
+
+    def test_rejects_bad_arguments(self):
+        with tempfile.TemporaryDirectory() as out:
+            with self.assertRaises(ValueError):
+                export_dataset(out, 10, fields=['nope'])
+            with self.assertRaises(ValueError):
+                export_dataset(out, 10, memory_budget=10)
+            with self.assertRaises(ValueError):
+                export_dataset(out, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
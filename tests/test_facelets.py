@@ -0,0 +1,69 @@
+import random
+import unittest
+
+import numpy as np
+
+from conversion.cube_to_ai import cube_to_ai_arrays
+from conversion.facelets import parse_facelets, to_facelets, validated_ai_arrays
+from core.constants import MOVE_TOKENS
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+_SOLVED_FACE_LETTERS = 'U' * 9 + 'R' * 9 + 'F' * 9 + 'D' * 9 + 'L' * 9 + 'B' * 9
+
+
+def _scrambled(seed):
+    rng = random.Random(seed)
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply_sequence([rng.choice(MOVE_TOKENS) for _ in range(25)])
+    return cube
+
+
+def _swap(text, i, j):
+    chars = list(text)
+    chars[i], chars[j] = chars[j], chars[i]
+    return ''.join(chars)
+
+
+class TestFacelets(unittest.TestCase):
+    def test_round_trip_and_arrays(self):
+        for seed in range(50):
+            cube = _scrambled(seed)
+            parsed = parse_facelets(to_facelets(cube))
+            np.testing.assert_array_equal(parsed.stickers, cube.stickers)
+            for got, expected in zip(validated_ai_arrays(parsed), cube_to_ai_arrays(cube)):
+                np.testing.assert_array_equal(got, expected)
+
+    def test_face_letters(self):
+        cube = parse_facelets(_SOLVED_FACE_LETTERS)
+        np.testing.assert_array_equal(cube.stickers, CubeState.solved().stickers)
+        self.assertEqual(parse_facelets(to_facelets(CubeState.solved()).upper()).stickers.tolist(), cube.stickers.tolist())
+
+    def test_rejects_bad_input(self):
+        solved = to_facelets(CubeState.solved())
+        # Facelet indices: U 0-8, R 9-17, F 18-26, D 27-35, L 36-44, B 45-53
+        cases = {
+            'expected 54': solved[:50],
+            'unknown facelet': 'x' + solved[1:],
+            'mix': 'U' * 9 + solved[9:],
+            'appear 9 times': 'y' + solved[1:],
+            'flipped edges': _swap(solved, 7, 19),  # UF edge flipped
+            'mirrored corner': _swap(solved, 9, 20),  # UFR corner, R and F stickers swapped
+            'parities': _swap(_swap(solved, 7, 5), 19, 10),  # UF and UR edges swapped
+        }
+        for message, text in cases.items():
+            with self.subTest(message):
+                with self.assertRaisesRegex(ValueError, message):
+                    validated_ai_arrays(parse_facelets(text))
+
+    def test_rejects_twisted_corner(self):
+        solved = list(to_facelets(CubeState.solved()))
+        # UFR twisted in place: U -> R -> F -> U
+        solved[8], solved[9], solved[20] = solved[20], solved[8], solved[9]
+        with self.assertRaisesRegex(ValueError, 'twist'):
+            validated_ai_arrays(parse_facelets(''.join(solved)))
+
+
+if __name__ == '__main__':
+    unittest.main()
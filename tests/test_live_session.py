@@ -0,0 +1,80 @@
+import random
+import threading
+import unittest
+
+from ai.bfs_solver import cross_distances
+from ai.live_session import CrossSession, SessionRegistry
+from ai.orientation import normalize_orientation
+from core.constants import MOVE_TOKENS
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+class TestCrossSession(unittest.TestCase):
+    def test_incremental_updates_match_full_recompute(self):
+        rng = random.Random(7)
+        for start in ([], ['x', 'R', "U'"], ['y2', 'M', 'F']):
+            cube = _apply(CubeState.solved(), start)
+            session = CrossSession(cube)
+            for _ in range(6):
+                moves = [rng.choice(MOVE_TOKENS) for _ in range(3)]
+                session.apply(moves)
+                _apply(cube, moves)
+                expected = cross_distances(normalize_orientation(cube)[0])
+                self.assertEqual(session.distances(), expected)
+                for face, solution in session.state()["solutions"].items():
+                    self.assertEqual(len(solution), expected[face])
+                    solved = _apply(cube.copy(), solution)
+                    self.assertEqual(cross_distances(normalize_orientation(solved)[0])[face], 0)
+
+    def test_rejects_non_face_turns_without_applying(self):
+        session = CrossSession()
+        with self.assertRaises(ValueError):
+            session.apply(['R', 'x'])
+        self.assertEqual(session.version, 0)
+        self.assertEqual(set(session.distances().values()), {0})
+
+    def test_wait_wakes_on_apply(self):
+        session = CrossSession()
+        self.assertFalse(session.wait(0, timeout=0.01))
+        timer = threading.Timer(0.05, session.apply, args=(['R'],))
+        timer.start()
+        self.assertTrue(session.wait(0, timeout=5))
+        self.assertEqual(session.state()["last_move"], 'R')
+
+
+class TestSessionRegistry(unittest.TestCase):
+    def test_capacity_drops_least_recently_used(self):
+        registry = SessionRegistry(capacity=2)
+        first, _ = registry.create()
+        second, _ = registry.create()
+        registry.get(first)
+        registry.create()
+        self.assertEqual(len(registry), 2)
+        self.assertIsNotNone(registry.get(first))
+        self.assertIsNone(registry.get(second))
+
+    def test_idle_sessions_expire(self):
+        registry = SessionRegistry(max_idle=0.0)
+        session_id, session = registry.create()
+        session.last_active -= 1
+        self.assertIsNone(registry.get(session_id))
+        self.assertFalse(registry.close(session_id))
+
+    def test_peek_does_not_refresh(self):
+        registry = SessionRegistry(max_idle=10.0)
+        session_id, session = registry.create()
+        session.last_active -= 5
+        self.assertIs(registry.peek(session_id), session)
+        session.last_active -= 6
+        self.assertIsNone(registry.peek(session_id))
+        self.assertIsNone(registry.get(session_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
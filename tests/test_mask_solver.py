@@ -0,0 +1,60 @@
+import unittest
+
+from ai.bfs_solver import BFSSolver
+from ai.mask_solver import BidirectionalSolver, StickerGoal, block_goal, piece_stickers, pseudo_cross_goal
+from core.constants import CORNER_DBL, CORNER_UFR, EDGE_DB, EDGE_DF, EDGE_DL, EDGE_DR, FACE_D, FACE_U
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+_SCRAMBLE = "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R".split()
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+class TestBidirectionalSolver(unittest.TestCase):
+    def test_cross_mask_matches_cross_table(self):
+        cross = StickerGoal(piece_stickers(edges=[EDGE_DF, EDGE_DR, EDGE_DB, EDGE_DL]))
+        solver = BidirectionalSolver(cross)
+        for scramble in (_SCRAMBLE, _SCRAMBLE + ['x'], ['R', 'U', "F'"]):
+            cube = _apply(CubeState.solved(), scramble)
+            optimal = BFSSolver(target_center_face=FACE_D).solve_cross(cube)
+            solutions = solver.solve(cube, max_solutions=3)
+            self.assertTrue(solutions)
+            for moves in solutions:
+                self.assertEqual(len(moves), len(optimal))
+                self.assertTrue(solver.is_solved(_apply(cube.copy(), moves)))
+
+    def test_block_solution_is_optimal(self):
+        solver = BidirectionalSolver(block_goal(CORNER_DBL))
+        cube = _apply(CubeState.solved(), ['L', 'D', 'B'])
+        self.assertEqual(solver.solve(cube), [["B'", "D'", "L'"]])
+        self.assertEqual(solver.solve(CubeState.solved()), [[]])
+
+    def test_pseudo_cross_accepts_any_d_turn(self):
+        solver = BidirectionalSolver(pseudo_cross_goal(FACE_D))
+        cube = _apply(CubeState.solved(), ['D', 'R'])
+        self.assertEqual(solver.solve(cube), [["R'"]])
+
+    def test_restricted_moves(self):
+        solver = BidirectionalSolver(block_goal(CORNER_UFR), moves=['R', "R'", 'U', "U'"])
+        cube = _apply(CubeState.solved(), "R U R' U R U2 R'".split())
+        (moves,) = solver.solve(cube)
+        self.assertEqual(len(moves), 8)
+        self.assertTrue(set(moves) <= {'R', "R'", 'U', "U'"})
+        self.assertTrue(solver.is_solved(_apply(cube, moves)))
+
+    def test_depth_limit_and_bad_goals(self):
+        solver = BidirectionalSolver(block_goal(CORNER_DBL))
+        self.assertEqual(solver.solve(_apply(CubeState.solved(), _SCRAMBLE), max_depth=2), [])
+        with self.assertRaises(ValueError):
+            BidirectionalSolver(StickerGoal(frozenset({(FACE_U, 1, 1)})))
+        with self.assertRaises(ValueError):
+            BidirectionalSolver(block_goal(CORNER_DBL), moves=['M'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from ai.bfs_solver import BFSSolver
+from ai.cube_ai_state import CubeAIState
+from ai.metrics import HTM, QTM, STM, find_metric_cross_solutions, metric_length, solve_cross_in_metric
+from ai.orientation import normalize_orientation, physical_moves
+from core.constants import DEFAULT_FACE_COLOR, FACE_D, MOVE_TOKENS
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _cross_solved(cube, face):
+    return CubeAIState.from_cube_state(normalize_orientation(cube)[0]).is_cross_solved(face)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_metric_length(self):
+        self.assertEqual(metric_length(['R2', 'U', "F'"], HTM), 3)
+        self.assertEqual(metric_length(['R2', 'U', "F'"], QTM), 4)
+        self.assertEqual(metric_length(['M2', 'U'], STM), 2)
+        with self.assertRaises(ValueError):
+            metric_length([], 'etm')
+
+    def test_slice_shortens_cross(self):
+        cube = _apply(CubeState.solved(), ['M2'])
+        self.assertEqual(len(BFSSolver(target_center_face=FACE_D).solve_cross(cube)), 2)
+        self.assertEqual(solve_cross_in_metric(cube, FACE_D, STM), ['M2'])
+
+    def test_quarter_turns_count_double(self):
+        cube = _apply(CubeState.solved(), ['F2'])
+        self.assertEqual(solve_cross_in_metric(cube, FACE_D, QTM), ['F2'])
+        face, length, _ = find_metric_cross_solutions(cube, QTM, faces=[FACE_D])[0]
+        self.assertEqual((face, length), (FACE_D, 2))
+
+    def test_solutions_are_valid_and_bounded_by_htm(self):
+        rng = random.Random(5)
+        tokens = MOVE_TOKENS + ['M', "E'", 'S2', 'x', "y'"]
+        for _ in range(5):
+            cube = _apply(CubeState.solved(), [rng.choice(tokens) for _ in range(25)])
+            htm = {face: length for face, length, _ in find_metric_cross_solutions(cube, HTM)}
+            for metric in (STM, QTM):
+                for face, length, moves in find_metric_cross_solutions(cube, metric):
+                    self.assertTrue(_cross_solved(_apply(cube.copy(), moves), face), (metric, face, moves))
+                    self.assertEqual(length, metric_length(moves, metric))
+                    if metric == STM:
+                        self.assertLessEqual(length, htm[face])
+                    else:
+                        self.assertGreaterEqual(length, htm[face])
+
+    def test_physical_moves_follow_moved_centers(self):
+        # M turns like L, taking the U center to F: a center-frame U turn is then a physical F turn.
+        centers = tuple(int(DEFAULT_FACE_COLOR[f]) for f in range(6))
+        self.assertEqual(physical_moves(['M', 'U'], centers), ['M', 'F'])
+        self.assertEqual(physical_moves(['M', 'M'], centers), ['M', 'M'])
+        self.assertEqual(physical_moves(['E', 'F', 'S'], centers), ['E', 'R', "M'"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ai.bfs_solver import BFSSolver
+from ai.cube_ai_state import CubeAIState
+from ai import move_subsets
+from ai.move_subsets import find_subset_cross_solutions, parse_move_subset, solve_cross_with_moves
+from ai.orientation import normalize_orientation
+from ai.pruning_table import EDGE, PieceSet, PruningTable, TableSpec
+from core.constants import EDGE_FR, FACE_D, FACE_U
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _cross_solved(cube, face):
+    return CubeAIState.from_cube_state(normalize_orientation(cube)[0]).is_cross_solved(face)
+
+
+_SCRAMBLE = "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R".split()
+
+
+class TestMoveSubsets(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.table_dir = Path(tmp.name)
+        for patch in (
+            mock.patch.object(move_subsets, '_TABLE_DIR', self.table_dir),
+            mock.patch.object(move_subsets, '_TABLES', move_subsets.OrderedDict()),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_parse(self):
+        self.assertEqual(parse_move_subset('RU'), ('R', "R'", 'R2', 'U', "U'", 'U2'))
+        self.assertEqual(parse_move_subset("U2, R2 F'"), ('R2', 'U2', "F'"))
+        self.assertEqual(parse_move_subset("U, R2"), ('R2', 'U', "U'", 'U2'))
+        self.assertEqual(parse_move_subset('R U'), parse_move_subset('U,R'))
+        for bad in ('', 'R, Q', 'x'):
+            with self.assertRaises(ValueError):
+                parse_move_subset(bad)
+
+    def test_subset_solutions_use_only_allowed_moves(self):
+        allowed = parse_move_subset('R U F L D')
+        cube = _apply(CubeState.solved(), _SCRAMBLE)
+        results = find_subset_cross_solutions(cube, allowed, faces=[FACE_D, FACE_U])
+        self.assertEqual({face for face, _, _ in results}, {FACE_D, FACE_U})
+        for face, length, moves in results:
+            self.assertTrue(set(moves) <= set(allowed))
+            self.assertTrue(_cross_solved(_apply(cube.copy(), moves), face))
+            self.assertGreaterEqual(length, len(BFSSolver(target_center_face=face).solve_cross(cube)))
+
+    def test_subset_follows_rotated_cube(self):
+        # After y, the physical R face holds the default B center: B stays forbidden physically.
+        cube = _apply(CubeState.solved(), ['y', 'R', 'U'])
+        allowed = parse_move_subset('RUD')
+        moves = solve_cross_with_moves(cube, FACE_D, allowed)
+        self.assertEqual(moves, ["R'"])
+
+    def test_one_directional_move_set(self):
+        # Without inverses, undoing R takes three more R turns.
+        with tempfile.TemporaryDirectory() as tmp:
+            spec = TableSpec('fr_r', (PieceSet(EDGE, (EDGE_FR,)),), moves=('R', 'U'))
+            table = PruningTable(spec, table_dir=Path(tmp))
+            cube = _apply(CubeState.solved(), ['R'])
+            self.assertEqual(table.solve(cube), ['R', 'R', 'R'])
+
+    def test_old_table_files_are_deleted(self):
+        cube = _apply(CubeState.solved(), ['R', 'U'])
+        with mock.patch.object(move_subsets, '_MAX_TABLE_FILES', 2):
+            for subset in ('R U B', 'R U L', 'R U F', 'R U D'):
+                self.assertIsNotNone(solve_cross_with_moves(cube, FACE_D, parse_move_subset(subset)))
+        files = list(self.table_dir.glob('cross_D_subset_*.npy'))
+        self.assertLessEqual(len(files), 2)
+        self.assertIn(move_subsets.subset_cross_table(FACE_D, parse_move_subset('R U D')).path, files)
+
+
+if __name__ == '__main__':
+    unittest.main()
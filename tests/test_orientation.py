@@ -0,0 +1,72 @@
+import unittest
+
+from ai.bfs_solver import BFSSolver
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import (
+    find_oriented_cross_solutions,
+    normalize_orientation,
+    rotations,
+)
+from core.constants import DEFAULT_FACE_COLOR, FACE_D, FACE_U
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+_FACE_BY_COLOR = {color: face for face, color in DEFAULT_FACE_COLOR.items()}
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _cross_solved(cube, color):
+    normalized, _ = normalize_orientation(cube)
+    return CubeAIState.from_cube_state(normalized).is_cross_solved(_FACE_BY_COLOR[color])
+
+
+class TestOrientation(unittest.TestCase):
+    def test_24_distinct_rotations(self):
+        rots = rotations()
+        self.assertEqual(len(rots), 24)
+        self.assertEqual(len({r.perm for r in rots}), 24)
+        self.assertEqual(rots[0].tokens, ())
+        self.assertTrue(all(len(r.tokens) <= 2 for r in rots))
+
+    def test_normalize_undoes_center_moves(self):
+        cube = _apply(CubeState.solved(), ['x', 'M', "R", 'y', 'E2', 'S'])
+        normalized, rotation = normalize_orientation(cube)
+        self.assertNotEqual(rotation, ())
+        CubeAIState.from_cube_state(normalized)  # raises on an inconsistent cube
+
+    def test_solve_cross_in_rotated_frame(self):
+        cube = _apply(CubeState.solved(), "R U x F' M2 D y L2 B".split())
+        for face in DEFAULT_FACE_COLOR:
+            solution = BFSSolver(target_center_face=face).solve_cross(cube)
+            self.assertTrue(_cross_solved(_apply(cube.copy(), solution), DEFAULT_FACE_COLOR[face]))
+
+    def test_oriented_solutions_are_executable(self):
+        cube = _apply(CubeState.solved(), "D2 F' L U2 B R' z M' U F2 R".split())
+        results = find_oriented_cross_solutions(cube)
+        self.assertEqual(len(results), 24)
+        self.assertEqual(results, sorted(results, key=lambda r: (r.cost, len(r.rotation), r.rotation)))
+        for result in results:
+            done = _apply(cube.copy(), result.sequence)
+            self.assertEqual(int(done.stickers[FACE_D, 1, 1]), result.color)
+            self.assertTrue(_cross_solved(done, result.color))
+
+    def test_rotation_cost_shapes_ranking(self):
+        # White cross is solved on top: free when building the cross on U,
+        # and worth a cheap x2 when building it on the bottom.
+        cube = _apply(CubeState.solved(), ['D'])
+        on_top = find_oriented_cross_solutions(cube, cross_face=FACE_U)[0]
+        self.assertEqual((on_top.rotation, on_top.moves), ((), ()))
+
+        bottom = find_oriented_cross_solutions(cube, rotation_cost={'x2': 0.25, 'z2': 5.0})
+        best = bottom[0]
+        self.assertEqual(best.rotation, ('x2',))
+        self.assertEqual(best.color, DEFAULT_FACE_COLOR[FACE_U])
+
+
+if __name__ == '__main__':
+    unittest.main()
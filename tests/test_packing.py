@@ -0,0 +1,91 @@
+import random
+import unittest
+
+import numpy as np
+
+from conversion.cube_to_ai import cube_to_ai_arrays
+from conversion.packing import (
+    CORNER_KEYS,
+    EDGE_KEYS,
+    cube_from_key,
+    cubie_key,
+    pack_cubies,
+    pack_stickers,
+    state_key,
+    unpack_cubies,
+    unpack_stickers,
+)
+from core.constants import MOVE_TOKENS
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _random_cubes(count, seed=3):
+    rng = random.Random(seed)
+    cubes = []
+    for _ in range(count):
+        cube = CubeState.solved()
+        CubeMoveEngine(cube).apply_sequence([rng.choice(MOVE_TOKENS + ['x', 'y', 'M']) for _ in range(25)])
+        cubes.append(cube)
+    return cubes
+
+
+class TestStickerPacking(unittest.TestCase):
+    def test_round_trip_scalar_and_batch(self):
+        cubes = _random_cubes(50)
+        stickers = np.stack([c.stickers for c in cubes])
+        packed = pack_stickers(stickers)
+        self.assertEqual(packed.shape, (50, 21))
+        np.testing.assert_array_equal(unpack_stickers(packed), stickers)
+        for cube, row in zip(cubes, packed):
+            np.testing.assert_array_equal(pack_stickers(cube.stickers), row)
+            self.assertEqual(cube_from_key(state_key(cube)), cube)
+
+    def test_key_equal_iff_state_equal(self):
+        cubes = _random_cubes(50) + [CubeState.solved()]
+        self.assertEqual(cubes[0].copy().key(), cubes[0].key())
+        self.assertEqual(len({c.key() for c in cubes}), len({c.stickers.tobytes() for c in cubes}))
+        self.assertEqual(state_key(CubeState.solved()), 0x492492524924936DB6DB92492496DB6DB40)
+
+    def test_rejects_bad_input(self):
+        bad = CubeState.solved().stickers.copy()
+        bad[0, 0, 0] = 7
+        with self.assertRaises(ValueError):
+            pack_stickers(bad)
+        with self.assertRaises(ValueError):
+            unpack_stickers(np.full(21, 255, dtype=np.uint8))
+
+
+class TestCubiePacking(unittest.TestCase):
+    def test_round_trip_scalar_and_batch(self):
+        rng = np.random.default_rng(5)
+        n = 200
+        cp = np.array([rng.permutation(8) for _ in range(n)])
+        ep = np.array([rng.permutation(12) for _ in range(n)])
+        co = rng.integers(0, 3, (n, 8))
+        eo = rng.integers(0, 2, (n, 12))
+        packed = pack_cubies(cp, co, ep, eo)
+        self.assertEqual(packed.shape, (n, 2))
+        self.assertTrue(np.all(packed[:, 0] < CORNER_KEYS) and np.all(packed[:, 1] < EDGE_KEYS))
+        for got, want in zip(unpack_cubies(packed), (cp, co, ep, eo)):
+            np.testing.assert_array_equal(got, want)
+        np.testing.assert_array_equal(pack_cubies(cp[7], co[7], ep[7], eo[7]), packed[7])
+
+    def test_cube_arrays_and_solved(self):
+        for cube in _random_cubes(20):
+            arrays = cube_to_ai_arrays(cube)
+            for got, want in zip(unpack_cubies(pack_cubies(*arrays)), arrays):
+                np.testing.assert_array_equal(got, want)
+        self.assertEqual(cubie_key(*cube_to_ai_arrays(CubeState.solved())), 0)
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            pack_cubies(np.zeros(8, int), np.zeros(8, int), np.arange(12), np.zeros(12, int))
+        with self.assertRaises(ValueError):
+            pack_cubies(np.arange(8), np.full(8, 3), np.arange(12), np.zeros(12, int))
+        with self.assertRaises(ValueError):
+            unpack_cubies(np.array([CORNER_KEYS, 0], dtype=np.uint64))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ai.bfs_solver import cross_distance_table
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import normalize_orientation
+from ai.pruning_table import CORNER, EDGE, PieceSet, PruningTable, TableSpec
+from core.constants import CORNER_DFR, EDGE_DB, EDGE_DF, EDGE_DL, EDGE_DR, EDGE_FR, FACE_D
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+_D_CROSS = PieceSet(EDGE, (EDGE_DF, EDGE_DR, EDGE_DB, EDGE_DL))
+_EO = PieceSet(EDGE, position=False)
+
+
+class TestPruningTable(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.table_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_cross_spec_matches_cross_tables(self):
+        table = PruningTable(TableSpec('cross_d', (_D_CROSS,)), table_dir=self.table_dir)
+        self.assertTrue(np.array_equal(table.table, cross_distance_table(FACE_D)))
+
+        # Second instance loads the persisted file instead of rebuilding.
+        reloaded = PruningTable(TableSpec('cross_d', (_D_CROSS,)), table_dir=self.table_dir)
+        self.assertTrue(reloaded.path.exists())
+        self.assertTrue(np.array_equal(reloaded.table, table.table))
+
+    def test_solve_reaches_goal_optimally(self):
+        spec = TableSpec('pair', (PieceSet(CORNER, (CORNER_DFR,)), PieceSet(EDGE, (EDGE_FR,))))
+        table = PruningTable(spec, table_dir=self.table_dir)
+        self.assertEqual(table.size, 24 * 24)
+        self.assertTrue(np.all(table.table >= 0))
+
+        cube = _apply(CubeState.solved(), "R U R' U' F' L' U2 B".split())
+        moves = table.solve(cube)
+        self.assertEqual(len(moves), table.distance(cube))
+        self.assertEqual(table.distance(_apply(cube, moves)), 0)
+
+    def test_orientation_only_uses_fb_axis(self):
+        table = PruningTable(TableSpec('eo', (_EO,)), table_dir=self.table_dir)
+        self.assertEqual(table.size, 4096)
+        self.assertEqual(table.distance(_apply(CubeState.solved(), "R U L' D2 R2".split())), 0)
+        self.assertEqual(table.distance(_apply(CubeState.solved(), ['F'])), 1)
+        self.assertEqual(table.distance(_apply(CubeState.solved(), ['F', 'B'])), 2)
+        self.assertEqual(int(np.count_nonzero(table.table >= 0)), 2048)  # flip parity is invariant
+
+    def test_slice_moves_and_multiple_goals(self):
+        spec = TableSpec('fr_m', (PieceSet(EDGE, (EDGE_FR,)),), goals=((), ('R2',)), moves=('U', 'M', "M'", 'M2'))
+        table = PruningTable(spec, table_dir=self.table_dir)
+        self.assertEqual(table.distance(_apply(CubeState.solved(), ['R2'])), 0)
+
+        # Relative to the centers M turns the R and L layers, so it moves FR.
+        cube = _apply(CubeState.solved(), ['M'])
+        self.assertEqual(table.distance(cube), 1)
+        moves = table.solve(CubeAIState.from_cube_state(normalize_orientation(cube)[0]))
+        self.assertIn(moves, (['M'], ["M'"]))  # M reaches the R2 goal, M' the solved one
+
+    def test_rejects_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            PieceSet('center', (0,))
+        with self.assertRaises(ValueError):
+            PieceSet(EDGE, (EDGE_DF, EDGE_DF))
+        with self.assertRaises(ValueError):
+            PieceSet(CORNER, (CORNER_DFR,), position=False)
+        with self.assertRaises(ValueError):
+            TableSpec('empty', ())
+
+
+if __name__ == '__main__':
+    unittest.main()
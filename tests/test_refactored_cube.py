@@ -38,6 +38,20 @@ class TestRefactoredCube(unittest.TestCase):
             engine.apply(inverse[mv])
             self.assertEqual(cube, CubeState.solved())
 
+    def test_rotations_match_slice_identities(self):
+        scramble = ['R', 'U', "F'", 'L2', 'D', "B'"]
+        identities = {
+            'x': ['R', "M'", "L'"],
+            'y': ['U', "E'", "D'"],
+            'z': ['F', 'S', "B'"],
+        }
+        for rotation, equivalent in identities.items():
+            a = CubeState.solved()
+            CubeMoveEngine(a).apply_sequence(scramble + [rotation])
+            b = CubeState.solved()
+            CubeMoveEngine(b).apply_sequence(scramble + equivalent)
+            self.assertEqual(a, b, rotation)
+
 
 if __name__ == '__main__':
     unittest.main()
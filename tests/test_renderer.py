@@ -0,0 +1,60 @@
+import re
+import struct
+import unittest
+import zlib
+
+import numpy as np
+
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+from visualization.renderer import render_cube_image, render_cube_png, render_cube_svg
+
+
+def _scrambled():
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply_sequence(['R', 'U', "F'", 'D2'])
+    return cube
+
+
+def _decode_png(data):
+    """(width, height, pixels) of an unfiltered 8-bit RGB PNG as written by render_cube_png."""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', data[16:24])
+    idat_len = struct.unpack('>I', data[33:37])[0]
+    raw = zlib.decompress(data[41:41 + idat_len])
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, 1 + width * 3)
+    return width, height, rows[:, 1:].reshape(height, width, 3)
+
+
+class TestImageRenderers(unittest.TestCase):
+    def test_svg_fills_follow_stickers(self):
+        cube = _scrambled()
+        fills = re.findall(r'fill="(#[0-9a-f]{6})"', render_cube_svg(cube))
+        self.assertEqual(len(fills), 54)
+        codes = cube.stickers.reshape(-1)
+        by_code = {}
+        for code, fill in zip(codes, fills):
+            by_code.setdefault(int(code), set()).add(fill)
+        self.assertTrue(all(len(v) == 1 for v in by_code.values()))
+        self.assertEqual(len({next(iter(v)) for v in by_code.values()}), 6)
+
+    def test_png_matches_svg_layout(self):
+        cube = _scrambled()
+        width, height, pixels = _decode_png(render_cube_png(cube, sticker=10))
+        svg = render_cube_svg(cube, sticker=10)
+        self.assertIn(f'width="{width}" height="{height}"', svg)
+        for m in re.finditer(r'<rect x="(\d+)" y="(\d+)" width="10" height="10" fill="#(\w{6})"/>', svg):
+            x, y = int(m.group(1)), int(m.group(2))
+            expected = tuple(bytes.fromhex(m.group(3)))
+            self.assertEqual(tuple(pixels[y + 5, x + 5]), expected)
+
+    def test_cache(self):
+        cube = _scrambled()
+        self.assertIs(render_cube_image(cube, 'png'), render_cube_image(cube.copy(), 'png'))
+        self.assertIsNot(render_cube_image(cube, 'png'), render_cube_image(CubeState.solved(), 'png'))
+        with self.assertRaises(ValueError):
+            render_cube_image(cube, 'gif')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from ai.bfs_solver import cross_distances
+from core.constants import FACE_D, FACE_F, MOVE_TOKENS
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+from utils.scramble import (
+    generate_cross_scramble,
+    generate_cross_scrambles,
+    generate_scramble_batch,
+    invert_moves,
+    scramble_streams,
+    simplify_moves,
+)
+
+
+def _apply(moves):
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply_sequence(moves)
+    return cube
+
+
+class TestScrambleHelpers(unittest.TestCase):
+    def test_invert_moves_undoes_sequence(self):
+        moves = ['R', "U'", 'F2', 'D', "B'"]
+        self.assertEqual(_apply(moves + invert_moves(moves)), CubeState.solved())
+
+    def test_simplify_moves_merges_and_cancels(self):
+        self.assertEqual(simplify_moves(['R', 'R']), ['R2'])
+        self.assertEqual(simplify_moves(['R', "R'", 'U']), ['U'])
+        self.assertEqual(simplify_moves(['R', 'L', "R'"]), ['L'])
+        self.assertEqual(simplify_moves(['F', 'U', "U'", "F'"]), [])
+
+        moves = ['R', 'L', 'R', "U'", 'D', 'U2', 'F', 'F']
+        self.assertEqual(_apply(simplify_moves(moves)), _apply(moves))
+
+
+class TestCrossScramble(unittest.TestCase):
+    def test_face_targeted_length(self):
+        rng = random.Random(11)
+        for length in (3, 7, 8):
+            for moves in generate_cross_scrambles(20, length, face=FACE_F, rng=rng):
+                self.assertEqual(cross_distances(_apply(moves))[FACE_F], length)
+
+    def test_color_neutral_length(self):
+        rng = random.Random(12)
+        for _ in range(10):
+            moves = generate_cross_scramble(6, face=None, rng=rng)
+            self.assertEqual(min(cross_distances(_apply(moves)).values()), 6)
+
+    def test_color_neutral_rare_length(self):
+        rng = random.Random(13)
+        for _ in range(3):
+            self.assertEqual(min(cross_distances(_apply(generate_cross_scramble(7, face=None, rng=rng))).values()), 7)
+
+    def test_unreachable_length_rejected(self):
+        with self.assertRaises(ValueError):
+            generate_cross_scramble(9, face=FACE_D)
+
+
+class TestScrambleBatch(unittest.TestCase):
+    def test_canonical_rules(self):
+        moves = generate_scramble_batch(2000, 20, rng=5)
+        self.assertEqual(moves.shape, (2000, 20))
+        faces = 'RLUDFB'
+        for row in moves[:200]:
+            letters = [MOVE_TOKENS[k][0] for k in row]
+            for a, b in zip(letters, letters[1:]):
+                self.assertNotEqual(a, b)
+                # Opposite faces only in R-L / U-D / F-B order.
+                self.assertNotIn((faces.index(a), faces.index(b)), {(1, 0), (3, 2), (5, 4)})
+
+    def test_streams_are_reproducible_and_independent(self):
+        a1, b1 = scramble_streams(42, 2)
+        a2, b2 = scramble_streams(42, 2)
+        first = generate_scramble_batch(10, 20, a1)
+        self.assertTrue((first == generate_scramble_batch(10, 20, a2)).all())
+        self.assertFalse((first == generate_scramble_batch(10, 20, b1)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ai.bfs_solver import cross_distance_table, cross_move_table
+from ai.table_manager import DISTANCE, MOVE, TABLES, TableManager
+from core.constants import FACE_D
+
+
+def _loader(size, calls):
+    def load():
+        calls.append(size)
+        return np.zeros(size, dtype=np.int8), True
+    return load
+
+
+class TestTableManager(unittest.TestCase):
+    def test_least_recently_used_table_is_evicted(self):
+        manager = TableManager(budget_bytes=250)
+        calls = []
+        manager.get('a', _loader(100, calls))
+        manager.get('b', _loader(100, calls))
+        manager.get('a', _loader(100, calls))  # hit; b is now the oldest
+        manager.get('c', _loader(100, calls))
+        stats = manager.stats()
+        self.assertEqual(calls, [100, 100, 100])
+        self.assertEqual(stats['resident_bytes'], 200)
+        self.assertFalse(stats['tables']['b']['resident'])
+        self.assertEqual(stats['tables']['b']['evictions'], 1)
+        self.assertEqual(stats['tables']['a']['hits'], 1)
+        manager.get('b', _loader(100, calls))  # reloaded on demand
+        self.assertEqual(manager.stats()['tables']['b']['builds'], 2)
+
+    def test_pinned_tables_stay(self):
+        manager = TableManager(budget_bytes=150)
+        manager.get('pinned', _loader(100, []), pinned=True)
+        manager.get('other', _loader(100, []))
+        manager.get('third', _loader(100, []))
+        tables = manager.stats()['tables']
+        self.assertTrue(tables['pinned']['resident'])
+        self.assertFalse(tables['other']['resident'])
+        manager.set_budget(0)
+        self.assertEqual(manager.stats()['resident_tables'], 1)
+        with self.assertRaises(ValueError):
+            manager.set_budget(-1)
+
+    def test_saved_tables_are_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'demo.npy'
+            build = lambda: np.arange(10, dtype=np.int8)
+            first = TableManager().load_or_build('demo', path, (10,), build)
+            second_manager = TableManager()
+            second = second_manager.load_or_build('demo', path, (10,), build)
+            self.assertIsInstance(second, np.memmap)
+            self.assertTrue(np.array_equal(first, second))
+            self.assertEqual(second_manager.stats()['tables']['demo']['loads'], 1)
+            self.assertEqual(second_manager.stats()['builds'], 0)
+            self.assertFalse(second.flags.writeable)
+
+    def test_cross_tables_are_managed(self):
+        cross_distance_table(FACE_D)
+        cross_move_table()
+        tables = TABLES.stats()['tables']
+        self.assertEqual(tables['cross_D']['kind'], DISTANCE)
+        self.assertEqual((tables['cross_moves']['kind'], tables['cross_moves']['pinned']), (MOVE, True))
+
+    def test_move_tables_count_towards_the_budget(self):
+        manager = TableManager(budget_bytes=2000)
+        moves = [[1000, 1001], [2, 3]]
+        manager.get('moves', lambda: (moves, True), pinned=True, kind=MOVE)
+        manager.get('dist', _loader(1000, []))
+        stats = manager.stats()
+        list_bytes = stats['tables']['moves']['bytes']
+        self.assertGreater(list_bytes, 0)
+        self.assertEqual(stats['resident_bytes_by_kind'], {DISTANCE: 1000, MOVE: list_bytes})
+        manager.set_budget(list_bytes + 999)
+        self.assertEqual(manager.stats()['resident_bytes_by_kind'][DISTANCE], 0)
+        with self.assertRaises(ValueError):
+            manager.get('bad', _loader(1, []), kind='other')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import normalize_orientation
+from ai.two_phase import TwoPhaseSolver
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _is_solved(cube):
+    return CubeAIState.from_cube_state(normalize_orientation(cube)[0]).is_solved()
+
+
+_SCRAMBLES = [
+    "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R",
+    "U' B2 F2 R2 U2 L' R2 D2 L' B2 D2 U L2 F L' R' B' U R2",
+]
+
+
+class TestTwoPhaseSolver(unittest.TestCase):
+    def test_solved_cube(self):
+        self.assertEqual(TwoPhaseSolver().solve(CubeState.solved()), [])
+
+    def test_solves_scrambles_within_max_length(self):
+        solver = TwoPhaseSolver(max_length=21, timeout=None)
+        for scramble in _SCRAMBLES:
+            cube = _apply(CubeState.solved(), scramble.split())
+            moves = solver.solve(cube)
+            self.assertLessEqual(len(moves), 21)
+            self.assertTrue(_is_solved(_apply(cube, moves)), scramble)
+
+    def test_short_scramble_gets_short_solution(self):
+        cube = _apply(CubeState.solved(), ["R", "U", "F'"])
+        moves = TwoPhaseSolver(max_length=3, timeout=None).solve(cube)
+        self.assertEqual(moves, ['F', "U'", "R'"])
+
+    def test_rotated_centers(self):
+        cube = _apply(CubeState.solved(), "x R U2 M' F y".split())
+        moves = TwoPhaseSolver().solve(cube)
+        self.assertTrue(_is_solved(_apply(cube, moves)))
+
+    def test_rejects_unsolvable_state(self):
+        ai = CubeAIState.from_cube_state(CubeState.solved())
+        twisted = CubeAIState(
+            ai.corner_permutation, np.array([1, 0, 0, 0, 0, 0, 0, 0], dtype=np.int8), ai.edge_permutation, ai.edge_orientation
+        )
+        with self.assertRaises(ValueError):
+            TwoPhaseSolver().solve(twisted)
+        swapped = CubeAIState(
+            ai.corner_permutation, ai.corner_orientation, np.array([1, 0, *range(2, 12)], dtype=np.int8), ai.edge_orientation
+        )
+        with self.assertRaises(ValueError):
+            TwoPhaseSolver().solve(swapped)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import gzip
+import json
+import threading
+import unittest
+from unittest import mock
+
+import web_server
+from web_server import app
+
+
+class TestSessionEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        self.session_id = self.client.post('/session', json={}).get_json()['session_id']
+
+    def test_moves_as_string_or_list(self):
+        url = f'/session/{self.session_id}/moves'
+        self.assertEqual(self.client.post(url, json={'moves': "R U'"}).status_code, 200)
+        state = self.client.post(url, json={'moves': ['U', "R'"]}).get_json()['state']
+        self.assertEqual(state['move_count'], 4)
+
+    def test_malformed_moves_are_rejected(self):
+        url = f'/session/{self.session_id}/moves'
+        for moves in (5, [1, 2], {'R': 1}, ['R', 'x']):
+            response = self.client.post(url, json={'moves': moves})
+            self.assertEqual(response.status_code, 400, moves)
+            self.assertIn('error', response.get_json())
+
+
+class TestRenderEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_revalidation_skips_the_solve(self):
+        query = {'scramble': "R U F' D2", 'solve': 'full', 'format': 'png', 'size': 8}
+        first = self.client.get('/render', query_string=query)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.mimetype, 'image/png')
+        etag = first.headers['ETag']
+        web_server.render_state_key.cache_clear()
+        with mock.patch.object(web_server, 'TwoPhaseSolver', side_effect=AssertionError('solved again')):
+            again = self.client.get('/render', query_string=query, headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers['ETag'], etag)
+
+    def test_etag_follows_inputs(self):
+        svg = self.client.get('/render', query_string={'scramble': 'R U'})
+        self.assertEqual(svg.status_code, 200)
+        self.assertEqual(self.client.get('/render', query_string={'scramble': ' R  U '}).headers['ETag'], svg.headers['ETag'])
+        self.assertNotEqual(self.client.get('/render', query_string={'scramble': 'R U', 'size': 21}).headers['ETag'], svg.headers['ETag'])
+        self.assertEqual(self.client.get('/render', query_string={'scramble': 'R Q'}).status_code, 400)
+
+
+class TestCompactSolve(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        web_server.compact_cache = web_server.FragmentCache()
+
+    def test_default_is_full_format(self):
+        body = self.client.get('/solve', query_string={'scramble': "R U F'"}).get_json()
+        self.assertTrue(body['success'])
+        self.assertIn('solution_string', body['solutions'][0])
+
+    def test_compact_fields(self):
+        query = {'scramble': "R U F' L2 D", 'format': 'compact'}
+        full = self.client.get('/solve', query_string={'scramble': query['scramble']}).get_json()
+        body = json.loads(self.client.get('/solve', query_string=query).data)
+        self.assertEqual(list(body), ['v', 'length', 'best'])
+        self.assertEqual(body['v'], web_server.COMPACT_VERSION)
+        self.assertEqual(body['length'], full['best_length'])
+        self.assertEqual(body['best'][1], full['solutions'][0]['solution_string'])
+
+        query['fields'] = ' scramble,solutions,verified,scramble '
+        body = json.loads(self.client.get('/solve', query_string=query).data)
+        self.assertEqual(list(body), ['v', 'scramble', 'solutions', 'verified'])
+        self.assertEqual(body['scramble'], query['scramble'])
+        self.assertEqual(body['solutions'], [
+            [sol['face_number'], sol['move_count'], sol['solution_string']] for sol in full['solutions']
+        ])
+        self.assertIs(body['verified'], True)
+
+    def test_bad_format_and_fields(self):
+        for query in ({'format': 'terse'}, {'format': 'compact', 'fields': 'length,nope'}, {'format': 'compact', 'fields': ','}):
+            response = self.client.get('/solve', query_string={'scramble': 'R U', **query})
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn('error', response.get_json())
+        response = self.client.post('/solve_batch', json={'scrambles': ['R'], 'format': 'compact', 'fields': ['x']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_results_are_kept(self):
+        query = {'scramble': "R U F' L2 D", 'format': 'compact', 'fields': 'length', 'weighted': '1', 'budget_ms': '2000'}
+        body = json.loads(self.client.get('/solve', query_string=query).data)
+        self.assertEqual(list(body), ['v', 'length', 'weighted'])
+        search_id, cost, moves, proven_optimal = body['weighted']
+        followup = self.client.get(f'/search/{search_id}').get_json()
+        self.assertEqual(followup['kind'], 'weighted')
+        if proven_optimal:
+            self.assertEqual([cost, moves], [followup['weighted']['cost'], followup['weighted']['solution_string']])
+
+        response = self.client.get('/solve', query_string={**query, 'weighted': '0', 'fields': 'length,weighted'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/solve_batch', json={'scrambles': ['R'], 'format': 'compact', 'fields': ['xcross']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_and_solve_share_the_cache(self):
+        fields = 'length,best,solutions,verified'
+        scramble = "F2 D' L B2 R"
+        batch = json.loads(self.client.post(
+            '/solve_batch', json={'scrambles': [scramble, 'R Q'], 'format': 'compact', 'fields': fields.split(',')}
+        ).data)
+        self.assertIn('error', batch['results'][1])
+        cached = json.loads(self.client.get('/solve', query_string={'scramble': scramble, 'format': 'compact', 'fields': fields}).data)
+        self.assertEqual(cached, batch['results'][0])
+        self.assertIs(cached['verified'], True)
+
+        web_server.compact_cache = web_server.FragmentCache()
+        cold = json.loads(self.client.get('/solve', query_string={'scramble': scramble, 'format': 'compact', 'fields': fields}).data)
+        self.assertEqual(cold, cached)
+
+
+class TestTableBuilds(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        web_server.compact_cache = web_server.FragmentCache()
+        patch = mock.patch.dict(web_server.table_builds)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_request_waits_for_tables_only_within_budget(self):
+        done = threading.Event()
+        self.addCleanup(done.set)
+        with mock.patch.object(web_server, 'base_table_loads', return_value={'slow': lambda: done.wait(10)}):
+            query = {'scramble': "R U F'", 'budget_ms': 50}
+            response = self.client.get('/solve', query_string=query)
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.get_json()['building'], ['slow'])
+            self.assertEqual(response.headers['Retry-After'], str(web_server.TABLE_RETRY_AFTER))
+
+            done.set()
+            web_server.table_builds['slow'].join()
+            self.assertEqual(self.client.get('/solve', query_string=query).status_code, 200)
+
+
+class TestGzip(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_threshold_and_negotiation(self):
+        query = {'scramble': "R U F' L2 D B"}
+        plain = self.client.get('/solve', query_string=query)
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertIn('Accept-Encoding', plain.headers['Vary'])
+        size = len(plain.data)  # varies by a few bytes with search_time
+
+        with mock.patch.object(web_server, 'GZIP_MIN_BYTES', size + 100):
+            below = self.client.get('/solve', query_string=query, headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', below.headers)
+
+        with mock.patch.object(web_server, 'GZIP_MIN_BYTES', size - 100):
+            zipped = self.client.get('/solve', query_string=query, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(zipped.headers['Content-Encoding'], 'gzip')
+        self.assertLess(len(zipped.data), size - 100)
+        self.assertEqual(json.loads(gzip.decompress(zipped.data))['best_length'], plain.get_json()['best_length'])
+
+    def test_only_json_is_compressed(self):
+        response = self.client.get('/render', query_string={'scramble': 'R U', 'size': 64}, headers={'Accept-Encoding': 'gzip'})
+        self.assertGreaterEqual(len(response.data), web_server.GZIP_MIN_BYTES)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from ai.bfs_solver import BFSSolver
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import normalize_orientation
+from ai.weighted_search import MoveCosts, find_weighted_cross_solutions, parse_costs
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+_SCRAMBLE = "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R".split()
+
+
+def _scrambled(moves=_SCRAMBLE):
+    cube = CubeState.solved()
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _cross_done(cube, moves, face):
+    cube = cube.copy()
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return CubeAIState.from_cube_state(normalize_orientation(cube)[0]).is_cross_solved(face)
+
+
+class TestWeightedSearch(unittest.TestCase):
+    def test_unit_costs_give_optimal_length(self):
+        cube = _scrambled()
+        for sol in find_weighted_cross_solutions(cube, MoveCosts()):
+            optimal = BFSSolver(target_center_face=sol.face).solve_cross(cube)
+            self.assertEqual(sol.cost, len(optimal))
+            self.assertTrue(_cross_done(cube, sol.moves, sol.face))
+
+    def test_expensive_face_is_avoided(self):
+        cube = _scrambled()
+        costs = MoveCosts(moves={'B': 50.0})
+        for sol in find_weighted_cross_solutions(cube, costs):
+            self.assertNotIn('B', [mv[0] for mv in sol.moves])
+            self.assertTrue(_cross_done(cube, sol.moves, sol.face))
+
+    def test_costs_follow_the_cube_as_held(self):
+        cube = _scrambled(_SCRAMBLE + ['x'])
+        costs = MoveCosts(moves={'B': 50.0})
+        results = find_weighted_cross_solutions(cube, costs)
+        self.assertEqual(len(results), 6)
+        for sol in results:
+            self.assertNotIn('B', [mv[0] for mv in sol.moves])
+            self.assertTrue(_cross_done(cube, sol.moves, sol.face))
+        self.assertEqual([s.cost for s in results], sorted(s.cost for s in results))
+
+    def test_transition_cost_is_charged(self):
+        costs = MoveCosts(transitions={('R', 'F'): 0.5})
+        cube = _scrambled(["F'", "R'"])
+        best = find_weighted_cross_solutions(cube, costs, faces=[1])[0]
+        self.assertEqual(best.moves, ('R', 'F'))
+        self.assertEqual(best.cost, 2.5)
+
+    def test_parse_costs(self):
+        costs = parse_costs("B=3, D'=1.6 R>F=0.5", base=MoveCosts())
+        self.assertEqual(costs.move_cost('B2'), 3.0)
+        self.assertEqual(costs.move_cost("D'"), 1.6)
+        self.assertEqual(costs.move_cost('D'), 1.0)
+        self.assertEqual(costs.transition_cost("R'", 'F2'), 0.5)
+        self.assertEqual(parse_costs('U=0.7').move_cost('U'), 0.7)
+        for bad in ('Q=1', 'B', 'B=x', 'B=0', 'R>F=-1', 'B=nan', 'B=inf', 'R>F=inf', 'U=0.2'):
+            with self.assertRaises(ValueError):
+                parse_costs(bad)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from ai.cube_ai_state import CubeAIState
+from ai.orientation import normalize_orientation
+from ai.xcross_solver import XCrossSolver, find_best_xcross_solutions, slots_for_face
+from core.constants import (
+    CORNER_STICKER_POSITIONS,
+    EDGE_FR,
+    EDGE_STICKER_POSITIONS,
+    EDGE_UB,
+    FACE_D,
+    FACE_L,
+    FACE_U,
+)
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _xcross_solved(cube, face, slot):
+    faces = {f for f, _, _ in EDGE_STICKER_POSITIONS[slot]} | {face}
+    corner = next(c for c, coords in CORNER_STICKER_POSITIONS.items() if {f for f, _, _ in coords} == faces)
+    ai = CubeAIState.from_cube_state(normalize_orientation(cube)[0])
+    return (
+        ai.is_cross_solved(face)
+        and ai.corner_permutation[corner] == corner
+        and ai.corner_orientation[corner] == 0
+        and ai.edge_permutation[slot] == slot
+        and ai.edge_orientation[slot] == 0
+    )
+
+
+_SCRAMBLE = "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R".split()
+
+
+class TestXCrossSolver(unittest.TestCase):
+    def test_slots(self):
+        self.assertEqual(len(slots_for_face(FACE_D)), 4)
+        self.assertIn(EDGE_FR, slots_for_face(FACE_U))
+        self.assertIn(EDGE_UB, slots_for_face(FACE_L))
+        with self.assertRaises(ValueError):
+            XCrossSolver(FACE_D, EDGE_UB)
+
+    def test_inverse_of_short_scramble_is_optimal(self):
+        cube = _apply(CubeState.solved(), ['R', 'U', "R'"])
+        solution = XCrossSolver(FACE_D, EDGE_FR).solve_xcross(cube)
+        self.assertEqual(len(solution), 3)
+        self.assertTrue(_xcross_solved(_apply(cube, solution), FACE_D, EDGE_FR))
+
+    def test_every_slot_of_a_face(self):
+        cube = _apply(CubeState.solved(), _SCRAMBLE)
+        for slot in slots_for_face(FACE_L):
+            solution = XCrossSolver(FACE_L, slot).solve_xcross(cube)
+            self.assertTrue(_xcross_solved(_apply(cube.copy(), solution), FACE_L, slot))
+
+    def test_best_over_all_faces(self):
+        cube = _apply(CubeState.solved(), _SCRAMBLE + ['y', 'M'])
+        best_len, solutions = find_best_xcross_solutions(cube)
+        self.assertTrue(solutions)
+        for sol in solutions:
+            self.assertEqual(len(sol.moves), best_len)
+            self.assertTrue(_xcross_solved(_apply(cube.copy(), sol.moves), sol.face, sol.slot))
+
+        fixed = XCrossSolver(FACE_D, EDGE_FR).solve_xcross(cube)
+        self.assertLessEqual(best_len, len(fixed))
+
+    def test_max_depth(self):
+        cube = _apply(CubeState.solved(), _SCRAMBLE)
+        self.assertIsNone(XCrossSolver(FACE_D, EDGE_FR).solve_xcross(cube, max_depth=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from ai.orientation import center_colors, reframe, rotations
+from ai.zz_solver import EOCROSS, EOLINE, find_zz_solutions, zz_table
+from conversion.cube_to_ai import cube_to_ai_arrays
+from core.constants import EDGE_DB, EDGE_DF, EDGE_DL, EDGE_DR, EDGE_LF, EDGE_RB, FACE_D, FACE_F
+from core.cube_state import CubeState
+from core.move_engine import CubeMoveEngine
+
+
+def _apply(cube, moves):
+    CubeMoveEngine(cube).apply_sequence(list(moves))
+    return cube
+
+
+def _zz_step_done(cube, step):
+    """EO on the F/B axis plus the line / cross, checked on the cube as held."""
+    identity = rotations()[0]
+    _, _, ep, eo = cube_to_ai_arrays(reframe(cube, identity))
+    relabel = {EDGE_RB, EDGE_LF}
+    fb_eo = [int(eo[pos]) ^ (int(ep[pos]) in relabel) ^ (pos in relabel) for pos in range(12)]
+    placed = (EDGE_DF, EDGE_DB) if step == EOLINE else (EDGE_DF, EDGE_DR, EDGE_DB, EDGE_DL)
+    return not any(fb_eo) and all(int(ep[pos]) == pos for pos in placed)
+
+
+_SCRAMBLE = "D2 F' R2 U L2 B' R D' F2 U2 L B2 R' U' F D2 L' B U2 R".split()
+
+
+class TestZZSolver(unittest.TestCase):
+    def test_solved_cube_needs_no_moves(self):
+        for step in (EOLINE, EOCROSS):
+            best = find_zz_solutions(CubeState.solved(), step)[0]
+            self.assertEqual((best.rotation, best.moves), ((), ()))
+
+    def test_single_f_turn_breaks_eo(self):
+        cube = _apply(CubeState.solved(), ['F'])
+        self.assertEqual(zz_table(EOLINE).solve(cube), ["F'"])
+
+    def test_every_orientation_is_solved(self):
+        cube = _apply(CubeState.solved(), _SCRAMBLE)
+        for step in (EOLINE, EOCROSS):
+            results = find_zz_solutions(cube, step)
+            self.assertEqual(len(results), 24)
+            for sol in results:
+                held = _apply(cube.copy(), sol.sequence)
+                self.assertTrue(_zz_step_done(held, step), (step, sol))
+                self.assertEqual(center_colors(held)[FACE_D], sol.bottom_color)
+                self.assertEqual(center_colors(held)[FACE_F], sol.front_color)
+            costs = [sol.cost for sol in results]
+            self.assertEqual(costs, sorted(costs))
+
+    def test_eocross_is_never_shorter_than_eoline(self):
+        cube = _apply(CubeState.solved(), _SCRAMBLE)
+        line = {sol.rotation: sol.move_count for sol in find_zz_solutions(cube, EOLINE)}
+        for sol in find_zz_solutions(cube, EOCROSS):
+            self.assertGreaterEqual(sol.move_count, line[sol.rotation])
+
+    def test_batched_descent_matches_single(self):
+        table = zz_table(EOLINE)
+        cube = _apply(CubeState.solved(), _SCRAMBLE)
+        indices = [table.index(reframe(cube, rot)) for rot in rotations()[:6]]
+        self.assertEqual(table.solve_indices(indices), [table.solve_index(i) for i in indices])
+
+    def test_unknown_step(self):
+        with self.assertRaises(ValueError):
+            zz_table('eo222')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,26 @@ from __future__ import annotations
 
 import random
 
-from core.constants import MOVE_TOKENS
+import numpy as np
+
+from ai.batch_move_engine import NO_FACE, canonical_successors
+from ai.bfs_solver import cross_distance_table, cross_goal_index, cross_move_table
+from core.constants import FACE_B, FACE_D, FACE_F, FACE_L, FACE_R, FACE_U, MOVE_TOKENS
+
+
+_OPPOSITE_FACE = {'R': 'L', 'L': 'R', 'U': 'D', 'D': 'U', 'F': 'B', 'B': 'F'}
+_QUARTERS_BY_SUFFIX = {'': 1, '2': 2, "'": 3}
+_SUFFIX_BY_QUARTERS = {1: '', 2: '2', 3: "'"}
+_MOVE_INDEX = {mv: k for k, mv in enumerate(MOVE_TOKENS)}
+_MOVE_FACE = np.array([k // 3 for k in range(len(MOVE_TOKENS))], dtype=np.int8)  # R L U D F B
+_CROSS_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+
+_INVERSE_MOVE = np.array([k + (1, -1, 0)[k % 3] for k in range(len(MOVE_TOKENS))], dtype=np.int64)
+_NO_MOVE = -1  # padding in move-index rows
+_CN_BATCH = 4096  # most color-neutral attempts tried together (batches start at 16 and double)
+
+# Per-face cross indices grouped by optimal length, filled lazily.
+_INDICES_BY_LENGTH: dict[int, dict[int, np.ndarray]] = {}
 
 
 def generate_scramble(length: int = 20, rng: random.Random | None = None) -> list[str]:
@@ -18,3 +37,227 @@ def generate_scramble(length: int = 20, rng: random.Random | None = None) -> lis
         scramble.append(token)
         last_face_group = face_group
     return scramble
+
+
+def _build_canonical_successors() -> tuple[np.ndarray, np.ndarray]:
+    """`canonical_successors` as a padded array plus counts, for drawing whole columns."""
+    successors = np.zeros((NO_FACE + 1, len(MOVE_TOKENS)), dtype=np.int8)
+    counts = np.zeros(NO_FACE + 1, dtype=np.int64)
+    for prev, allowed in enumerate(canonical_successors(range(len(MOVE_TOKENS)))):
+        successors[prev, : len(allowed)] = allowed
+        counts[prev] = len(allowed)
+    return successors, counts
+
+
+_SUCCESSORS, _SUCCESSOR_COUNTS = _build_canonical_successors()
+
+
+def scramble_streams(seed: int | None, count: int) -> list[np.random.Generator]:
+    """Independent, reproducible generators for ``count`` parallel workers."""
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(count)]
+
+
+def generate_scramble_batch(
+    count: int,
+    length: int = 20,
+    rng: np.random.Generator | int | None = None,
+) -> np.ndarray:
+    """``count`` canonical random scrambles as a (count, length) array of move indices.
+
+    Indices refer to `MOVE_TOKENS`, so the result feeds
+    `BatchMoveEngine.apply_sequences` directly. Each column is drawn for the
+    whole batch in one step, uniformly among the moves allowed after the
+    previous face.
+    """
+    rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+    moves = np.empty((count, length), dtype=np.int8)
+    prev = np.full(count, len(_SUCCESSOR_COUNTS) - 1, dtype=np.int64)
+    for col in range(length):
+        choice = rng.integers(0, _SUCCESSOR_COUNTS[prev])
+        moves[:, col] = _SUCCESSORS[prev, choice]
+        prev = _MOVE_FACE[moves[:, col]]
+    return moves
+
+
+def scramble_tokens(moves: np.ndarray) -> list[list[str]]:
+    """Move-index rows back to token lists (for display and the sticker engine)."""
+    return [[MOVE_TOKENS[k] for k in row] for row in np.atleast_2d(moves).tolist()]
+
+
+def invert_moves(moves: list[str]) -> list[str]:
+    """Inverse of a face-turn sequence: reversed, with every turn undone."""
+    inverse: list[str] = []
+    for mv in reversed(moves):
+        face, suffix = mv[0], mv[1:]
+        inverse.append(face + _SUFFIX_BY_QUARTERS[(4 - _QUARTERS_BY_SUFFIX[suffix]) % 4])
+    return inverse
+
+
+def simplify_moves(moves: list[str]) -> list[str]:
+    """Merge and cancel adjacent turns of the same face.
+
+    Turns of the opposite face commute, so ``R L R'`` collapses to ``L``.
+    """
+    out: list[str] = []
+    for mv in moves:
+        face, quarters = mv[0], _QUARTERS_BY_SUFFIX[mv[1:]]
+        slot = None
+        if out and out[-1][0] == face:
+            slot = len(out) - 1
+        elif len(out) >= 2 and out[-1][0] == _OPPOSITE_FACE[face] and out[-2][0] == face:
+            slot = len(out) - 2
+        if slot is None:
+            out.append(mv)
+            continue
+        total = (_QUARTERS_BY_SUFFIX[out[slot][1:]] + quarters) % 4
+        if total == 0:
+            del out[slot]
+        else:
+            out[slot] = face + _SUFFIX_BY_QUARTERS[total]
+    return out
+
+
+def _indices_at_length(face: int, length: int) -> np.ndarray:
+    by_length = _INDICES_BY_LENGTH.get(face)
+    if by_length is None:
+        dist = cross_distance_table(face)
+        by_length = {int(d): np.flatnonzero(dist == d) for d in np.unique(dist) if d >= 0}
+        _INDICES_BY_LENGTH[face] = by_length
+    return by_length.get(length, np.empty(0, dtype=np.int64))
+
+
+def _walk_to_goal(idx: int, dist, moves) -> list[str]:
+    # Greedy descent along the distance table, like BFSSolver.solve_cross.
+    path: list[str] = []
+    n_moves = len(MOVE_TOKENS)
+    d = dist[idx]
+    while d > 0:
+        for k in range(n_moves):
+            nxt = moves[idx * n_moves + k]
+            if dist[nxt] == d - 1:
+                path.append(MOVE_TOKENS[k])
+                idx, d = nxt, d - 1
+                break
+    return path
+
+
+def _cross_index_after(moves_flat, start: int, scramble: list[str]) -> int:
+    n_moves = len(MOVE_TOKENS)
+    idx = start
+    for mv in scramble:
+        idx = moves_flat[idx * n_moves + _MOVE_INDEX[mv]]
+    return idx
+
+
+def generate_cross_scramble(
+    cross_length: int,
+    face: int | None = None,
+    rng: random.Random | None = None,
+    random_moves: int = 25,
+    max_attempts: int = 100_000,
+) -> list[str]:
+    """Scramble whose optimal cross is exactly ``cross_length`` moves.
+
+    With ``face`` set the target is that face's cross; with ``face=None`` it is
+    the color-neutral best over all six faces. A cross state at the requested
+    distance is drawn uniformly from the distance table, and the rest of the
+    cube is randomized by a random-move prefix whose own cross is then solved:
+
+        scramble = random_prefix + solve(prefix cross) + inverse(solve(target))
+
+    so the cross is exactly the drawn state while the other pieces are only as
+    random as a ``random_moves``-move walk (close to uniform at the default 25,
+    not exactly). Everything is table lookups; no search is performed.
+
+    Color-neutral attempts are tried in batches of up to `_CN_BATCH`, so even
+    length 7 (about 1 in 4000 random cubes) takes under 0.1 s. Length 8
+    has not been seen as a color-neutral best in millions of random states;
+    it raises ValueError once ``max_attempts`` attempts have failed.
+    """
+    rng = rng or random.Random()
+    faces = _CROSS_FACES if face is None else (face,)
+    for f in faces:
+        cross_goal_index(f)  # validates the face id
+        if len(_indices_at_length(f, cross_length)) == 0:
+            raise ValueError(f'no cross state at length {cross_length}')
+    if face is None:
+        return _color_neutral_scramble(cross_length, rng, random_moves, max_attempts)
+
+    moves_flat = memoryview(cross_move_table()).cast('B').cast('i')
+    dist = cross_distance_table(face)
+    candidates = _indices_at_length(face, cross_length)
+    target = int(candidates[rng.randrange(len(candidates))])
+    prefix = generate_scramble(random_moves, rng)
+    reached = _cross_index_after(moves_flat, cross_goal_index(face), prefix)
+    return simplify_moves(
+        prefix + _walk_to_goal(reached, dist, moves_flat) + invert_moves(_walk_to_goal(target, dist, moves_flat))
+    )
+
+
+def _apply_rows(table: np.ndarray, idx: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """Cross indices after each row of move indices (`_NO_MOVE` entries are skipped)."""
+    for col in range(moves.shape[1]):
+        m = moves[:, col]
+        if idx.ndim == 2:
+            m = m[:, None]
+        idx = np.where(m >= 0, table[idx, np.maximum(m, 0)], idx)
+    return idx
+
+
+def _descend_rows(table: np.ndarray, dist: np.ndarray, faces: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Vectorized `_walk_to_goal`: one greedy path per row, padded with `_NO_MOVE`."""
+    rows = np.arange(len(idx))
+    path = np.full((len(idx), int(dist.max())), _NO_MOVE, dtype=np.int64)
+    for step in range(path.shape[1]):
+        d = dist[faces, idx]
+        active = d > 0
+        if not active.any():
+            break
+        nxt = table[idx]
+        k = np.argmax(dist[faces[:, None], nxt] == (d - 1)[:, None], axis=1)
+        path[active, step] = k[active]
+        idx = np.where(active, nxt[rows, k], idx)
+    return path
+
+
+def _color_neutral_scramble(cross_length: int, rng: random.Random, random_moves: int, max_attempts: int) -> list[str]:
+    table = cross_move_table()
+    dist = np.stack([cross_distance_table(f) for f in _CROSS_FACES])
+    goals = np.array([cross_goal_index(f) for f in _CROSS_FACES], dtype=np.int64)
+    candidates = [_indices_at_length(f, cross_length) for f in _CROSS_FACES]
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+
+    attempts, batch = 0, 16
+    while attempts < max_attempts:
+        batch = min(batch * 2, _CN_BATCH, max_attempts - attempts)
+        attempts += batch
+        faces = np_rng.integers(0, len(_CROSS_FACES), batch)
+        targets = np.array([candidates[f][np_rng.integers(len(candidates[f]))] for f in faces], dtype=np.int64)
+        prefix = generate_scramble_batch(batch, random_moves, np_rng).astype(np.int64)
+        reached = _apply_rows(table, goals[faces], prefix)
+        back = _descend_rows(table, dist, faces, targets)[:, ::-1]
+        moves = np.concatenate(
+            [prefix, _descend_rows(table, dist, faces, reached), np.where(back >= 0, _INVERSE_MOVE[back], _NO_MOVE)],
+            axis=1,
+        )
+
+        # Every other face must be at least as long, and a state with k tied
+        # best faces is reachable from k targets, so keep it with 1/k.
+        lengths = dist[np.arange(len(_CROSS_FACES)), _apply_rows(table, np.tile(goals, (batch, 1)), moves)]
+        ties = (lengths == cross_length).sum(axis=1)
+        keep = (lengths.min(axis=1) == cross_length) & (np_rng.random(batch) * ties < 1)
+        if keep.any():
+            row = moves[np.argmax(keep)]
+            return simplify_moves([MOVE_TOKENS[k] for k in row if k >= 0])
+
+    raise ValueError(f'no color-neutral scramble of cross length {cross_length} after {max_attempts} attempts')
+
+
+def generate_cross_scrambles(
+    count: int,
+    cross_length: int,
+    face: int | None = None,
+    rng: random.Random | None = None,
+) -> list[list[str]]:
+    rng = rng or random.Random()
+    return [generate_cross_scramble(cross_length, face=face, rng=rng) for _ in range(count)]
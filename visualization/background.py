@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass(frozen=True)
+class Job:
+    job_id: int
+    future: Future
+
+
+class LatestJobRunner:
+    """Runs jobs one at a time in a daemon worker thread; only the newest job matters.
+
+    `submit` cancels jobs still waiting to start and makes every older job
+    stale, so a result that arrives late can be dropped with `is_current`.
+    Jobs receive a ``stale()`` callable they may poll to give up early.
+    Nothing here touches the GUI: the Tk side polls `Job.future` from its
+    event loop with ``root.after``. The thread is a daemon so closing the
+    window never waits for a table build.
+    """
+
+    def __init__(self, name: str = 'worker'):
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.RLock()
+        self._latest = 0
+        self._pending: list[Future] = []
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:  # handed to the GUI thread through the future
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _enqueue(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Future:
+        future: Future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Job:
+        """Queue ``fn(*args, stale=...)``, superseding every earlier job."""
+        with self._lock:
+            self.cancel()
+            job_id = self._latest
+            future = self._enqueue(fn, args, {'stale': lambda: self._latest != job_id})
+            self._pending = [future]
+        return Job(job_id, future)
+
+    def cancel(self) -> None:
+        """Make every submitted job stale, cancelling those not yet started."""
+        with self._lock:
+            self._latest += 1
+            for future in self._pending:
+                future.cancel()
+            self._pending = []
+
+    def is_current(self, job: Job) -> bool:
+        return job.job_id == self._latest
+
+    def run_in_background(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue ``fn(*args)`` without superseding anything (e.g. table warmup)."""
+        return self._enqueue(fn, args, {})
+
+
+def poll_future(
+    schedule: Callable[[int, Callable[[], None]], Any],
+    future: Future,
+    on_done: Callable[[Future], None],
+    interval_ms: int = 30,
+    on_wait: Optional[Callable[[], None]] = None,
+) -> None:
+    """Call ``on_done(future)`` from the GUI thread once ``future`` finishes.
+
+    ``schedule`` is ``root.after``; ``on_wait`` runs on every poll before
+    that, e.g. to advance a progress bar. Cancelled futures are dropped.
+    """
+
+    def check() -> None:
+        if future.cancelled():
+            return
+        if future.done():
+            on_done(future)
+            return
+        if on_wait is not None:
+            on_wait()
+        schedule(interval_ms, check)
+
+    check()
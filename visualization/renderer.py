@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import struct
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from conversion.packing import cube_from_key, state_key
 from core.constants import COLOR_LETTER_TO_CODE
 from core.cube_state import CubeState
 
@@ -29,3 +36,103 @@ def render_cube_flat(cube: CubeState) -> str:
             lines[-1] = prefix + lines[-1].lstrip()
     lines.append('')
     return '\n'.join(lines)
+
+
+# Net layout shared by the image renderers: U on top, then L F R B, then D
+# (as in `render_cube_flat` and the Tk visualizer), in face-block units.
+_NET_BLOCKS = {0: (1, 0), 4: (0, 1), 2: (1, 1), 5: (2, 1), 3: (3, 1), 1: (1, 2)}
+_FILL_BY_CODE = {
+    1: (0xFF, 0xFF, 0xFF),  # white
+    2: (0xFF, 0xD5, 0x00),  # yellow
+    3: (0x00, 0x9B, 0x48),  # green
+    4: (0x00, 0x46, 0xAD),  # blue
+    5: (0xFF, 0x58, 0x00),  # orange
+    6: (0xB7, 0x12, 0x34),  # red
+}
+_UNKNOWN_FILL = (0x80, 0x80, 0x80)
+RENDER_FORMATS = ('svg', 'png')
+
+
+def _net_geometry(sticker: int) -> tuple[int, int, int, list[tuple[int, int]]]:
+    """(margin, width, height, top-left of every sticker in stickers.reshape(-1) order)."""
+    margin = max(2, sticker // 2)
+    block = 3 * sticker + margin
+    corners = [(0, 0)] * 54
+    for face, (bx, by) in _NET_BLOCKS.items():
+        for r in range(3):
+            for c in range(3):
+                corners[face * 9 + r * 3 + c] = (margin + bx * block + c * sticker, margin + by * block + r * sticker)
+    return margin, 4 * block + margin, 3 * block + margin, corners
+
+
+@lru_cache(maxsize=16)
+def _svg_template(sticker: int) -> str:
+    """The whole SVG with one ``%s`` per sticker fill, so rendering is one string fill."""
+    _, width, height, corners = _net_geometry(sticker)
+    rects = ''.join(
+        f'<rect x="{x}" y="{y}" width="{sticker}" height="{sticker}" fill="%s"/>' for x, y in corners
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<g stroke="#000" stroke-width="1">{rects}</g></svg>'
+    )
+
+
+_HEX_BY_CODE = {code: '#%02x%02x%02x' % rgb for code, rgb in _FILL_BY_CODE.items()}
+
+
+def render_cube_svg(cube: CubeState, sticker: int = 20) -> str:
+    """Flat net of ``cube`` as an SVG document, ``sticker`` pixels per sticker."""
+    unknown = '#%02x%02x%02x' % _UNKNOWN_FILL
+    return _svg_template(sticker) % tuple(_HEX_BY_CODE.get(int(v), unknown) for v in cube.stickers.reshape(-1))
+
+
+@lru_cache(maxsize=16)
+def _png_labels(sticker: int) -> np.ndarray:
+    """Pixel -> sticker index (0-53), 54 for sticker borders and 55 for the background."""
+    _, width, height, corners = _net_geometry(sticker)
+    labels = np.full((height, width), 55, dtype=np.uint8)
+    for index, (x, y) in enumerate(corners):
+        labels[y:y + sticker + 1, x:x + sticker + 1] = 54
+        labels[y + 1:y + sticker, x + 1:x + sticker] = index
+    labels.flags.writeable = False
+    return labels
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def render_cube_png(cube: CubeState, sticker: int = 20) -> bytes:
+    """Flat net of ``cube`` as PNG bytes (8-bit RGB), without an imaging library."""
+    palette = np.array(
+        [_FILL_BY_CODE.get(int(v), _UNKNOWN_FILL) for v in cube.stickers.reshape(-1)] + [(0, 0, 0), (0xFF, 0xFF, 0xFF)],
+        dtype=np.uint8,
+    )
+    pixels = palette[_png_labels(sticker)]
+    height, width = pixels.shape[:2]
+    rows = np.concatenate([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, -1)], axis=1)  # filter 0
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + _png_chunk(b'IHDR', header)
+        + _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), 6))
+        + _png_chunk(b'IEND', b'')
+    )
+
+
+@lru_cache(maxsize=1024)
+def _cached_render(key: int, fmt: str, sticker: int) -> bytes:
+    cube = cube_from_key(key)
+    if fmt == 'svg':
+        return render_cube_svg(cube, sticker).encode('utf-8')
+    return render_cube_png(cube, sticker)
+
+
+def render_cube_image(cube: CubeState, fmt: str = 'svg', sticker: int = 20) -> bytes:
+    """SVG or PNG bytes for ``cube``; the last 1024 distinct renders are cached by state."""
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"unknown image format: {fmt!r} (expected one of {', '.join(RENDER_FORMATS)})")
+    if not 4 <= sticker <= 64:
+        raise ValueError('sticker size must be between 4 and 64 pixels')
+    return _cached_render(state_key(cube), fmt, sticker)
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import time
 import tkinter as tk
+from collections import deque
+from concurrent.futures import Future
 from tkinter import ttk
+from typing import Callable, Optional
 
-from ai.cube_ai_state import CubeAIState
-from core.constants import DEFAULT_FACE_COLOR, FACE_NAMES
+import numpy as np
+
+from ai.bfs_solver import BFSSolver, cross_distance_table, cross_move_table
+from ai.live_session import CrossSession
+from core.constants import DEFAULT_FACE_COLOR, FACE_B, FACE_D, FACE_F, FACE_L, FACE_NAMES, FACE_R, FACE_U, MOVE_TOKENS
 from core.cube_state import CubeState
 from core.move_engine import CubeMoveEngine
 from utils.scramble import generate_scramble
+from visualization.background import Job, LatestJobRunner, poll_future
 
 
 _COLOR_CODE_TO_TK = {
@@ -35,6 +43,36 @@ def _face_label(face: int) -> str:
     return f"{face_letter}({_COLOR_NAME_BY_CODE.get(color_code, str(color_code))})"
 
 
+_CROSS_FACES = (FACE_U, FACE_D, FACE_F, FACE_B, FACE_L, FACE_R)
+
+_FACE_TURNS = frozenset(MOVE_TOKENS)
+
+PLAYBACK_FPS = 30
+PLAYBACK_FRAMES_PER_MOVE = 9  # the turning stickers are highlighted for all but the last frame
+
+
+def _solve_crosses(
+    cube: CubeState, stale: Callable[[], bool]
+) -> Optional[tuple[Optional[int], list[tuple[int, list[str]]]]]:
+    """Shortest crosses over all faces, like `CubeAIState.find_best_cross_solutions`.
+
+    Runs on the worker thread; returns None as soon as a newer job makes this one stale.
+    """
+    best_len: Optional[int] = None
+    best: list[tuple[int, list[str]]] = []
+    for face in _CROSS_FACES:
+        if stale():
+            return None
+        solution = BFSSolver(target_center_face=face).solve_cross(cube)
+        if solution is None:
+            continue
+        if best_len is None or len(solution) < best_len:
+            best_len, best = len(solution), [(face, solution)]
+        elif len(solution) == best_len:
+            best.append((face, solution))
+    return best_len, best
+
+
 def _parse_moves(text: str) -> list[str]:
     text = (text or '').replace(',', ' ').strip()
     if not text:
@@ -52,8 +90,19 @@ class CubeVisualizerApp:
 
         self.sticker_size = 26
         self.margin = 12
+        self._worker = LatestJobRunner('cross-worker')
+        self._cross_job: Optional[Job] = None
+        self._tables_ready = 0  # faces whose cross table is loaded; written by the worker
+        self._sticker_items: dict[tuple[int, int, int], int] = {}
+        self._drawn = np.zeros((6, 3, 3), dtype=np.int8)  # colors currently on the canvas; 0 = none
+        self._solution: list[str] = []  # best cross from the last computation, for playback
+        self._playback: deque[str] = deque()
+        self._playback_after: Optional[str] = None
+        self._session: Optional[CrossSession] = None  # live cross coordinates, once the tables are loaded
         self._build_ui()
         self._redraw()
+        self.root.protocol('WM_DELETE_WINDOW', self._on_close)
+        self._start_table_warmup()
 
     def _build_ui(self) -> None:
         outer = ttk.Frame(self.root, padding=10)
@@ -68,6 +117,7 @@ class CubeVisualizerApp:
         canvas_w, canvas_h = self._canvas_size()
         self.canvas = tk.Canvas(outer, width=canvas_w, height=canvas_h, highlightthickness=1)
         self.canvas.grid(row=0, column=0, sticky='nsew', padx=(0, 10))
+        self._create_stickers()
 
         controls = ttk.Frame(outer)
         controls.grid(row=0, column=1, sticky='ns')
@@ -108,15 +158,28 @@ class CubeVisualizerApp:
         ttk.Button(cross_frame, text='Compute', command=self.compute_cross).grid(
             row=0, column=0, sticky='ew', padx=5, pady=5
         )
+        ttk.Button(cross_frame, text='Play', command=self.play_solution).grid(
+            row=0, column=1, sticky='ew', padx=5, pady=5
+        )
 
         self.cross_text = tk.Text(cross_frame, width=40, height=12, wrap='word')
-        self.cross_text.grid(row=1, column=0, sticky='nsew', padx=5, pady=(0, 5))
+        self.cross_text.grid(row=1, column=0, columnspan=2, sticky='nsew', padx=5, pady=(0, 5))
         self.cross_text.configure(state='disabled')
 
         self.status_var = tk.StringVar(value='Ready')
         status = ttk.Label(controls, textvariable=self.status_var)
         status.grid(row=3, column=0, sticky='ew', pady=(10, 0))
 
+        self.progress = ttk.Progressbar(controls, mode='determinate', maximum=len(_CROSS_FACES))
+        self.progress.grid(row=4, column=0, sticky='ew', pady=(5, 0))
+
+        distance_frame = ttk.LabelFrame(controls, text='Cross Length (live)')
+        distance_frame.grid(row=5, column=0, sticky='ew', pady=(10, 0))
+        self.distance_var = tk.StringVar(value='Loading tables...')
+        ttk.Label(distance_frame, textvariable=self.distance_var, font=('TkFixedFont',)).grid(
+            row=0, column=0, sticky='w', padx=5, pady=5
+        )
+
     def _supported_move_tokens(self) -> list[str]:
         # Keep this list in sync with CubeMoveEngine.apply().
         return [
@@ -166,21 +229,32 @@ class CubeVisualizerApp:
             1: (x0 + (face + m), y0 + 2 * (face + m)),  # D
         }
 
-    def _redraw(self) -> None:
-        self.canvas.delete('all')
+    def _create_stickers(self) -> None:
+        """Create the 54 sticker rectangles once; `_redraw` only recolors them."""
         pos = self._face_top_left()
         s = self.sticker_size
 
         for face_id, (fx, fy) in pos.items():
             for r in range(3):
                 for c in range(3):
-                    code = int(self.cube.stickers[face_id, r, c])
-                    color = _COLOR_CODE_TO_TK.get(code, 'gray')
                     x1 = fx + c * s
                     y1 = fy + r * s
                     x2 = x1 + s
                     y2 = y1 + s
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='black')
+                    self._sticker_items[face_id, r, c] = self.canvas.create_rectangle(
+                        x1, y1, x2, y2, fill='gray', outline='black'
+                    )
+
+    def _redraw(self) -> None:
+        """Recolor the stickers whose color differs from what is on the canvas."""
+        for face_id, r, c in np.argwhere(self.cube.stickers != self._drawn):
+            code = int(self.cube.stickers[face_id, r, c])
+            self.canvas.itemconfigure(self._sticker_items[face_id, r, c], fill=_COLOR_CODE_TO_TK.get(code, 'gray'))
+        self._drawn = self.cube.stickers.copy()
+
+    def _highlight(self, cells: np.ndarray, on: bool) -> None:
+        for face_id, r, c in cells:
+            self.canvas.itemconfigure(self._sticker_items[face_id, r, c], width=3 if on else 1)
 
     def _set_cross_text(self, text: str) -> None:
         self.cross_text.configure(state='normal')
@@ -188,30 +262,67 @@ class CubeVisualizerApp:
         self.cross_text.insert('1.0', text)
         self.cross_text.configure(state='disabled')
 
+    def _track(self, tokens: list[str]) -> None:
+        """Update the live cross lengths after ``tokens`` were applied to the cube.
+
+        Face turns are table lookups on the session; rotations, slices and wide
+        moves move the centers, so the session is re-read from the cube.
+        """
+        if self._session is None:
+            return
+        if not all(t in _FACE_TURNS for t in tokens):
+            self._resync()
+            return
+        self._session.apply(tokens)
+        self._show_distances()
+
+    def _resync(self) -> None:
+        """Re-read the live cross coordinates from the cube."""
+        self._session = CrossSession(self.cube)
+        self._show_distances()
+
+    def _show_distances(self) -> None:
+        distances = self._session.distances()
+        best = min(distances.values())
+        self.distance_var.set('\n'.join(
+            f"{_face_label(face):10s} {distances[face]}{' *' if distances[face] == best else ''}"
+            for face in _CROSS_FACES
+        ))
+
     def apply_move(self, token: str) -> None:
+        self.stop_playback()
         try:
             self.engine.apply(token)
         except Exception as e:
             self.status_var.set(f'Invalid move: {token} ({e})')
             return
+        self._solution = []  # it was for the previous cube; the new one comes with compute_cross
         self.status_var.set(f'Applied move: {token}')
         self._redraw()
+        self._track([token])
+        self.compute_cross()
 
     def apply_scramble(self) -> None:
+        self.stop_playback()
         tokens = _parse_moves(self.scramble_var.get())
         if not tokens:
             self.status_var.set('No scramble input')
             return
 
+        self._solution = []
         try:
             for t in tokens:
                 self.engine.apply(t)
         except Exception as e:
             self.status_var.set(f'Scramble error: {e}')
+            self._redraw()
+            if self._session is not None:
+                self._resync()  # the scramble was partly applied
             return
 
         self.status_var.set(f'Applied scramble ({len(tokens)} moves)')
         self._redraw()
+        self._track(tokens)
         self.compute_cross()
 
     def apply_random_scramble_20(self) -> None:
@@ -221,33 +332,132 @@ class CubeVisualizerApp:
         self.apply_scramble()
 
     def _reset_cube_state(self) -> None:
+        self._solution = []
         self.cube = CubeState.solved()
         self.engine = CubeMoveEngine(self.cube)
         self._redraw()
+        if self._session is not None:
+            self._resync()
 
     def reset_cube(self) -> None:
+        self.stop_playback()
         self._reset_cube_state()
         self.scramble_var.set('')
         self.status_var.set('Reset to solved')
+        self._worker.cancel()
+        self._cross_job = None
         self._set_cross_text('')
 
+    def play_solution(self) -> None:
+        """Animate the best cross on the cube, one turn per `PLAYBACK_FRAMES_PER_MOVE` frames.
+
+        Frames are scheduled with ``root.after`` against a clock, so input is
+        handled between frames; any move, scramble or reset stops playback.
+        """
+        self.stop_playback()
+        if not self._solution:
+            self.status_var.set('Nothing to play: compute a cross first')
+            return
+        self._playback = deque(self._solution)
+        self._solution = []
+        self.status_var.set(f"Playing: {' '.join(self._playback)}")
+        self._play_move(time.monotonic())
+
+    def stop_playback(self) -> None:
+        if self._playback_after is not None:
+            self.root.after_cancel(self._playback_after)
+            self._playback_after = None
+        if self._playback:
+            self._playback.clear()
+            self.canvas.itemconfigure('all', width=1)
+
+    def _play_move(self, start: float) -> None:
+        token = self._playback[0]
+        preview = self.cube.copy()
+        CubeMoveEngine(preview).apply(token)
+        cells = np.argwhere(preview.stickers != self.cube.stickers)
+        self._play_frame(start, token, cells, 0)
+
+    def _play_frame(self, start: float, token: str, cells: np.ndarray, frame: int) -> None:
+        self._playback_after = None
+        if frame < PLAYBACK_FRAMES_PER_MOVE - 1:
+            self._highlight(cells, frame % 2 == 0)
+        else:
+            self._highlight(cells, False)
+            self.engine.apply(token)
+            self._redraw()
+            self._track([token])
+            self._playback.popleft()
+        start_next = start + (frame + 1) / PLAYBACK_FPS
+        if frame == PLAYBACK_FRAMES_PER_MOVE - 1:
+            if not self._playback:
+                self.status_var.set('Playback finished')
+                self.compute_cross()
+                return
+            next_step = lambda: self._play_move(start_next)  # noqa: E731
+        else:
+            next_step = lambda: self._play_frame(start, token, cells, frame + 1)  # noqa: E731
+        delay_ms = max(1, int((start_next - time.monotonic()) * 1000))
+        self._playback_after = self.root.after(delay_ms, next_step)
+
+    def _start_table_warmup(self) -> None:
+        """Load (or build, on first run) the cross tables while the window is already usable."""
+
+        def warm() -> None:
+            cross_move_table()
+            for face in _CROSS_FACES:
+                cross_distance_table(face)
+                self._tables_ready += 1
+
+        self.status_var.set('Loading cross tables...')
+        poll_future(self.root.after, self._worker.run_in_background(warm), self._on_warmup_done,
+                    on_wait=self._show_warmup_progress)
+
+    def _show_warmup_progress(self) -> None:
+        self.progress.configure(value=self._tables_ready)
+
+    def _on_warmup_done(self, future: Future) -> None:
+        self.progress.configure(value=self.progress.cget('maximum'))
+        if future.exception() is not None:
+            self.status_var.set(f'Table loading failed: {future.exception()}')
+            self.distance_var.set('Unavailable')
+            return
+        if self._cross_job is None:
+            self.status_var.set('Ready')
+        self._resync()
+
     def compute_cross(self) -> None:
-        try:
-            best_len, best = CubeAIState.find_best_cross_solutions(
-                cube_state=self.cube,
-                max_depth=None,
-                include_white=True,
-            )
-        except Exception as e:
-            self._set_cross_text(f'Error computing cross: {e}')
+        """Solve the crosses on the worker thread; a newer request supersedes this one."""
+        job = self._worker.submit(_solve_crosses, self.cube.copy())
+        self._cross_job = job
+        if self._tables_ready < len(_CROSS_FACES):
+            self.status_var.set('Computing cross (loading tables)...')
+        else:
+            self.status_var.set('Computing cross...')
+        poll_future(self.root.after, job.future, lambda future: self._on_cross_done(job, future),
+                    on_wait=self._show_warmup_progress)
+
+    def _on_cross_done(self, job: Job, future: Future) -> None:
+        if not self._worker.is_current(job):
+            return  # the cube changed since; a newer job is on its way
+        self._cross_job = None
+        error = future.exception()
+        if error is not None:
+            self._set_cross_text(f'Error computing cross: {error}')
             self.status_var.set('Cross compute failed')
             return
+        result = future.result()
+        if result is None:
+            return
+        best_len, best = result
+        self._solution = []
 
         if not best:
             self._set_cross_text('No cross solution found.')
             self.status_var.set('No cross solution')
             return
 
+        self._solution = list(best[0][1])
         lines: list[str] = []
         lines.append(f'Best cross length: {best_len}')
         for face, solution in best:
@@ -256,6 +466,11 @@ class CubeVisualizerApp:
         self._set_cross_text('\n'.join(lines))
         self.status_var.set('Cross computed')
 
+    def _on_close(self) -> None:
+        self.stop_playback()
+        self._worker.cancel()
+        self.root.destroy()
+
 
 def main() -> None:
     root = tk.Tk()
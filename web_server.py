@@ -1,14 +1,32 @@
-from flask import Flask, request, jsonify
+from collections import OrderedDict
+from functools import lru_cache, partial
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+import gzip
+import hashlib
+import json
+import threading
 import time
 import os
 
 # Import necessary components from your BFS solver
+from ai.anytime import FULL, WEIGHTED, XCROSS, SearchRegistry, full_solve_search, weighted_search, xcross_search
 from ai.cube_ai_state import CubeAIState
+from ai.live_session import SessionRegistry
+from ai.metrics import HTM, METRICS, cross_table, find_metric_cross_solutions
+from ai.move_subsets import find_subset_cross_solutions, parse_move_subset, subset_cross_tables
+from ai.bfs_solver import BFSSolver, cross_distance_table
+from ai.orientation import center_colors, is_default_orientation, normalize_orientation, translate_moves
+from ai.table_manager import TABLES
+from ai.two_phase import TwoPhaseSolver
+from ai.weighted_search import ERGONOMIC_COSTS, parse_costs
+from ai.zz_solver import ZZ_STEPS, find_zz_solutions, zz_table
 from core.cube_state import CubeState
 from core.move_engine import CubeMoveEngine
-from core.constants import FACE_NAMES, DEFAULT_FACE_COLOR
-from visualization.renderer import render_cube_flat
+from core.constants import EDGE_NAMES, FACE_NAMES, DEFAULT_FACE_COLOR
+from conversion.facelets import parse_facelets, validated_ai_arrays
+from conversion.packing import cube_from_key, state_key
+from visualization.renderer import RENDER_FORMATS, render_cube_image
 
 app = Flask(__name__)
 # Enable CORS for all origins, including chrome extensions
@@ -17,6 +35,257 @@ CORS(app, origins="*", methods=["GET", "POST", "OPTIONS"],
 
 # Constants
 MAX_BFS_DEPTH = 8  # Same as in run_cross_solver.py
+MAX_ZZ_SOLUTIONS = 10
+MAX_BATCH_SCRAMBLES = 20  # per /solve_batch request (prefetching a few upcoming scrambles)
+FULL_SOLVE_MAX_LENGTH = 21
+FULL_SOLVE_TIMEOUT = 5.0  # seconds; the best solution so far is returned after this
+DEFAULT_BUDGET_MS = 5000  # shared by the deeper /solve searches (xcross, weighted, full)
+TABLE_RETRY_AFTER = 5  # seconds; Retry-After of a 503 while a table is still being built
+
+# Deeper searches keep improving in the background; /search/<id> collects the result
+searches = SearchRegistry()
+
+# Smart-cube sessions: moves come in one request at a time, updates go out as server-sent events
+sessions = SessionRegistry()
+SESSION_KEEPALIVE = 15.0  # seconds between keep-alive comments on an idle event stream
+
+# Compact /solve responses (format=compact): {"v": 1, <selected fields>}
+COMPACT_VERSION = 1
+COMPACT_FIELDS = ('length', 'best', 'solutions', 'time', 'verified', 'scramble', 'zz', XCROSS, WEIGHTED, FULL)
+EXTRA_COMPACT_FIELDS = ('zz', XCROSS, WEIGHTED, FULL)  # results of the optional searches
+DEFAULT_COMPACT_FIELDS = ('length', 'best')
+COMPACT_CACHE_SIZE = 4096  # plain cross results, kept as serialized fragments
+GZIP_MIN_BYTES = 1024  # smaller JSON bodies are sent uncompressed
+
+
+# Tables needed by the synchronous /solve steps are loaded or built in
+# background threads, one per table and process; a request waits for them
+# only until its deadline (the EOCross table alone takes ~15 s to build).
+table_builds = {}
+table_builds_lock = threading.Lock()
+
+
+def wait_for_tables(loads, deadline):
+    """Start ``loads`` ({table name: load}) in the background; the names still loading at ``deadline``."""
+    with table_builds_lock:
+        threads = {}
+        for name, load in loads.items():
+            thread = table_builds.get(name)
+            if thread is None:
+                thread = table_builds[name] = threading.Thread(target=load, name=f'table-{name}', daemon=True)
+                thread.start()
+            threads[name] = thread
+    for thread in threads.values():
+        thread.join(max(0.0, deadline - time.monotonic()))
+    return sorted(name for name, thread in threads.items() if thread.is_alive())
+
+
+def table_loads(tables):
+    """`wait_for_tables` entries for `PruningTable` objects."""
+    return {table.path.stem: (lambda table=table: table.table) for table in tables}
+
+
+def base_table_loads():
+    return {f'cross_{FACE_NAMES[face]}': partial(cross_distance_table, face) for face in range(6)}
+
+
+def parse_zz_steps(value):
+    """`zz` query value -> ZZ steps to solve: '1'/'true' for all, or e.g. 'eoline,eocross'."""
+    if not value or value.lower() in ('0', 'false'):
+        return []
+    if value.lower() in ('1', 'true'):
+        return list(ZZ_STEPS)
+    steps = [s.strip().lower() for s in value.split(',') if s.strip()]
+    unknown = [s for s in steps if s not in ZZ_STEPS]
+    if unknown:
+        raise ValueError(f"unknown zz step(s): {', '.join(unknown)}")
+    return steps
+
+
+# Color name mapping
+color_name_by_code = {
+    1: 'white',
+    2: 'yellow', 
+    3: 'green',
+    4: 'blue',
+    5: 'orange',
+    6: 'red',
+}
+
+
+def face_label(face: int) -> str:
+    face_letter = FACE_NAMES[face]
+    color_code = int(DEFAULT_FACE_COLOR[face])
+    color_name = color_name_by_code.get(color_code, str(color_code))
+    return f"{face_letter}({color_name})"
+
+
+def is_enabled(value):
+    return str(value or '').lower() in ('1', 'true')
+
+
+def request_params():
+    """Query string merged with a JSON object body, for endpoints taking GET or POST."""
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    return {**request.args.to_dict(), **(body if isinstance(body, dict) else {})}
+
+
+def verify_cross(cube, face, solution):
+    """Whether ``solution`` applied to ``cube`` solves the cross of ``face``."""
+    solved_cube = cube.copy()
+    CubeMoveEngine(solved_cube).apply_sequence(solution)
+    # Slice/rotation scrambles move the centers; verify in the default frame.
+    return CubeAIState.from_cube_state(normalize_orientation(solved_cube)[0]).is_cross_solved(face)
+
+
+def parse_compact_fields(value, extras=()):
+    """`fields` value (comma separated string or list) -> compact fields in request order.
+
+    ``extras`` are the optional searches the request runs (`EXTRA_COMPACT_FIELDS`);
+    their fields are always included, and naming one that is not run is an error.
+    """
+    if not value:
+        fields = list(DEFAULT_COMPACT_FIELDS)
+    else:
+        names = value.split(',') if isinstance(value, str) else list(value)
+        fields = list(dict.fromkeys(str(f).strip().lower() for f in names if str(f).strip()))
+        unknown = [f for f in fields if f not in COMPACT_FIELDS]
+        if unknown or not fields:
+            raise ValueError(f"unknown field(s): {', '.join(unknown) or '(none)'} (expected some of {', '.join(COMPACT_FIELDS)})")
+    not_run = [f for f in fields if f in EXTRA_COMPACT_FIELDS and f not in extras]
+    if not_run:
+        raise ValueError(f"field(s) {', '.join(not_run)} need the matching search to be requested")
+    return fields + [f for f in extras if f not in fields]
+
+
+def compact_fragments(result):
+    """Serialized JSON value of every compact field of a `/solve`-style result.
+
+    Solutions are written as ``[face_number, move_count, "moves"]`` arrays and
+    ``best`` as ``[face_number, "moves"]``. ``scramble`` is left out: it is
+    per request, while these fragments are cached per cube state. Optional
+    search results present in ``result`` are added too: ``zz`` as
+    ``{step: [move_count, "rotation and moves"]}`` for the best solution of
+    each step, and each deep search as ``[search_id, move_count, "moves",
+    proven_optimal]`` (``cost`` in place of ``move_count`` for ``weighted``).
+    """
+    solutions = [[sol["face_number"], sol["move_count"], sol["solution_string"]] for sol in result["solutions"]]
+    best = next(([face, moves] for face, length, moves in solutions if length == result["best_length"]), None)
+    values = {
+        "length": result["best_length"],
+        "best": best,
+        "solutions": solutions,
+        "time": round(result["search_time"], 6),
+        "verified": result["verification"]["passed"],
+    }
+    if "zz" in result:
+        values["zz"] = {
+            step: [block["solutions"][0]["move_count"], block["solutions"][0]["solution_string"]]
+            for step, block in result["zz"]["steps"].items()
+        }
+    for kind in (XCROSS, WEIGHTED, FULL):
+        if kind in result:
+            block = result[kind]
+            cost = block["cost"] if kind == WEIGHTED else block["move_count"]
+            values[kind] = [block["search_id"], cost, block["solution_string"], block["proven_optimal"]]
+    return {name: json.dumps(value, separators=(',', ':')) for name, value in values.items()}
+
+
+def compact_body(fragments, fields, scramble):
+    parts = [f'"v":{COMPACT_VERSION}']
+    for name in fields:
+        value = json.dumps(scramble) if name == 'scramble' else fragments[name]
+        parts.append(f'"{name}":{value}')
+    return '{' + ','.join(parts) + '}'
+
+
+class FragmentCache:
+    """LRU of `compact_fragments` by cube state key (`conversion.packing.state_key`)."""
+
+    def __init__(self, capacity=COMPACT_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            fragments = self._entries.get(key)
+            if fragments is not None:
+                self._entries.move_to_end(key)
+            return fragments
+
+    def put(self, key, fragments):
+        with self._lock:
+            self._entries[key] = fragments
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+
+compact_cache = FragmentCache()
+
+
+def compact_response(body):
+    return Response(body, mimetype='application/json')
+
+
+@app.after_request
+def gzip_response(response):
+    """Gzip larger JSON bodies for clients sending ``Accept-Encoding: gzip``."""
+    if (
+        response.mimetype != 'application/json'
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+    response.vary.add('Accept-Encoding')
+    if 'gzip' not in request.accept_encodings or response.content_length is None \
+            or response.content_length < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(response.get_data(), compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def anytime_payload(search_id, search, result):
+    """JSON block for an anytime search snapshot."""
+    payload = {
+        "search_id": search_id,
+        "moves": list(result.moves) if result.moves is not None else None,
+        "solution_string": ' '.join(result.moves) if result.moves is not None else None,
+        "proven_optimal": result.proven_optimal,
+        "lower_bound": result.lower_bound,
+        "finished": result.finished,
+        "elapsed": result.elapsed,
+    }
+    if search.kind == WEIGHTED:
+        payload["cost"] = result.cost
+        payload["solutions"] = [
+            {
+                "face": face_label(sol.face),
+                "moves": list(sol.moves),
+                "move_count": sol.move_count,
+                "cost": sol.cost,
+                "solution_string": ' '.join(sol.moves),
+            }
+            for sol in result.detail or []
+        ]
+    else:
+        payload["move_count"] = int(result.cost) if result.cost is not None else None
+    if search.kind == XCROSS:
+        payload["solutions"] = [
+            {
+                "face": face_label(sol.face),
+                "slot": EDGE_NAMES[sol.slot],
+                "moves": list(sol.moves),
+                "solution_string": ' '.join(sol.moves),
+            }
+            for sol in result.detail or []
+        ]
+    if result.error:
+        payload["error"] = result.error
+    return payload
 
 @app.route('/', methods=['GET'])
 def home():
@@ -27,7 +296,19 @@ def home():
         "version": "1.0.0",
         "endpoints": {
             "solve": "/solve?scramble=<scramble_moves>",
-            "example": "/solve?scramble=R U R' U'"
+            "example": "/solve?scramble=R U R' U'",
+            "zz": "/solve?scramble=<scramble_moves>&zz=eoline,eocross",
+            "metric": "/solve?scramble=<scramble_moves>&metric=stm",
+            "moves": "/solve?scramble=<scramble_moves>&moves=RUFLD",
+            "weighted": "/solve?scramble=<scramble_moves>&costs=B=2.5,R>F=0.5",
+            "deep_search": "/solve?scramble=<scramble_moves>&xcross=1&full=1&budget_ms=500",
+            "search": "/search/<search_id>?budget_ms=1000",
+            "solve_batch": "POST /solve_batch {\"scrambles\": [...]}",
+            "solve_full": "/solve_full?scramble=<scramble_moves>",
+            "solve_state": "/solve_state?facelets=<54 facelets, URFDLB order>",
+            "render": "/render?scramble=<scramble_moves>&solve=cross&format=svg",
+            "session": "POST /session, POST /session/<session_id>/moves, GET /session/<session_id>/events",
+            "metrics": "/metrics"
         }
     })
 
@@ -37,6 +318,51 @@ def solve_cross():
         scramble = request.args.get('scramble')
         if not scramble:
             return jsonify({"error": "No scramble provided"}), 400
+        try:
+            zz_steps = parse_zz_steps(request.args.get('zz'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        metric = request.args.get('metric', HTM).lower()
+        if metric not in METRICS:
+            return jsonify({"error": f"unknown metric: {metric} (expected one of {', '.join(METRICS)})"}), 400
+        allowed_moves = None
+        if request.args.get('moves'):
+            if metric != HTM:
+                return jsonify({"error": "moves cannot be combined with metric"}), 400
+            try:
+                allowed_moves = parse_move_subset(request.args['moves'])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        move_costs = None
+        if request.args.get('costs'):
+            try:
+                move_costs = parse_costs(request.args['costs'])
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+        elif is_enabled(request.args.get('weighted')):
+            move_costs = ERGONOMIC_COSTS
+        try:
+            budget_ms = int(request.args.get('budget_ms', DEFAULT_BUDGET_MS))
+        except ValueError:
+            return jsonify({"error": "budget_ms must be an integer"}), 400
+        if budget_ms < 0:
+            return jsonify({"error": "budget_ms must not be negative"}), 400
+        deadline = time.monotonic() + budget_ms / 1000
+        response_format = request.args.get('format', 'full').lower()
+        if response_format not in ('full', 'compact'):
+            return jsonify({"error": "format must be 'full' or 'compact'"}), 400
+        extras = [
+            name for name, run in (
+                ('zz', bool(zz_steps)),
+                (XCROSS, is_enabled(request.args.get('xcross'))),
+                (WEIGHTED, move_costs is not None),
+                (FULL, is_enabled(request.args.get('full'))),
+            ) if run
+        ]
+        try:
+            compact_fields = parse_compact_fields(request.args.get('fields'), extras)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
         # 1. Create initial state (solved cube)
         cube = CubeState.solved()
@@ -45,46 +371,75 @@ def solve_cross():
         engine = CubeMoveEngine(cube)
         moves = scramble.strip().split()
         engine.apply_sequence(moves)
+
+        # A plain cross request depends only on the cube state, so its compact
+        # fragments are cached; anything extra is solved and encoded every time.
+        plain = allowed_moves is None and metric == HTM and not extras
+        if response_format == 'compact' and plain:
+            fragments = compact_cache.get(state_key(cube))
+            if fragments is not None:
+                return compact_response(compact_body(fragments, compact_fields, scramble))
         
         print(f"\n[1] Applied Scramble: {scramble}")
-        print(f"[2] Initial State (After Scramble):")
-        print(render_cube_flat(cube))
-
-        # Color name mapping
-        color_name_by_code = {
-            1: 'white',
-            2: 'yellow', 
-            3: 'green',
-            4: 'blue',
-            5: 'orange',
-            6: 'red',
-        }
 
-        def face_label(face: int) -> str:
-            face_letter = FACE_NAMES[face]
-            color_code = int(DEFAULT_FACE_COLOR[face])
-            color_name = color_name_by_code.get(color_code, str(color_code))
-            return f"{face_letter}({color_name})"
+        # Tables of the steps below, unless they are already loaded or build within budget_ms
+        if allowed_moves is not None:
+            loads = table_loads(subset_cross_tables(cube, allowed_moves))
+        elif metric == HTM:
+            loads = base_table_loads()
+        else:
+            loads = table_loads([cross_table(metric)])
+        loads.update(table_loads(zz_table(step) for step in zz_steps))
+        building = wait_for_tables(loads, deadline)
+        if building:
+            response = jsonify({
+                "error": "lookup tables are still being built, retry shortly",
+                "building": building,
+            })
+            response.headers['Retry-After'] = str(TABLE_RETRY_AFTER)
+            return response, 503
+
+        # Deeper searches run in background threads while the cross is solved
+        deep_searches = []
+        if is_enabled(request.args.get('xcross')):
+            deep_searches.append(xcross_search(cube))
+        if move_costs is not None:
+            deep_searches.append(weighted_search(cube, move_costs))
+        if is_enabled(request.args.get('full')):
+            deep_searches.append(full_solve_search(cube))
+        for search in deep_searches:
+            search.start()
 
         # 3. Try all 6 color crosses and find top 10 solutions
         print(f"\n[3] Finding top 10 cross solutions from all faces (Max Depth: {MAX_BFS_DEPTH})...")
         
         start_time = time.time()
         
-        # Find existing shortest solution
-        best_len, best = CubeAIState.find_best_cross_solutions(
-            cube_state=cube,
-            max_depth=MAX_BFS_DEPTH,
-            include_white=True,
-        )
-        
-        # Find additional top 10 solutions
-        all_solutions = CubeAIState.find_multiple_cross_solutions(
-            cube_state=cube,
-            max_depth=MAX_BFS_DEPTH,
-            max_solutions=10,
-            include_white=True,
-        )
+        if allowed_moves is not None:
+            # Restricted move set: one table per (face, subset), built on first use
+            all_solutions = find_subset_cross_solutions(cube, allowed_moves)[:10]
+            best_len = all_solutions[0][1] if all_solutions else 10**9
+            best = [(face, solution) for face, length, solution in all_solutions if length == best_len]
+        elif metric == HTM:
+            # Find existing shortest solution
+            best_len, best = CubeAIState.find_best_cross_solutions(
+                cube_state=cube,
+                max_depth=MAX_BFS_DEPTH,
+                include_white=True,
+            )
+
+            # Find additional top 10 solutions
+            all_solutions = CubeAIState.find_multiple_cross_solutions(
+                cube_state=cube,
+                max_depth=MAX_BFS_DEPTH,
+                max_solutions=10,
+                include_white=True,
+            )
+        else:
+            # Slice-turn / quarter-turn metric tables (built on first use)
+            all_solutions = find_metric_cross_solutions(cube, metric)[:10]
+            best_len = all_solutions[0][1] if all_solutions else 10**9
+            best = [(face, solution) for face, length, solution in all_solutions if length == best_len]
         
         end_time = time.time()
         
@@ -92,8 +447,9 @@ def solve_cross():
         print(f"\n[3] Search Complete (Time taken: {search_time:.4f} seconds)")
 
         if not best:
+            limit = "with the allowed moves" if allowed_moves is not None else f"(max_depth={MAX_BFS_DEPTH})"
             return jsonify({
-                "error": f"Failed to find any cross solution (max_depth={MAX_BFS_DEPTH})",
+                "error": f"Failed to find any cross solution {limit}",
                 "search_time": search_time
             }), 404
 
@@ -118,22 +474,18 @@ def solve_cross():
                     "face": face_label(face),
                     "face_number": face,
                     "moves": solution,
-                    "move_count": len(solution),
+                    "move_count": best_len,
                     "solution_string": ' '.join(solution),
                     "is_optimal": True
                 })
 
         # 5. 첫 번째(최단) 해답을 실제로 적용해서 검증
         chosen_face, chosen_solution = best[0]
-        solved_cube = cube.copy()
-        CubeMoveEngine(solved_cube).apply_sequence(chosen_solution)
+        verification_ok = verify_cross(cube, chosen_face, chosen_solution)
 
-        final_ai_state = CubeAIState.from_cube_state(solved_cube)
-        verification_ok = final_ai_state.is_cross_solved(chosen_face)
-
-        print(f"\n[4] Best cross length: {best_len}")
+        print(f"\n[4] Best cross length ({metric}): {best_len}")
         for face, solution in best:
-            print(f"- Best Face: {face_label(face)} | Solution (len={len(solution)}): {' '.join(solution)}")
+            print(f"- Best Face: {face_label(face)} | Solution: {' '.join(solution)}")
         
         print(f"\n[4] Found {len(solutions)} total solutions")
         for i, sol in enumerate(solutions[:3]):  # Print only first 3
@@ -142,10 +494,12 @@ def solve_cross():
         print(f"\n[5] Cross Verification Result (Face {face_label(chosen_face)}): {verification_ok}")
         print("✅ Success" if verification_ok else "❌ Failure")
 
-        return jsonify({
+        response = {
             "success": True,
             "scramble": scramble,
             "search_time": search_time,
+            "metric": metric,
+            "allowed_moves": list(allowed_moves) if allowed_moves is not None else None,
             "best_length": best_len,
             "total_solutions": len(solutions),
             "solutions": solutions,
@@ -153,18 +507,444 @@ def solve_cross():
                 "face": face_label(chosen_face),
                 "passed": verification_ok
             }
-        })
+        }
+
+        # 6. Optional ZZ first steps (EOLine / EOCross) over all 24 orientations
+        if zz_steps:
+            zz_start = time.time()
+            steps = {}
+            for step in zz_steps:
+                zz_solutions = find_zz_solutions(cube, step)
+                steps[step] = {
+                    "best_length": min(sol.move_count for sol in zz_solutions),
+                    "solutions": [
+                        {
+                            "rotation": list(sol.rotation),
+                            "moves": list(sol.moves),
+                            "move_count": sol.move_count,
+                            "bottom": color_name_by_code.get(sol.bottom_color, str(sol.bottom_color)),
+                            "front": color_name_by_code.get(sol.front_color, str(sol.front_color)),
+                            "solution_string": ' '.join(sol.sequence),
+                        }
+                        for sol in zz_solutions[:MAX_ZZ_SOLUTIONS]
+                    ],
+                }
+            response["zz"] = {"search_time": time.time() - zz_start, "steps": steps}
+            print(f"\n[6] ZZ steps {', '.join(zz_steps)} solved in {response['zz']['search_time']:.4f} seconds")
+
+        # 7. Optional deeper searches (xcross, weighted, full), best found within budget_ms
+        for search in deep_searches:
+            result = search.wait(max(0.0, deadline - time.monotonic()))
+            response[search.kind] = anytime_payload(searches.add(search), search, result)
+            status = "optimal" if result.proven_optimal else "best so far"
+            print(f"\n[7] {search.kind}: cost {result.cost} ({status}, {result.elapsed:.4f} s)")
+
+        if response_format == 'compact':
+            fragments = compact_fragments(response)
+            if plain:
+                compact_cache.put(state_key(cube), fragments)
+            return compact_response(compact_body(fragments, compact_fields, scramble))
+        return jsonify(response)
         
     except Exception as e:
         print(f"Error in solve_cross: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/solve_batch', methods=['POST'])
+def solve_batch():
+    """Cross solutions for several scrambles in one request, in the `/solve` result format.
+
+    Meant for clients that prefetch upcoming scrambles; a bad scramble gets an
+    ``error`` entry of its own instead of failing the batch. ``"format":
+    "compact"`` (with optional ``"fields"``) gives compact `/solve` entries.
+    """
+    body = request.get_json(silent=True)
+    scrambles = body.get('scrambles') if isinstance(body, dict) else None
+    if not isinstance(scrambles, list) or not all(isinstance(s, str) for s in scrambles):
+        return jsonify({"error": "expected a JSON body {\"scrambles\": [\"...\", ...]}"}), 400
+    if len(scrambles) > MAX_BATCH_SCRAMBLES:
+        return jsonify({"error": f"at most {MAX_BATCH_SCRAMBLES} scrambles per batch"}), 400
+    compact = str(body.get('format') or 'full').lower() == 'compact'
+    try:
+        compact_fields = parse_compact_fields(body.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    start_time = time.time()
+    results = []
+    for scramble in scrambles:
+        cube = CubeState.solved()
+        try:
+            CubeMoveEngine(cube).apply_sequence(scramble.split())
+        except ValueError as e:
+            results.append({"scramble": scramble, "error": str(e)})
+            continue
+        if compact:
+            fragments = compact_cache.get(state_key(cube))
+            if fragments is not None:
+                results.append(compact_body(fragments, compact_fields, scramble))
+                continue
+        scramble_start = time.time()
+        all_solutions = CubeAIState.find_multiple_cross_solutions(
+            cube_state=cube,
+            max_depth=MAX_BFS_DEPTH,
+            max_solutions=10,
+            include_white=True,
+        )
+        if not all_solutions:
+            results.append({"scramble": scramble, "error": f"Failed to find any cross solution (max_depth={MAX_BFS_DEPTH})"})
+            continue
+        best_len = all_solutions[0][1]
+        result = {
+            "success": True,
+            "scramble": scramble,
+            "search_time": time.time() - scramble_start,
+            "metric": HTM,
+            "best_length": best_len,
+            "total_solutions": len(all_solutions),
+            "solutions": [
+                {
+                    "face": face_label(face),
+                    "face_number": face,
+                    "moves": solution,
+                    "move_count": length,
+                    "solution_string": ' '.join(solution),
+                    "is_optimal": length == best_len,
+                }
+                for face, length, solution in all_solutions
+            ],
+            "verification": {
+                "face": face_label(all_solutions[0][0]),
+                "passed": verify_cross(cube, all_solutions[0][0], all_solutions[0][2]),
+            },
+        }
+        if compact:
+            fragments = compact_fragments(result)
+            compact_cache.put(state_key(cube), fragments)
+            result = compact_body(fragments, compact_fields, scramble)
+        results.append(result)
+    search_time = time.time() - start_time
+    if compact:
+        entries = ','.join(r if isinstance(r, str) else json.dumps(r, separators=(',', ':')) for r in results)
+        return compact_response(f'{{"v":{COMPACT_VERSION},"search_time":{search_time:.6f},"results":[{entries}]}}')
+    return jsonify({"success": True, "search_time": search_time, "results": results})
+
+
+@app.route('/search/<search_id>', methods=['GET'])
+def search_result(search_id):
+    """Follow-up for a deeper /solve search: waits up to budget_ms for a better result."""
+    search = searches.get(search_id)
+    if search is None:
+        return jsonify({"error": f"unknown or expired search_id: {search_id}"}), 404
+    try:
+        budget_ms = int(request.args.get('budget_ms', 0))
+    except ValueError:
+        return jsonify({"error": "budget_ms must be an integer"}), 400
+    result = search.wait(max(0, budget_ms) / 1000)
+    return jsonify({"success": True, "kind": search.kind, search.kind: anytime_payload(search_id, search, result)})
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Pruning-table residency against the memory budget, with load / build / eviction counts."""
+    return jsonify({"tables": TABLES.stats()})
+
+
+@app.route('/solve_full', methods=['GET'])
+def solve_full():
+    """Whole-cube solution (two-phase), e.g. to check a pasted scramble."""
+    try:
+        scramble = request.args.get('scramble')
+        if not scramble:
+            return jsonify({"error": "No scramble provided"}), 400
+        try:
+            max_length = int(request.args.get('max_length', FULL_SOLVE_MAX_LENGTH))
+        except ValueError:
+            return jsonify({"error": "max_length must be an integer"}), 400
+
+        cube = CubeState.solved()
+        CubeMoveEngine(cube).apply_sequence(scramble.strip().split())
+
+        start_time = time.time()
+        solution = TwoPhaseSolver(max_length=max_length, timeout=FULL_SOLVE_TIMEOUT).solve(cube)
+        search_time = time.time() - start_time
+
+        solved_cube = cube.copy()
+        CubeMoveEngine(solved_cube).apply_sequence(solution)
+        verification_ok = bool(CubeAIState.from_cube_state(normalize_orientation(solved_cube)[0]).is_solved())
+        print(f"\n[solve_full] {len(solution)} moves in {search_time:.4f} seconds: {' '.join(solution)}")
+
+        return jsonify({
+            "success": True,
+            "scramble": scramble,
+            "search_time": search_time,
+            "moves": solution,
+            "move_count": len(solution),
+            "solution_string": ' '.join(solution),
+            "verification": {"passed": verification_ok}
+        })
+
+    except Exception as e:
+        print(f"Error in solve_full: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/solve_state', methods=['GET', 'POST'])
+def solve_state():
+    """Crosses (and optionally a full solve) for a cube given as 54 facelets instead of a scramble.
+
+    The facelets are checked and turned into cubie arrays directly, so the
+    solvers start from the state without replaying any moves. Unsolvable
+    input (wrong color counts, impossible pieces, twist, flip or parity)
+    gets a 400 with the reason.
+    """
+    try:
+        params = request_params()
+        facelets = params.get('facelets')
+        if not facelets:
+            return jsonify({"error": "No facelets provided"}), 400
+        try:
+            max_length = int(params.get('max_length', FULL_SOLVE_MAX_LENGTH))
+        except ValueError:
+            return jsonify({"error": "max_length must be an integer"}), 400
+
+        start_time = time.time()
+        try:
+            cube = parse_facelets(str(facelets))
+            normalized, _ = normalize_orientation(cube)
+            ai_state = CubeAIState(*validated_ai_arrays(normalized))
+        except ValueError as e:
+            return jsonify({"error": f"invalid cube state: {e}"}), 400
+        validation_time = time.time() - start_time
+        centers = None if is_default_orientation(cube) else center_colors(cube)
+
+        def physical(moves):
+            return list(moves) if centers is None else translate_moves(moves, centers)
+
+        start_time = time.time()
+        crosses = []
+        for face in range(6):
+            moves = BFSSolver(target_center_face=face).solve_cross(ai_state)
+            if moves is not None:
+                crosses.append((len(moves), face, physical(moves)))
+        crosses.sort()
+        best_len = crosses[0][0] if crosses else None
+        payload = {
+            "success": True,
+            "facelets": str(facelets),
+            "is_solved": bool(ai_state.is_solved()),
+            "best_solutions": [
+                {
+                    "face": face_label(face),
+                    "moves": moves,
+                    "move_count": length,
+                    "solution_string": ' '.join(moves),
+                    "is_optimal": length == best_len,
+                }
+                for length, face, moves in crosses
+            ],
+        }
+        if is_enabled(params.get('full')):
+            solution = TwoPhaseSolver(max_length=max_length, timeout=FULL_SOLVE_TIMEOUT).solve(ai_state)
+            solution = physical(solution)
+            payload["full_solve"] = {
+                "moves": solution,
+                "move_count": len(solution),
+                "solution_string": ' '.join(solution),
+            }
+        payload["validation_time"] = validation_time
+        payload["search_time"] = time.time() - start_time
+        return jsonify(payload)
+
+    except Exception as e:
+        print(f"Error in solve_state: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+def session_payload(session):
+    state = session.state()
+    solutions = sorted(state["solutions"].items(), key=lambda item: (len(item[1]), item[0]))
+    return {
+        "version": state["version"],
+        "move_count": state["move_count"],
+        "last_move": state["last_move"],
+        "distances": {face_label(face): len(moves) for face, moves in solutions},
+        "best_solutions": [
+            {
+                "face": face_label(face),
+                "moves": moves,
+                "move_count": len(moves),
+                "solution_string": ' '.join(moves),
+            }
+            for face, moves in solutions
+        ],
+    }
+
+
+@app.route('/session', methods=['POST'])
+def create_session():
+    """Start a live session for a smart cube, from solved, a scramble or 54 facelets."""
+    params = request_params()
+    cube = CubeState.solved()
+    try:
+        if params.get('facelets'):
+            cube = parse_facelets(str(params['facelets']))
+            validated_ai_arrays(normalize_orientation(cube)[0])
+        elif params.get('scramble'):
+            CubeMoveEngine(cube).apply_sequence(str(params['scramble']).split())
+    except ValueError as e:
+        return jsonify({"error": f"invalid cube state: {e}"}), 400
+    session_id, session = sessions.create(cube)
+    return jsonify({
+        "success": True,
+        "session_id": session_id,
+        "events": f"/session/{session_id}/events",
+        "state": session_payload(session),
+    })
+
+
+@app.route('/session/<session_id>', methods=['GET'])
+def get_session(session_id):
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": f"unknown or expired session_id: {session_id}"}), 404
+    return jsonify({"success": True, "session_id": session_id, "state": session_payload(session)})
+
+
+@app.route('/session/<session_id>/moves', methods=['GET', 'POST'])
+def session_moves(session_id):
+    """Apply the turns just made on the cube (``moves``, space separated) and return the new state."""
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": f"unknown or expired session_id: {session_id}"}), 404
+    moves = request_params().get('moves', '')
+    if isinstance(moves, str):
+        moves = moves.split()
+    elif not isinstance(moves, list) or not all(isinstance(mv, str) for mv in moves):
+        return jsonify({"error": "moves must be a string or a list of strings"}), 400
+    try:
+        session.apply(moves)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"success": True, "session_id": session_id, "state": session_payload(session)})
+
+
+@app.route('/session/<session_id>/events', methods=['GET'])
+def session_events(session_id):
+    """Server-sent events: the current state at once, then one ``update`` event per applied batch.
+
+    Updates that arrive while the client is still reading are coalesced into
+    the latest state.
+    """
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": f"unknown or expired session_id: {session_id}"}), 404
+
+    def stream():
+        version = -1
+        while True:
+            if version >= 0 and not session.wait(version, SESSION_KEEPALIVE):
+                if sessions.peek(session_id) is not session:
+                    yield "event: closed\ndata: {}\n\n"
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            payload = session_payload(session)
+            version = payload["version"]
+            yield f"id: {version}\nevent: update\ndata: {json.dumps(payload)}\n\n"
+
+    return Response(stream(), mimetype='text/event-stream', headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.route('/session/<session_id>', methods=['DELETE'])
+def close_session(session_id):
+    if not sessions.close(session_id):
+        return jsonify({"error": f"unknown or expired session_id: {session_id}"}), 404
+    return jsonify({"success": True})
+
+
+RENDER_SOLVE_MODES = ('cross', 'full')
+RENDER_MAX_AGE = 86400  # seconds; a render only depends on the cube state, format and size
+
+
+@lru_cache(maxsize=1024)
+def render_state_key(facelets, scramble, apply, solve):
+    """`state_key` of the cube a `/render` request shows (solving is the costly part)."""
+    if facelets:
+        cube = parse_facelets(facelets)
+    else:
+        cube = CubeState.solved()
+        CubeMoveEngine(cube).apply_sequence(scramble.split())
+    engine = CubeMoveEngine(cube)
+    engine.apply_sequence(apply.split())
+    if solve == 'cross':
+        _, best = CubeAIState.find_best_cross_solutions(cube_state=cube, max_depth=MAX_BFS_DEPTH, include_white=True)
+        if best:
+            engine.apply_sequence(best[0][1])
+    elif solve == 'full':
+        engine.apply_sequence(TwoPhaseSolver(max_length=FULL_SOLVE_MAX_LENGTH, timeout=FULL_SOLVE_TIMEOUT).solve(cube))
+    return state_key(cube)
+
+
+@app.route('/render', methods=['GET'])
+def render():
+    """Net of the cube as SVG or PNG, from a scramble or facelets, optionally with moves or a solution applied.
+
+    The ETag is a hash of the request inputs, so a revalidation is answered
+    with a 304 before any move is applied or solved. Otherwise the final state
+    is memoized by input and the image by state.
+    """
+    fmt = request.args.get('format', 'svg').lower()
+    if fmt not in RENDER_FORMATS:
+        return jsonify({"error": f"unknown format: {fmt} (expected one of {', '.join(RENDER_FORMATS)})"}), 400
+    solve = request.args.get('solve', '').lower()
+    if solve and solve not in RENDER_SOLVE_MODES:
+        return jsonify({"error": f"unknown solve mode: {solve} (expected one of {', '.join(RENDER_SOLVE_MODES)})"}), 400
+    try:
+        size = int(request.args.get('size', 20))
+    except ValueError:
+        return jsonify({"error": "size must be an integer"}), 400
+    if not 4 <= size <= 64:
+        return jsonify({"error": "size must be between 4 and 64"}), 400
+
+    facelets = request.args.get('facelets', '').strip()
+    scramble = '' if facelets else ' '.join(request.args.get('scramble', '').split())
+    apply = ' '.join(request.args.get('apply', '').split())
+    etag = hashlib.sha1(
+        '\n'.join((facelets, scramble, apply, solve, fmt, str(size))).encode('utf-8')
+    ).hexdigest()[:20]
+
+    mimetype = 'image/svg+xml' if fmt == 'svg' else 'image/png'
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304, mimetype=mimetype)
+    else:
+        try:
+            key = render_state_key(facelets, scramble, apply, solve)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        response = Response(render_cube_image(cube_from_key(key), fmt, size), mimetype=mimetype)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = RENDER_MAX_AGE
+    return response
+
+
 if __name__ == '__main__':
     print("Starting Flask server for Rubik's Cube Cross Solver...")
     print("Available endpoints:")
     print("  GET / - Health check")
     print("  GET /solve?scramble=<scramble_moves>")
+    print("  GET /solve?scramble=<scramble_moves>&zz=eoline,eocross")
+    print("  GET /solve?scramble=<scramble_moves>&costs=B=2.5,R>F=0.5")
+    print("  GET /solve?scramble=<scramble_moves>&xcross=1&full=1&budget_ms=500")
+    print("  GET /search/<search_id>?budget_ms=1000")
+    print("  POST /solve_batch {\"scrambles\": [...]}")
+    print("  GET /solve_full?scramble=<scramble_moves>")
+    print("  GET|POST /solve_state?facelets=<54 facelets, URFDLB order>")
+    print("  GET /render?scramble=<scramble_moves>&solve=cross&format=svg|png")
+    print("  POST /session, POST /session/<session_id>/moves, GET /session/<session_id>/events")
+    print("  GET /metrics")
     print("  Example: /solve?scramble=R%20U%20R%27%20U%27")
     
     # Production deployment configuration
@@ -175,6 +955,12 @@ if __name__ == '__main__':
     print(f"Debug mode: {'ON' if debug else 'OFF'}")
     print(f"Environment: {os.environ.get('FLASK_ENV', 'development')}")
     
+    # Start loading (or, on a fresh checkout, building) the cross and ZZ
+    # tables now instead of in the first requests. Under the debug reloader
+    # only the child process serves requests.
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        wait_for_tables({**base_table_loads(), **table_loads(zz_table(step) for step in ZZ_STEPS)}, time.monotonic())
+
     try:
         app.run(debug=debug, host='0.0.0.0', port=port, threaded=True)
     except Exception as e: